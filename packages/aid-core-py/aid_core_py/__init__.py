@@ -1,30 +1,320 @@
 from __future__ import annotations
 
-from importlib import resources
 import json
-from pathlib import Path
-from typing import Any, Dict, Union, List
+import time
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Union
 
-import jsonschema
+from . import instrument as _instrument
+
+if TYPE_CHECKING:
+    from jsonschema.exceptions import ValidationError
+
+    from .models import AidManifest
+
+# The bundled schema and jsonschema (which pulls in referencing, rpds, ...) are
+# only loaded on first manifest validation, so TXT helpers and `aid-validate
+# --help` start fast. `_SCHEMA` stays importable through module __getattr__.
+_SCHEMA_CACHE: Optional[Dict[str, Any]] = None
+
+
+def _load_schema() -> Dict[str, Any]:
+    global _SCHEMA_CACHE
+    if _SCHEMA_CACHE is None:
+        from importlib import resources
+
+        with resources.files(__package__).joinpath("aid.schema.json").open("r", encoding="utf-8") as fh:
+            _SCHEMA_CACHE = json.load(fh)
+    return _SCHEMA_CACHE
+
+
+_SCHEMA_HASH: Optional[str] = None
+
+
+def _schema_hash() -> str:
+    """Hex SHA-256 of the bundled schema (canonical JSON); changes whenever the schema does."""
+    global _SCHEMA_HASH
+    if _SCHEMA_HASH is None:
+        import hashlib
+
+        canonical = json.dumps(_load_schema(), sort_keys=True, separators=(",", ":"))
+        _SCHEMA_HASH = hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+    return _SCHEMA_HASH
+
+
+def __getattr__(name: str) -> Any:
+    if name == "_SCHEMA":
+        return _load_schema()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-# Load canonical schema bundled in the package
-_SCHEMA_PATH = resources.files(__package__).joinpath("aid.schema.json")
-with _SCHEMA_PATH.open("r", encoding="utf-8") as _fh:
-    _SCHEMA = json.load(_fh)
 
 # ---------------- Runtime helpers ---------------- #
-JsonLike = Union[str, bytes, Dict[str, Any]]
+JsonLike = Union[str, bytes, bytearray, memoryview, Dict[str, Any]]
 
 
 def _ensure_json(data: JsonLike) -> Dict[str, Any]:
-    if isinstance(data, (bytes, str)):
-        return json.loads(data)
+    if isinstance(data, (bytes, str, bytearray, memoryview)):
+        from .jsonio import loads  # pluggable backend (orjson if installed)
+
+        profiler = _instrument.active
+        if profiler is None:
+            return loads(data)
+        with profiler.timer("decode", len(data)):
+            return loads(data)
     return data  # assume dict-like already
 
 
+MODES = ("fast", "first", "best", "all")
+"""Validation modes for ``ManifestValidator.check``, cheapest first."""
+
+DEFAULT_MAX_ERRORS = 50
+
+
+def _pointer(path: Iterable[Any]) -> str:
+    """RFC 6901 JSON pointer for a jsonschema path deque."""
+    return "".join("/" + str(token).replace("~", "~0").replace("/", "~1") for token in path)
+
+
+class ValidationIssue(NamedTuple):
+    pointer: str
+    """JSON pointer to the offending value ("" for the manifest itself)."""
+
+    message: str
+    keyword: str
+    """The failing schema keyword, e.g. ``required`` or ``anyOf``."""
+
+    schema_pointer: str
+    """JSON pointer to the failing keyword in the schema."""
+
+    @classmethod
+    def from_error(cls, error: ValidationError) -> "ValidationIssue":
+        return cls(
+            _pointer(error.absolute_path),
+            error.message,
+            str(error.validator),
+            _pointer(error.absolute_schema_path),
+        )
+
+    def to_dict(self) -> Dict[str, str]:
+        return self._asdict()
+
+
+class ValidationReport(NamedTuple):
+    valid: bool
+    errors: List[ValidationIssue]
+    complete: bool
+    """True if ``errors`` lists every error (always the case for valid manifests)."""
+
+    @property
+    def ok(self) -> bool:
+        return self.valid
+
+
+class ManifestValidator:
+    """Reusable manifest validator.
+
+    The schema is checked and the jsonschema validator (with its ``$ref``
+    resolver) is built once and reused. jsonschema validators are immutable
+    after construction, so a single instance can be shared freely across
+    threads.
+
+    With ``compiled=True`` (default) the schema is also compiled into plain
+    Python checks (see ``aid_core_py.codegen``) that decide validity; the
+    generic validator only runs to build the error for invalid manifests.
+    """
+
+    def __init__(self, schema: Optional[Dict[str, Any]] = None, compiled: bool = True) -> None:
+        self.schema = _load_schema() if schema is None else schema
+        self._generic: Any = None
+        self._is_valid = None
+        self.compiled = False
+        if schema is not None:
+            # The bundled schema is known-good; only check caller-supplied ones.
+            self._generic_validator()
+        if compiled:
+            from . import codegen
+
+            try:
+                self._is_valid = codegen.load(self.schema)["is_valid"]
+                self.compiled = True
+            except NotImplementedError:
+                pass  # schema uses keywords the compiler does not support; stay generic
+        if self._is_valid is None:
+            self._is_valid = self._generic_validator().is_valid
+
+    def _generic_validator(self) -> Any:
+        # Built lazily: with the compiled checks, valid manifests never need it.
+        if self._generic is None:
+            import jsonschema
+
+            cls = jsonschema.validators.validator_for(self.schema)
+            cls.check_schema(self.schema)
+            self._generic = cls(self.schema)
+        return self._generic
+
+    def iter_errors(self, manifest: JsonLike) -> Iterator[ValidationError]:
+        return self._generic_validator().iter_errors(_ensure_json(manifest))
+
+    def error(self, manifest: JsonLike) -> Optional[ValidationError]:
+        """Return the error ``jsonschema.validate`` would raise, or None if valid."""
+        instance = _ensure_json(manifest)
+        profiler = _instrument.active
+        if profiler is None:
+            return self._error(instance)
+        with profiler.timer("validate") as timer:
+            error = self._error(instance)
+            timer.ok = error is None
+        return error
+
+    def _error(self, instance: Any) -> Optional[ValidationError]:
+        if self._is_valid(instance):
+            return None
+        from jsonschema.exceptions import best_match
+
+        return best_match(self._generic_validator().iter_errors(instance))
+
+    def validate(self, manifest: JsonLike) -> None:
+        """Raise jsonschema.ValidationError if manifest is invalid.
+
+        Raises the same error as ``jsonschema.validate`` would (best match).
+        """
+        error = self.error(manifest)
+        if error is not None:
+            raise error
+
+    def is_valid(self, manifest: JsonLike) -> bool:
+        instance = _ensure_json(manifest)
+        profiler = _instrument.active
+        if profiler is None:
+            return self._is_valid(instance)
+        with profiler.timer("validate") as timer:
+            timer.ok = valid = self._is_valid(instance)
+        return valid
+
+    def check(
+        self,
+        manifest: JsonLike,
+        mode: str = "all",
+        max_errors: int = DEFAULT_MAX_ERRORS,
+        time_budget: Optional[float] = None,
+    ) -> ValidationReport:
+        """Validate ``manifest`` and report its errors as ``ValidationIssue`` objects.
+
+        ``mode`` trades detail for cost:
+
+        - ``"fast"``: validity only (the compiled check); no errors listed.
+        - ``"first"``: the first error jsonschema finds, without looking further.
+        - ``"best"``: the error ``validate`` raises (jsonschema's best match),
+          which requires collecting all errors first.
+        - ``"all"``: up to ``max_errors`` errors, stopping once ``time_budget``
+          seconds have passed. The budget is checked before each error after
+          the first. At ``max_errors`` one more error is looked for, only to
+          tell whether the list is ``complete``.
+
+        In ``"first"`` and ``"all"`` mode, implementations that pass their own
+        check are not walked by jsonschema, so a pathological
+        implementation only costs its own ``anyOf`` branches.
+        """
+        if mode not in MODES:
+            raise ValueError(f"unknown validation mode {mode!r}; expected one of {', '.join(MODES)}")
+        instance = _ensure_json(manifest)
+        profiler = _instrument.active
+        if profiler is None:
+            return self._check(instance, mode, max_errors, time_budget)
+        with profiler.timer("validate") as timer:
+            report = self._check(instance, mode, max_errors, time_budget)
+            timer.ok = report.valid
+        return report
+
+    def _check(self, instance: Any, mode: str, max_errors: int, time_budget: Optional[float]) -> ValidationReport:
+        if self._is_valid(instance):
+            return ValidationReport(True, [], True)
+        if mode == "fast":
+            return ValidationReport(False, [], False)
+        if mode == "best":
+            from jsonschema.exceptions import best_match
+
+            error = best_match(self._generic_validator().iter_errors(instance))
+            return ValidationReport(False, [ValidationIssue.from_error(error)], False)
+
+        limit = 1 if mode == "first" else max_errors
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        errors: List[ValidationIssue] = []
+        found = self._iter_errors(instance)
+        complete = False
+        try:
+            while not errors or deadline is None or time.perf_counter() <= deadline:
+                error = next(found, None)
+                if error is None:
+                    complete = True
+                    break
+                if len(errors) >= limit:
+                    break
+                errors.append(ValidationIssue.from_error(error))
+                if mode == "first":
+                    break
+        finally:
+            found.close()
+        return ValidationReport(False, errors, complete)
+
+    def _iter_errors(self, instance: Any) -> Iterator[ValidationError]:
+        from .incremental import iter_errors
+
+        return iter_errors(instance, self)
+
+    def validate_many(self, manifests: Iterable[JsonLike]) -> Iterator[Optional[ValidationError]]:
+        """Yield ``None`` for each valid manifest, or its ValidationError, in input order."""
+        for manifest in manifests:
+            yield self.error(manifest)
+
+    def parse(self, manifest: JsonLike) -> AidManifest:
+        """Decode, validate and build the typed models in one call.
+
+        ``manifest`` is decoded at most once. Valid manifests go straight to
+        the fast model decoders (see ``aid_core_py.fastmodels``); invalid ones
+        raise the same ValidationError as ``validate``, whose ``json_path``
+        (e.g. ``$.implementations[0].authentication``) locates the problem.
+        """
+        instance = _ensure_json(manifest)
+        error = self.error(instance)
+        if error is not None:
+            raise error
+        from .fastmodels import manifest_from_dict
+
+        return manifest_from_dict(instance)
+
+
+_DEFAULT_VALIDATOR: Optional[ManifestValidator] = None
+
+
+def _default_validator() -> ManifestValidator:
+    global _DEFAULT_VALIDATOR
+    # Benign race: concurrent first calls may each build one, the last wins.
+    if _DEFAULT_VALIDATOR is None:
+        _DEFAULT_VALIDATOR = ManifestValidator()
+    return _DEFAULT_VALIDATOR
+
+
 def validate_manifest(manifest: JsonLike) -> None:
     """Raise jsonschema.ValidationError if manifest is invalid per canonical schema."""
-    jsonschema.validate(instance=_ensure_json(manifest), schema=_SCHEMA)
+    _default_validator().validate(manifest)
+
+
+def check_manifest(
+    manifest: JsonLike,
+    mode: str = "all",
+    max_errors: int = DEFAULT_MAX_ERRORS,
+    time_budget: Optional[float] = None,
+) -> ValidationReport:
+    """Validate ``manifest`` and return a ``ValidationReport`` (see ``ManifestValidator.check``)."""
+    return _default_validator().check(manifest, mode, max_errors, time_budget)
+
+
+def parse_manifest(data: JsonLike) -> AidManifest:
+    """Validate ``data`` (str, bytes or dict) and return it as an ``AidManifest``.
+
+    Raises jsonschema.ValidationError, carrying the JSON path, if invalid.
+    """
+    return _default_validator().parse(data)
 
 
 def _parse_txt(txt: str) -> Dict[str, str]:
@@ -38,17 +328,102 @@ def _parse_txt(txt: str) -> Dict[str, str]:
     return kv
 
 
+class AidTxtRecord:
+    """The AID keys of a ``v=aid1`` TXT record; absent keys are None."""
+
+    __slots__ = ("v", "uri", "proto", "auth", "env", "config")
+
+    def __init__(
+        self,
+        v: Optional[str] = None,
+        uri: Optional[str] = None,
+        proto: Optional[str] = None,
+        auth: Optional[str] = None,
+        env: Optional[str] = None,
+        config: Optional[str] = None,
+    ) -> None:
+        self.v = v
+        self.uri = uri
+        self.proto = proto
+        self.auth = auth
+        self.env = env
+        self.config = config
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={getattr(self, k)!r}" for k in self.__slots__ if getattr(self, k) is not None)
+        return f"AidTxtRecord({fields})"
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, AidTxtRecord):
+            return NotImplemented
+        return all(getattr(self, k) == getattr(other, k) for k in self.__slots__)
+
+    __hash__ = None  # type: ignore[assignment]
+
+
+_EMPTY_TXT_FIELDS: Dict[str, Optional[str]] = dict.fromkeys(AidTxtRecord.__slots__)
+_new_txt_record = object.__new__
+
+
+def _parse_aid_txt(txt: str) -> Optional[AidTxtRecord]:
+    # Same result as the historical strip()/index()/strip('"')/split(";")
+    # pipeline, with one split and one partition per part, and the record
+    # filled without going through __init__. The per-part strip() only runs
+    # when the body contains whitespace (every whitespace character is either
+    # ASCII space or non-printable).
+    start = txt.find("v=aid1")
+    if start < 0:
+        return None
+    body = txt[start:].rstrip().rstrip('"')
+    fields = _EMPTY_TXT_FIELDS.copy()
+    if " " not in body and body.isprintable():
+        for part in body.split(";"):
+            key, sep, value = part.partition("=")
+            if sep:
+                fields[key] = value
+    else:
+        for part in body.split(";"):
+            key, sep, value = part.strip().partition("=")
+            if sep:
+                fields[key] = value
+    record = _new_txt_record(AidTxtRecord)
+    record.v = fields["v"]
+    record.uri = fields["uri"]
+    record.proto = fields["proto"]
+    record.auth = fields["auth"]
+    record.env = fields["env"]
+    record.config = fields["config"]
+    return record
+
+
+def parse_txt(txt: str) -> AidTxtRecord:
+    """Parse an AID TXT record string, starting at ``v=aid1``.
+
+    Raises ValueError if the record has no ``v=aid1``.
+    """
+    record = _parse_aid_txt(txt)
+    if record is None:
+        raise ValueError("TXT record missing 'v=aid1'")
+    return record
+
+
+def parse_txt_many(txts: Iterable[str]) -> List[Optional[AidTxtRecord]]:
+    """Parse many TXT records; entries without ``v=aid1`` come back as None."""
+    return list(map(_parse_aid_txt, txts))
+
+
 def validate_txt(txt: str) -> bool:
     """Return True if the TXT record string looks like a valid AID v1 record."""
-    txt = txt.strip()
-    # Extract the portion that starts with v=aid1
-    if "v=aid1" not in txt:
-        raise ValueError("TXT record missing 'v=aid1'")
-    start = txt.index("v=aid1")
-    kv_part = txt[start:]
-    kv_part = kv_part.strip('"')
-    kv = _parse_txt(kv_part)
-    if "uri" not in kv and "config" not in kv:
+    profiler = _instrument.active
+    if profiler is None:
+        return _validate_txt(txt)
+    with profiler.timer("txt", len(txt)):
+        return _validate_txt(txt)
+
+
+def _validate_txt(txt: str) -> bool:
+    record = parse_txt(txt)
+    if record.uri is None and record.config is None:
         raise ValueError("TXT record must contain either 'uri' or 'config' key")
     return True
 
@@ -58,8 +433,20 @@ def validate_pair(manifest: JsonLike, txt: str) -> None:
     validate_txt(txt)
 
 
+from .stream import RecordResult, iter_validate  # noqa: E402  (needs the names above)
+
 __all__ = [
+    "AidTxtRecord",
+    "ManifestValidator",
+    "RecordResult",
+    "ValidationIssue",
+    "ValidationReport",
+    "check_manifest",
+    "iter_validate",
+    "parse_manifest",
     "validate_manifest",
+    "parse_txt",
+    "parse_txt_many",
     "validate_txt",
     "validate_pair",
     "build_txt_record",
@@ -0,0 +1,270 @@
+"""Actionable implementation plans, ported from ``getImplementations`` in the TS package.
+
+``get_implementations(manifest)`` turns a validated manifest into one
+``ActionableImplementation`` per implementation: what to run (``uri``, or
+``command``/``args``), which secrets to ask for and where to put them, and the
+required config and paths. For local implementations the command line for
+each platform (``Execution.platformOverrides`` merged over the defaults) is
+computed up front, so ``plan.launch()`` is a dict lookup.
+
+Plans are memoized in a bounded LRU: a launcher that reconnects to the same
+service gets the same plan objects back without rebuilding them. JSON text
+is keyed by the SHA-256 of its bytes, so a hit skips decoding too. Dicts and
+models are only memoized under a caller-supplied ``key=`` (e.g. the hash a
+cache already computed; the lookup is then a dict access): hashing their
+content would cost about three times as much as building the plans, so
+without a key they are compiled on every call. Plans are shared between
+callers and must be treated as read-only.
+
+``plan.to_dict()`` has the shape of the TS ``ActionableImplementation``
+(camelCase keys), like the ``actionable_profile`` steps of the resolver.
+"""
+from __future__ import annotations
+
+import sys
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, List, NamedTuple, Optional, Tuple, Union
+
+from . import JsonLike, _ensure_json
+
+if TYPE_CHECKING:
+    from .models import AidManifest
+
+DEFAULT_MAXSIZE = 1024
+PLATFORMS = ("linux", "macos", "windows")
+_DEFAULT_SECRET_SCHEMES = frozenset({"pat", "apikey", "basic"})
+
+
+def current_platform() -> str:
+    """The ``platformOverrides`` key for this OS: ``windows``, ``macos`` or ``linux``."""
+    if sys.platform.startswith(("win", "cygwin")):
+        return "windows"
+    if sys.platform == "darwin":
+        return "macos"
+    return "linux"
+
+
+_PLATFORM = current_platform()
+
+
+class LaunchCommand(NamedTuple):
+    command: str
+    args: Tuple[str, ...]
+
+
+class ActionableAuth:
+    """How the client authenticates: the scheme, the secrets to ask the user for, and where to put the token."""
+
+    __slots__ = ("scheme", "description", "required_secrets", "placement")
+
+    def __init__(
+        self,
+        scheme: str,
+        description: str = "",
+        required_secrets: Tuple[str, ...] = (),
+        placement: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.scheme = scheme
+        self.description = description
+        self.required_secrets = required_secrets
+        self.placement = placement
+
+    def to_dict(self) -> Dict[str, Any]:
+        result: Dict[str, Any] = {
+            "scheme": self.scheme,
+            "description": self.description,
+            "requiredSecrets": list(self.required_secrets),
+        }
+        if self.placement is not None:
+            result["placement"] = self.placement
+        return result
+
+
+class ActionableImplementation:
+    """One implementation of a manifest, reduced to what a client needs to connect to it.
+
+    ``uri`` is set for remote implementations; ``command``, ``args`` and
+    ``commands`` (platform -> ``LaunchCommand``) for local ones.
+    ``required_config``, ``required_paths``, ``certificate`` and
+    ``auth.placement`` are the manifest's JSON objects, unchanged.
+    """
+
+    __slots__ = (
+        "name",
+        "type",
+        "protocol",
+        "tags",
+        "uri",
+        "command",
+        "args",
+        "platform_overrides",
+        "commands",
+        "auth",
+        "required_config",
+        "required_paths",
+        "certificate",
+    )
+
+    def __init__(self, impl: Dict[str, Any]) -> None:
+        self.name: str = impl["title"]
+        self.type: str = impl["type"]
+        self.protocol: str = impl["protocol"]
+        tags = impl.get("tags")
+        self.tags: Optional[Tuple[str, ...]] = None if tags is None else tuple(tags)
+        self.uri: Optional[str] = None
+        self.command: Optional[str] = None
+        self.args: Optional[Tuple[str, ...]] = None
+        self.platform_overrides: Optional[Dict[str, Any]] = None
+        self.commands: Dict[str, LaunchCommand] = {}
+        if self.type == "remote":
+            self.uri = impl.get("uri")
+        else:
+            execution = impl["execution"]
+            self.command = execution["command"]
+            self.args = tuple(execution["args"])
+            self.platform_overrides = execution.get("platformOverrides")
+            overrides = self.platform_overrides or {}
+            for platform in PLATFORMS:
+                override = overrides.get(platform) or {}
+                args = override.get("args")
+                self.commands[platform] = LaunchCommand(
+                    override.get("command") or self.command, self.args if args is None else tuple(args)
+                )
+
+        auth = impl["authentication"]
+        credentials = auth.get("credentials")
+        if credentials:
+            secrets: Tuple[str, ...] = tuple(c["key"] for c in credentials)
+        elif auth["scheme"] in _DEFAULT_SECRET_SCHEMES:
+            # No credentials listed for a simple scheme: a single token is needed.
+            secrets = ("TOKEN",)
+        else:
+            secrets = ()
+        self.auth = ActionableAuth(auth["scheme"], auth.get("description") or "", secrets, auth.get("placement"))
+        self.required_config: Optional[List[Dict[str, Any]]] = impl.get("requiredConfig")
+        self.required_paths: Optional[List[Dict[str, Any]]] = impl.get("requiredPaths")
+        self.certificate: Optional[Dict[str, Any]] = impl.get("certificate")
+
+    def launch(self, platform: Optional[str] = None) -> Optional[LaunchCommand]:
+        """Command line for ``platform`` (default: this OS); None for remote implementations."""
+        return self.commands.get(platform or _PLATFORM)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """The TS ``ActionableImplementation`` shape (absent optional fields omitted)."""
+        execution: Dict[str, Any]
+        if self.type == "remote":
+            execution = {"uri": self.uri}
+        else:
+            execution = {"command": self.command, "args": list(self.args or ())}
+            if self.platform_overrides is not None:
+                execution["platformOverrides"] = self.platform_overrides
+        result: Dict[str, Any] = {"name": self.name, "type": self.type, "protocol": self.protocol}
+        if self.tags is not None:
+            result["tags"] = list(self.tags)
+        result["execution"] = execution
+        result["auth"] = self.auth.to_dict()
+        for key, value in (
+            ("requiredConfig", self.required_config),
+            ("certificate", self.certificate),
+            ("requiredPaths", self.required_paths),
+        ):
+            if value is not None:
+                result[key] = value
+        return result
+
+    def __repr__(self) -> str:
+        target = self.uri if self.type == "remote" else self.command
+        return f"ActionableImplementation(name={self.name!r}, type={self.type!r}, protocol={self.protocol!r}, {target!r})"
+
+
+def compile_implementations(manifest: Union[JsonLike, AidManifest]) -> Tuple[ActionableImplementation, ...]:
+    """Build the plans for ``manifest`` (a validated manifest), without memoization."""
+    instance = _as_json(manifest)
+    return tuple(ActionableImplementation(impl) for impl in instance["implementations"])
+
+
+def _as_json(manifest: Union[JsonLike, AidManifest]) -> Dict[str, Any]:
+    to_dict = getattr(manifest, "to_dict", None)
+    if to_dict is not None:
+        return to_dict()
+    return _ensure_json(manifest)  # type: ignore[arg-type]
+
+
+class ImplementationCache:
+    """Bounded LRU of ``get_implementations`` results keyed by raw JSON hash or caller key. Thread-safe."""
+
+    def __init__(self, maxsize: int = DEFAULT_MAXSIZE) -> None:
+        self.maxsize = maxsize
+        self._entries: "OrderedDict[str, Tuple[ActionableImplementation, ...]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(
+        self, manifest: Union[JsonLike, AidManifest], key: Optional[str] = None
+    ) -> Tuple[ActionableImplementation, ...]:
+        """Plans for ``manifest``; ``key`` identifies its content.
+
+        Without ``key``, JSON text is keyed by a hash of its bytes and dicts or
+        models are compiled without memoization.
+        """
+        if key is None:
+            import hashlib
+
+            if isinstance(manifest, (bytes, bytearray, memoryview)):
+                key = "raw:" + hashlib.sha256(manifest).hexdigest()
+            elif isinstance(manifest, str):
+                key = "raw:" + hashlib.sha256(manifest.encode("utf-8", "surrogatepass")).hexdigest()
+            else:
+                return compile_implementations(manifest)
+        with self._lock:
+            plans = self._entries.get(key)
+            if plans is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return plans
+            self.misses += 1
+        plans = compile_implementations(manifest)
+        if self.maxsize > 0:
+            with self._lock:
+                plans = self._entries.setdefault(key, plans)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return plans
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
+
+
+_DEFAULT_CACHE = ImplementationCache()
+
+
+def get_implementations(
+    manifest: Union[JsonLike, AidManifest], key: Optional[str] = None
+) -> Tuple[ActionableImplementation, ...]:
+    """Return the ``ActionableImplementation`` plans of a validated manifest.
+
+    ``manifest`` may be a dict, JSON text or an ``AidManifest`` model. JSON
+    text, and any manifest passed with ``key=``, is memoized (see the module
+    docstring).
+    """
+    return _DEFAULT_CACHE.get(manifest, key)
@@ -0,0 +1,286 @@
+"""Benchmarks for the hot paths, with JSON results that can be compared against a baseline.
+
+``python -m aid_core_py.bench`` times ``validate_manifest`` (of dicts and of
+JSON text, through a ``ValidationMemo`` of duplicates, and the error for an
+invalid edit in full or with ``IncrementalValidator.revalidate``),
+``AidManifest.from_dict`` (the generated decoder and
+``fastmodels.manifest_from_dict``), ``to_dict``, ``build_txt_record``,
+``validate_txt``, ``parse_txt``/``parse_txt_many`` (and the old ``_parse_txt``)
+and the zone file scanner over the conformance fixtures (when run from a
+checkout) and synthetic manifests with 1 to 500 implementations, and prints
+microseconds per call. The TXT cases parse one record per input manifest,
+or ``--txt-records`` records (e.g. 1000000) cycled from them. Each timing is
+the best of ``--repeat`` runs of a loop sized to last at least ``--min-time``
+seconds, which is far steadier than the mean on a shared machine.
+
+``--output results.json`` saves the run; ``--baseline results.json`` compares
+against a saved run and exits with status 1 if any benchmark got slower by
+more than ``--threshold`` (default 25%). Only compare runs from the same
+machine and Python.
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import itertools
+import json
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+FORMAT_VERSION = 1
+SIZES = (1, 10, 50, 100, 500)
+DEFAULT_THRESHOLD = 0.25
+FIXTURES_DIR = Path(__file__).resolve().parents[2] / "aid-conformance" / "tests" / "fixtures" / "valid"
+
+_REMOTE = {
+    "type": "remote",
+    "title": "Remote API",
+    "protocol": "mcp",
+    "uri": "https://api.example.com/mcp",
+    "tags": ["remote", "tools"],
+    "authentication": {
+        "scheme": "pat",
+        "description": "Personal access token",
+        "credentials": [{"key": "API_TOKEN", "description": "Token from the dashboard"}],
+        "placement": {"in": "header", "key": "Authorization", "format": "Bearer {token}"},
+    },
+}
+_LOCAL = {
+    "type": "local",
+    "title": "Local server",
+    "protocol": "mcp",
+    "tags": ["local"],
+    "package": {"manager": "npx", "identifier": "@example/mcp-server"},
+    "execution": {"command": "npx", "args": ["-y", "@example/mcp-server", "start"]},
+    "authentication": {"scheme": "none"},
+    "requiredConfig": [
+        {"key": "WORKSPACE", "description": "Workspace directory", "type": "string", "defaultValue": "."},
+        {"key": "DEBUG", "description": "Verbose logs", "type": "boolean", "defaultValue": False},
+    ],
+}
+
+
+def synthetic_manifest(implementations: int) -> Dict[str, Any]:
+    """A valid manifest with ``implementations`` implementations, alternating remote and local."""
+    impls = []
+    for index in range(implementations):
+        impl = copy.deepcopy(_LOCAL if index % 2 else _REMOTE)
+        impl["name"] = f"impl-{index}"
+        impls.append(impl)
+    return {
+        "schemaVersion": "1",
+        "name": f"Synthetic service ({implementations})",
+        "metadata": {"contentVersion": "1.0.0", "documentation": "https://example.com/docs"},
+        "implementations": impls,
+    }
+
+
+def synthetic_zone(records: int, filler: int = 200) -> bytes:
+    """A BIND zone with ``records`` ``_agent`` TXT records, each after ``filler`` A records."""
+    hosts = b"".join(b"host%d IN A 192.0.2.1\n" % i for i in range(filler))
+    agent = b'_agent.d%d.example. 300 IN TXT "v=aid1;uri=https://d.example/;proto=mcp"\n'
+    return b"".join(hosts + agent % i for i in range(records))
+
+
+def load_inputs(fixtures: Optional[Path] = FIXTURES_DIR, sizes: Sequence[int] = SIZES) -> Dict[str, Dict[str, Any]]:
+    """Input manifests by label: ``fixture-<stem>`` for each fixture, ``synthetic-<n>`` for each size."""
+    inputs: Dict[str, Dict[str, Any]] = {}
+    if fixtures is not None and fixtures.is_dir():
+        for path in sorted(fixtures.glob("*.json")):
+            if not path.exists():  # dangling symlink
+                continue
+            inputs[f"fixture-{path.stem}"] = json.loads(path.read_bytes())
+    for size in sizes:
+        inputs[f"synthetic-{size}"] = synthetic_manifest(size)
+    return inputs
+
+
+def _cases(
+    inputs: Dict[str, Dict[str, Any]], txt_records: Optional[int] = None
+) -> Iterator[Tuple[str, Callable[[], Any]]]:
+    from . import _parse_txt, build_txt_record, parse_txt, parse_txt_many, validate_manifest, validate_txt
+    from . import _default_validator
+    from .fastmodels import manifest_from_dict
+    from .incremental import IncrementalValidator
+    from .memo import ValidationMemo
+    from .models import AidManifest
+
+    records = {}
+    memo = ValidationMemo()
+    validator = _default_validator()
+    for label, manifest in inputs.items():
+        cfg = {"domain": "example.com", "implementations": manifest["implementations"]}
+        model = AidManifest.from_dict(manifest)
+        text = json.dumps(manifest).encode("utf-8")
+        records[label] = build_txt_record(cfg)
+        yield f"validate_manifest/{label}", lambda m=manifest: validate_manifest(m)
+        # The same valid manifest seen again: as text and as a dict.
+        yield f"validate_manifest_text/{label}", lambda t=text: validate_manifest(t)
+        yield f"memo_text/{label}", lambda t=text: memo.error(t)
+        yield f"memo_dict/{label}", lambda m=manifest: memo.error(m)
+        # An edit breaking the last implementation: full error vs incremental revalidation.
+        broken = copy.deepcopy(manifest)
+        broken["implementations"][-1]["authentication"] = {"scheme": "bogus"}
+        incremental = IncrementalValidator(validator)
+        yield f"error_edit/{label}", lambda b=broken: validator.error(b)
+        yield f"revalidate_edit/{label}", lambda m=manifest, b=broken, i=incremental: i.revalidate(m, b)
+        yield f"from_dict/{label}", lambda m=manifest: AidManifest.from_dict(m)
+        yield f"fast_from_dict/{label}", lambda m=manifest: manifest_from_dict(m)
+        yield f"to_dict/{label}", model.to_dict
+        yield f"build_txt_record/{label}", lambda c=cfg: build_txt_record(c)
+    # TXT records are short whatever the manifest size; time them as one batch.
+    batch = list(records.values())
+    if txt_records is not None:
+        batch = list(itertools.islice(itertools.cycle(batch), txt_records))
+    yield "validate_txt/records", lambda: [validate_txt(r) for r in batch]
+    yield "_parse_txt/records", lambda: [_parse_txt(r) for r in batch]
+    yield "parse_txt/records", lambda: [parse_txt(r) for r in batch]
+    yield "parse_txt_many/records", lambda: parse_txt_many(batch)
+    from .zonescan import scan_buffer
+
+    zone = synthetic_zone(100)
+    yield "scan_buffer/zone", lambda: sum(1 for _ in scan_buffer(zone))
+
+
+def measure(fn: Callable[[], Any], repeat: int = 5, min_time: float = 0.05) -> Dict[str, Any]:
+    """Best-of-``repeat`` microseconds per call of ``fn``, timeit-style."""
+    fn()  # warm caches (compiled validator, imports)
+    number = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        number *= 10 if elapsed * 10 < min_time else 2
+    best = elapsed
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(number):
+            fn()
+        best = min(best, time.perf_counter() - start)
+    return {"us": round(best / number * 1e6, 3), "number": number, "repeat": repeat}
+
+
+def run(
+    inputs: Dict[str, Dict[str, Any]],
+    repeat: int = 5,
+    min_time: float = 0.05,
+    only: Optional[str] = None,
+    progress: Optional[Callable[[str, Dict[str, Any]], None]] = None,
+    txt_records: Optional[int] = None,
+) -> Dict[str, Any]:
+    """Run the benchmarks whose name contains ``only`` and return the JSON-ready results document.
+
+    ``txt_records`` sets the size of the TXT batch (default: one record per input).
+    """
+    from . import _schema_hash
+
+    results: Dict[str, Dict[str, Any]] = {}
+    for name, fn in _cases(inputs, txt_records):
+        if only and only not in name:
+            continue
+        results[name] = measure(fn, repeat, min_time)
+        if progress is not None:
+            progress(name, results[name])
+    return {
+        "version": FORMAT_VERSION,
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "schema_hash": _schema_hash(),
+        "created": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "results": results,
+    }
+
+
+class Regression(NamedTuple):
+    name: str
+    baseline: float
+    current: float
+    """Microseconds per call."""
+
+    @property
+    def ratio(self) -> float:
+        return self.current / self.baseline
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float = DEFAULT_THRESHOLD) -> List[Regression]:
+    """Benchmarks present in both runs that are more than ``threshold`` slower in ``current``.
+
+    Raises ValueError if the documents are not results of this module.
+    """
+    for doc in (current, baseline):
+        if doc.get("version") != FORMAT_VERSION or not isinstance(doc.get("results"), dict):
+            raise ValueError(f"not a benchmark results document (version {FORMAT_VERSION})")
+    regressions = []
+    for name, result in current["results"].items():
+        before = baseline["results"].get(name)
+        if before is None or before["us"] <= 0:
+            continue
+        if result["us"] > before["us"] * (1 + threshold):
+            regressions.append(Regression(name, before["us"], result["us"]))
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser("python -m aid_core_py.bench")
+    parser.add_argument("--output", "-o", help="Write the results as JSON to this file.")
+    parser.add_argument("--baseline", "-b", help="Compare against results saved with --output.")
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD, help="Slowdown flagged as a regression (0.25 = 25%%)."
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per benchmark; the best one counts.")
+    parser.add_argument("--min-time", type=float, default=0.05, help="Minimum seconds per timed run.")
+    parser.add_argument("--filter", "-k", default=None, help="Only run benchmarks whose name contains this.")
+    parser.add_argument(
+        "--sizes", type=lambda s: [int(n) for n in s.split(",")], default=list(SIZES),
+        help="Synthetic manifest sizes (implementations), comma-separated.",
+    )
+    parser.add_argument("--fixtures", type=Path, default=FIXTURES_DIR, help="Directory of fixture manifests.")
+    parser.add_argument(
+        "--txt-records", type=int, default=None,
+        help="TXT records per batch for the */records cases (default: one per input manifest).",
+    )
+    args = parser.parse_args(argv)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, "rb") as fh:
+            baseline = json.load(fh)
+
+    def progress(name: str, result: Dict[str, Any]) -> None:
+        before = baseline["results"].get(name) if baseline else None
+        delta = f"  {result['us'] / before['us'] - 1:+7.1%}" if before and before["us"] > 0 else ""
+        print(f"{name:45} {result['us']:12.2f} us{delta}")
+
+    results = run(
+        load_inputs(args.fixtures, args.sizes), args.repeat, args.min_time, args.filter, progress, args.txt_records
+    )
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+            fh.write("\n")
+    if baseline is None:
+        return 0
+    try:
+        regressions = compare(results, baseline, args.threshold)
+    except ValueError as e:
+        parser.error(str(e))
+    for regression in regressions:
+        print(
+            f"❌ {regression.name}: {regression.baseline:.2f} -> {regression.current:.2f} us "
+            f"({regression.ratio - 1:+.1%})",
+            file=sys.stderr,
+        )
+    if not regressions:
+        print(f"✓ no regressions beyond {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
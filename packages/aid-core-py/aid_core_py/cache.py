@@ -0,0 +1,291 @@
+"""Caches for the Python resolution path."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from . import _schema_hash, jsonio
+from .resolver import RCODE_NOERROR, RCODE_NXDOMAIN, HttpResponse, ResolverError, TxtAnswer
+
+DEFAULT_MAXSIZE = 10_000
+DEFAULT_NEGATIVE_TTL = 60.0
+DEFAULT_MAX_TTL = 86_400.0
+
+
+class ResolutionCache:
+    """TTL-aware LRU cache of TXT answers, keyed by record name.
+
+    Positive answers live for the record TTL (clamped to ``min_ttl`` /
+    ``max_ttl``); NXDOMAIN and empty answers live for ``negative_ttl``. Lookup
+    errors (timeouts, SERVFAIL) are never cached. Concurrent ``get_or_fetch``
+    calls for the same name share one in-flight query.
+
+    Pass an instance as ``Resolver(cache=...)``. Any object with the same
+    ``get_or_fetch`` coroutine can be plugged in instead. The in-flight
+    coalescing ties a cache to one event loop at a time.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_MAXSIZE,
+        negative_ttl: float = DEFAULT_NEGATIVE_TTL,
+        min_ttl: float = 0.0,
+        max_ttl: float = DEFAULT_MAX_TTL,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.maxsize = maxsize
+        self.negative_ttl = negative_ttl
+        self.min_ttl = min_ttl
+        self.max_ttl = max_ttl
+        self.clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, TxtAnswer]]" = OrderedDict()
+        self._inflight: Dict[str, "asyncio.Future[TxtAnswer]"] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return name.rstrip(".").lower()
+
+    def _lifetime(self, answer: TxtAnswer) -> float:
+        if answer.rcode == RCODE_NXDOMAIN or (answer.rcode == RCODE_NOERROR and not answer.records):
+            return self.negative_ttl
+        if answer.rcode != RCODE_NOERROR:
+            return 0.0
+        return min(max(float(answer.ttl), self.min_ttl), self.max_ttl)
+
+    def get(self, name: str) -> Optional[TxtAnswer]:
+        """Return the cached answer for ``name`` if fresh (counts a hit or miss)."""
+        key = self._key(name)
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry[0] > self.clock():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            del self._entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, name: str, answer: TxtAnswer) -> None:
+        lifetime = self._lifetime(answer)
+        if lifetime <= 0 or self.maxsize <= 0:
+            return
+        key = self._key(name)
+        self._entries[key] = (self.clock() + lifetime, answer)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    async def get_or_fetch(self, name: str, fetch: Callable[[], Awaitable[TxtAnswer]]) -> TxtAnswer:
+        """Return a fresh cached answer, or run ``fetch`` once for all concurrent callers."""
+        answer = self.get(name)
+        if answer is not None:
+            return answer
+        key = self._key(name)
+        pending = self._inflight.get(key)
+        if pending is not None:
+            self.coalesced += 1
+            return await asyncio.shield(pending)
+        future: "asyncio.Future[TxtAnswer]" = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            answer = await fetch()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            self.put(name, answer)
+            future.set_result(answer)
+            return answer
+        finally:
+            del self._inflight[key]
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "coalesced": self.coalesced,
+        }
+
+
+def _expiry(headers: Dict[str, str], now: float, default_ttl: float) -> Optional[float]:
+    """Absolute expiry time from Cache-Control/Expires, or None if the response must not be stored."""
+    directives: Dict[str, str] = {}
+    for part in headers.get("cache-control", "").lower().split(","):
+        key, _, value = part.strip().partition("=")
+        if key:
+            directives[key] = value.strip('"')
+    if "no-store" in directives:
+        return None
+    if "no-cache" in directives:
+        return now
+    if "max-age" in directives:
+        try:
+            age = int(headers.get("age", "0") or 0)
+            return now + max(0, int(directives["max-age"]) - age)
+        except ValueError:
+            return now
+    if "expires" in headers:
+        from email.utils import parsedate_to_datetime
+
+        try:
+            return parsedate_to_datetime(headers["expires"]).timestamp()
+        except (TypeError, ValueError):
+            return now
+    return now + default_ttl
+
+
+class ManifestCache:
+    """Persistent on-disk cache of manifests, revalidated with conditional GETs.
+
+    Each URL is stored as one JSON file holding the body, the ``ETag`` and
+    ``Last-Modified`` validators, the freshness deadline derived from
+    ``Cache-Control``/``Expires`` and the validation result. Fresh entries are
+    served without touching the network; stale ones are revalidated with
+    ``If-None-Match``/``If-Modified-Since`` and a 304 skips both the download
+    and schema validation.
+
+    Files are written to a temporary name and atomically renamed, so several
+    processes can share one directory: readers see either the old or the new
+    entry, and concurrent writers simply race to the last rename. Unreadable
+    entries are treated as misses, as are entries validated against a
+    different schema (``stamp`` defaults to the bundled schema's hash).
+    """
+
+    def __init__(
+        self,
+        directory: str,
+        default_ttl: float = 0.0,
+        clock: Callable[[], float] = time.time,
+        stamp: Optional[str] = None,
+    ) -> None:
+        self.directory = directory
+        self.default_ttl = default_ttl
+        self.clock = clock
+        self.stamp = stamp or _schema_hash()
+        os.makedirs(directory, exist_ok=True)
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+
+    def _path(self, url: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, url: str) -> Optional[Dict[str, Any]]:
+        try:
+            with open(self._path(url), "r", encoding="utf-8") as fh:
+                entry = json.load(fh)
+        except (OSError, ValueError):
+            return None
+        if not isinstance(entry, dict) or entry.get("url") != url or entry.get("stamp") != self.stamp:
+            return None
+        return entry
+
+    def store(self, entry: Dict[str, Any]) -> None:
+        fd, tmp = tempfile.mkstemp(dir=self.directory, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as fh:
+                json.dump(entry, fh)
+            os.replace(tmp, self._path(entry["url"]))
+        except BaseException:
+            try:
+                os.unlink(tmp)
+            except OSError:
+                pass
+            raise
+
+    def discard(self, url: str) -> None:
+        try:
+            os.unlink(self._path(url))
+        except OSError:
+            pass
+
+    async def get_or_fetch(
+        self,
+        url: str,
+        get: Callable[[str, Dict[str, str]], Awaitable[HttpResponse]],
+        check: Callable[[str], Tuple[Any, Optional[str]]],
+    ) -> Tuple[str, Any, Optional[str]]:
+        """Return ``(content, manifest, error)`` for ``url``.
+
+        ``get(url, headers)`` performs the HTTP request and ``check(content)``
+        parses and validates a downloaded body, returning ``(manifest, error)``.
+        """
+        now = self.clock()
+        entry = self.load(url)
+        if entry is not None and entry["expires"] > now:
+            self.hits += 1
+            return self._result(entry)
+
+        headers: Dict[str, str] = {}
+        if entry is not None:
+            if entry.get("etag"):
+                headers["If-None-Match"] = entry["etag"]
+            if entry.get("last_modified"):
+                headers["If-Modified-Since"] = entry["last_modified"]
+        response = await get(url, headers)
+
+        if response.status == 304 and entry is not None:
+            self.revalidated += 1
+            expires = _expiry(response.headers, now, self.default_ttl)
+            if expires is None:
+                self.discard(url)
+            else:
+                entry["expires"] = expires
+                entry["etag"] = response.headers.get("etag", entry.get("etag"))
+                entry["last_modified"] = response.headers.get("last-modified", entry.get("last_modified"))
+                self.store(entry)
+            return self._result(entry)
+        if response.status == 304:
+            response = await get(url, {})  # lost our entry meanwhile; fetch unconditionally
+        if response.status >= 400 or response.status == 304:
+            raise ResolverError(f"Request failed with status {response.status}.")
+
+        self.misses += 1
+        content = response.body.decode("utf-8")
+        manifest, error = check(content)
+        expires = _expiry(response.headers, now, self.default_ttl)
+        if expires is None:
+            self.discard(url)
+        else:
+            self.store({
+                "url": url,
+                "stamp": self.stamp,
+                "etag": response.headers.get("etag"),
+                "last_modified": response.headers.get("last-modified"),
+                "expires": expires,
+                "error": error,
+                "body": content,
+            })
+        return content, manifest, error
+
+    @staticmethod
+    def _result(entry: Dict[str, Any]) -> Tuple[str, Any, Optional[str]]:
+        # The stored validation result is reused; only the JSON decode is repeated.
+        content, error = entry["body"], entry["error"]
+        return content, (jsonio.loads(content) if error is None else None), error
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "revalidated": self.revalidated, "misses": self.misses}
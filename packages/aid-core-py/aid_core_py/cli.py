@@ -1,42 +1,355 @@
 import argparse
+import functools
+import glob
 import json
+import os
 import sys
-from . import validate_manifest, validate_txt, validate_pair
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+from . import daemon, instrument
+from . import DEFAULT_MAX_ERRORS, MODES, ValidationIssue, check_manifest, validate_manifest, validate_txt
+
+BATCH_CHUNK_SIZE = 256
+
+
+def _is_pattern(p: str) -> bool:
+    return glob.has_magic(p)
+
+
+def _expand(inputs: Iterable[str]) -> List[str]:
+    """Expand directories (recursively, *.json and *.txt) and glob patterns into files."""
+    paths: List[str] = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for dirpath, _, filenames in os.walk(item):
+                paths.extend(
+                    os.path.join(dirpath, name) for name in filenames if name.endswith((".json", ".txt"))
+                )
+        elif _is_pattern(item):
+            paths.extend(p for p in glob.glob(item, recursive=True) if os.path.isfile(p))
+        else:
+            paths.append(item)
+    return sorted(set(paths))
+
+
+def _error_text(e: Exception) -> str:
+    # jsonschema errors carry the short message separately from the long str().
+    return getattr(e, "message", None) or str(e)
+
+
+def _read(path: Optional[str]) -> bytes:
+    """Read ``path`` (stdin if None) as bytes, timed as the ``read`` phase when profiling."""
+    profiler = instrument.active
+    if profiler is None:
+        return _read_bytes(path)
+    with profiler.timer("read") as timer:
+        content = _read_bytes(path)
+        timer.nbytes = len(content)
+    return content
+
+
+def _read_bytes(path: Optional[str]) -> bytes:
+    # Bytes: manifests go straight to the JSON backend without a str copy.
+    if path:
+        with open(path, "rb") as fh:
+            return fh.read()
+    return sys.stdin.buffer.read()
+
+
+def _issue_text(issue: Any) -> str:
+    return f"{issue.pointer or '/'}: {issue.message}"
+
+
+def _validate_path(
+    path: str, mode: Optional[str] = None, max_errors: int = DEFAULT_MAX_ERRORS, time_budget: Optional[float] = None
+) -> Dict[str, Any]:
+    start = time.perf_counter()
+    issues = None
+    try:
+        content = _read(path)
+        if path.endswith(".txt"):
+            validate_txt(content.decode("utf-8"))
+        elif mode is not None:
+            report = check_manifest(content, mode, max_errors, time_budget)
+            issues = [{"pointer": i.pointer, "message": i.message, "keyword": i.keyword} for i in report.errors]
+            if not report.valid:
+                raise ValueError(_issue_text(report.errors[0]) if report.errors else "invalid manifest")
+        else:
+            validate_manifest(content)
+        ok, error = True, None
+    except Exception as e:
+        ok, error = False, _error_text(e)
+    result = {"path": path, "ok": ok, "error": error, "elapsed": round(time.perf_counter() - start, 6)}
+    if mode is not None:
+        result["errors"] = issues or []
+    return result
+
+
+def _validate_chunk(paths: List[str], **options: Any) -> List[Dict[str, Any]]:
+    return [_validate_path(p, **options) for p in paths]
+
+
+def _profiled_chunk(paths: List[str], **options: Any) -> Tuple[List[Dict[str, Any]], Dict[str, Any]]:
+    # Worker side of --profile: the parent merges each chunk's counters.
+    with instrument.profiling() as profiler:
+        results = _validate_chunk(paths, **options)
+    return results, profiler.snapshot()
+
+
+def _warm_worker() -> None:
+    # Build the cached validator once per worker process, before the first chunk.
+    from . import _default_validator
+
+    _default_validator()
+
+
+def _chunks(paths: List[str], size: int) -> Iterator[List[str]]:
+    for i in range(0, len(paths), size):
+        yield paths[i:i + size]
+
+
+def run_batch(
+    paths: List[str], jobs: int = 1, chunk_size: int = BATCH_CHUNK_SIZE, **options: Any
+) -> Iterator[Dict[str, Any]]:
+    """Validate ``paths`` and yield one result dict per path, in input order.
+
+    With ``jobs > 1`` the paths are split into chunks and fanned out over a
+    process pool; each worker keeps a warm validator across chunks.
+    ``options`` (``mode``, ``max_errors``, ``time_budget``) select
+    ``check_manifest`` for manifests; results then carry an ``errors`` list.
+    When instrumentation is enabled, worker processes record their phases
+    and the counters are merged into ``instrument.active``.
+    """
+    validate_chunk = functools.partial(_validate_chunk, **options)
+    if jobs <= 1 or len(paths) <= chunk_size:
+        _warm_worker()
+        for chunk in _chunks(paths, chunk_size):
+            yield from validate_chunk(chunk)
+        return
+    from concurrent.futures import ProcessPoolExecutor
+
+    profiler = instrument.active
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker) as pool:
+        if profiler is None:
+            for results in pool.map(validate_chunk, _chunks(paths, chunk_size)):
+                yield from results
+            return
+        profiled_chunk = functools.partial(_profiled_chunk, **options)
+        for results, snapshot in pool.map(profiled_chunk, _chunks(paths, chunk_size)):
+            profiler.merge(snapshot)
+            yield from results
+
+
+def _main_batch(args: argparse.Namespace) -> int:
+    paths = _expand(args.paths)
+    if not paths:
+        if not args.quiet:
+            print("❌ no files matched", file=sys.stderr)
+        return 1
+    jobs = args.jobs or os.cpu_count() or 1
+    failed = 0
+    options = {}
+    if args.mode is not None:
+        options = {"mode": args.mode, "max_errors": args.max_errors, "time_budget": args.time_budget}
+    for result in run_batch(paths, jobs=jobs, **options):
+        failed += not result["ok"]
+        if args.jsonl:
+            print(json.dumps(result, ensure_ascii=False))
+        elif not args.quiet and not result["ok"]:
+            print("❌", result["path"], result["error"], file=sys.stderr)
+    if not args.quiet and not args.jsonl:
+        print(f"{'✓' if not failed else '❌'} {len(paths) - failed}/{len(paths)} passed")
+    return 1 if failed else 0
+
+
+def _main_stream(args: argparse.Namespace) -> int:
+    from . import iter_validate
+
+    if args.paths:
+        stream = open(args.paths[0], "rb")
+    else:
+        stream = sys.stdin.buffer
+    failed = 0
+    out = sys.stdout
+    try:
+        for result in iter_validate(stream):
+            failed += not result.ok
+            if not args.quiet:
+                error = None if result.ok else _error_text(result.error)
+                out.write(json.dumps({"line": result.line, "ok": result.ok, "error": error}, ensure_ascii=False))
+                out.write("\n")
+    finally:
+        if stream is not sys.stdin.buffer:
+            stream.close()
+    return 1 if failed else 0
+
+
+def _single_request(args: argparse.Namespace) -> Dict[str, Any]:
+    # Single-file and pair mode build a daemon request, answered by the daemon or in-process.
+    path = args.paths[0] if args.paths else None
+    if len(args.paths) > 1:
+        return {"op": "pair", "manifest": _read(path), "txt": _read(args.paths[1]).decode("utf-8")}
+    content = _read(path)
+    if path and path.endswith(".txt"):
+        return {"op": "txt", "txt": content.decode("utf-8")}
+    if args.mode is not None:
+        return {
+            "op": "manifest",
+            "manifest": content,
+            "mode": args.mode,
+            "max_errors": args.max_errors,
+            "time_budget": args.time_budget,
+        }
+    return {"op": "manifest", "manifest": content}
+
+
+def _client_address(args: argparse.Namespace) -> Optional[str]:
+    if args.client is not None:
+        return args.client or daemon.default_address()
+    return os.environ.get(daemon.ENV_VAR) or None
 
 
 def main() -> None:
     parser = argparse.ArgumentParser("aid-validate (Python)")
-    parser.add_argument("path", nargs="?", help="Path to artefact (.json or .txt). If omitted, reads stdin.")
-    parser.add_argument("second", nargs="?", help="Optional second artefact for pair validation.")
+    parser.add_argument(
+        "paths",
+        nargs="*",
+        help="Artefact (.json or .txt), or a manifest and a TXT file for pair validation. "
+        "If omitted, reads stdin. Directories, glob patterns, or more than two paths "
+        "select batch mode.",
+    )
     parser.add_argument("--quiet", action="store_true", help="Suppress output; use exit code only.")
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=None,
+        help="Worker processes for batch mode and --serve; 0 = one per CPU "
+        "(default: one per CPU in batch mode, none for --serve).",
+    )
+    parser.add_argument(
+        "--jsonl", action="store_true", help="Batch mode: print one JSON result per file (path, ok, error, elapsed)."
+    )
+    parser.add_argument(
+        "--ndjson",
+        action="store_true",
+        help="Stream newline-delimited manifests from stdin (or the given file) and print one JSON result per record.",
+    )
+    parser.add_argument(
+        "--json-backend",
+        default=None,
+        help="JSON decoder to use (e.g. orjson, stdlib); default: the fastest installed.",
+    )
+    parser.add_argument(
+        "--mode",
+        choices=MODES,
+        default=None,
+        help="Manifest validation mode: fast (valid/invalid only), first (first error found), "
+        "best (most relevant error; the default), all (every error, see --max-errors/--time-budget).",
+    )
+    parser.add_argument(
+        "--max-errors", type=int, default=DEFAULT_MAX_ERRORS, help="--mode all: stop after this many errors."
+    )
+    parser.add_argument(
+        "--time-budget", type=float, default=None, help="--mode all: stop collecting errors after this many seconds."
+    )
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="Print per-phase timings (read, decode, validate, ...) to stderr when done.",
+    )
+    parser.add_argument(
+        "--serve",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="ADDRESS",
+        help="Run a validation daemon on a Unix socket path or loopback host:port "
+        f"(default: ${daemon.ENV_VAR} or a per-user socket); --jobs sets its worker processes "
+        "(0 = one per CPU; default: validate in the daemon process).",
+    )
+    parser.add_argument(
+        "--client",
+        nargs="?",
+        const="",
+        default=None,
+        metavar="ADDRESS",
+        help="Validate a file or pair through a running --serve daemon, in-process if none answers "
+        f"(implied when ${daemon.ENV_VAR} is set).",
+    )
     args = parser.parse_args()
+    if args.max_errors < 1:
+        parser.error("--max-errors must be at least 1")
+    if args.profile:
+        import atexit
 
-    def read_file(p):
-        if p:
-            with open(p, "r", encoding="utf-8") as fh:
-                return fh.read()
-        return sys.stdin.read()
+        profiler = instrument.enable()
+        atexit.register(lambda: print(profiler.summary(), file=sys.stderr))
 
-    try:
-        if args.second:
-            # pair validation
-            manifest_str = read_file(args.path)
-            txt_str = read_file(args.second)
-            validate_pair(json.loads(manifest_str), txt_str)
-        else:
-            content = read_file(args.path)
-            if args.path and args.path.endswith(".txt"):
-                validate_txt(content)
-            else:
-                validate_manifest(json.loads(content))
-        if not args.quiet:
-            print("✓ validation passed")
+    if args.json_backend:
+        from . import jsonio
+
+        try:
+            jsonio.set_backend(args.json_backend)
+        except (ValueError, ImportError) as e:
+            parser.error(str(e))
+        # Batch worker processes pick the backend up from the environment.
+        os.environ[jsonio.ENV_VAR] = args.json_backend
+
+    if args.serve is not None:
+        if args.paths or args.ndjson or args.client is not None:
+            parser.error("--serve takes no paths, --ndjson or --client")
+        try:
+            jobs = 1 if args.jobs is None else args.jobs or os.cpu_count() or 1
+            daemon.serve(args.serve or None, jobs=jobs, quiet=args.quiet)
+        except (OSError, ValueError) as e:
+            print("❌", e, file=sys.stderr)
+            sys.exit(1)
         sys.exit(0)
+
+    if args.ndjson:
+        if len(args.paths) > 1:
+            parser.error("--ndjson takes at most one input")
+        if args.mode is not None:
+            parser.error("--mode is not supported with --ndjson")
+        sys.exit(_main_stream(args))
+
+    batch = (
+        len(args.paths) > 2
+        or args.jobs is not None
+        or args.jsonl
+        or any(os.path.isdir(p) or _is_pattern(p) for p in args.paths)
+    )
+    if batch:
+        sys.exit(_main_batch(args))
+
+    try:
+        request = _single_request(args)
     except Exception as e:
         if not args.quiet:
             print("❌", e, file=sys.stderr)
         sys.exit(1)
+    address = _client_address(args)
+    response = None
+    if address is not None and not args.profile:
+        response = daemon.request(request, address)
+    if response is None:
+        response = daemon.handle_request(request)
+    if response["ok"]:
+        if not args.quiet:
+            print("✓ validation passed")
+        sys.exit(0)
+    if not args.quiet:
+        if "errors" in response:
+            print("❌ validation failed", file=sys.stderr)
+            for issue in response["errors"]:
+                print("  ", _issue_text(ValidationIssue(**issue)), file=sys.stderr)
+            if args.mode == "all" and not response["complete"]:
+                print("   (more errors not listed)", file=sys.stderr)
+        else:
+            print("❌", response["error"], file=sys.stderr)
+    sys.exit(1)
 
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()
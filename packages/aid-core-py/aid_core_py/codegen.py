@@ -0,0 +1,274 @@
+"""Compile the AID JSON Schema into plain Python validation functions.
+
+The generic ``jsonschema`` validator walks the schema tree and dispatches keyword
+by keyword for every instance. ``compile_schema`` does that walk once and emits
+Python source with one ``check_*`` function per object/array subschema and per
+union of them (e.g. the implementation, authentication and requiredConfig
+definitions). Every ``$ref`` is
+resolved at compile time to a direct call.
+
+The generated functions only answer "valid or not". Callers that need the error
+re-run the generic validator on the (rare) failing instance, so errors are the
+exact ``jsonschema.ValidationError`` that ``jsonschema.validate`` would raise.
+
+Only the keywords used by ``aid.schema.json`` are supported; anything else raises
+``NotImplementedError`` so a schema change can never be silently mis-compiled.
+``format`` is treated as an annotation, matching ``jsonschema.validate`` without
+a format checker.
+
+Run ``python -m aid_core_py.codegen [schema.json]`` to print the generated module.
+"""
+from __future__ import annotations
+
+import json
+import re
+import sys
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+# Keywords that never affect validity.
+_ANNOTATIONS = frozenset(
+    {"$schema", "$id", "$comment", "title", "description", "default", "examples", "format", "definitions"}
+)
+# Keywords that need statements (and therefore a dedicated function).
+_STRUCTURAL = frozenset({"properties", "required", "additionalProperties", "items", "minItems"})
+_INLINE = frozenset({"type", "const", "enum", "minLength", "pattern", "anyOf", "not"})
+
+_TYPE_CHECKS = {
+    "string": "isinstance({v}, str)",
+    "object": "isinstance({v}, dict)",
+    "array": "isinstance({v}, list)",
+    "boolean": "isinstance({v}, bool)",
+    "null": "{v} is None",
+    "number": "(isinstance({v}, (int, float)) and not isinstance({v}, bool))",
+    "integer": "((isinstance({v}, int) and not isinstance({v}, bool)) or (isinstance({v}, float) and {v}.is_integer()))",
+}
+_GUARDS = {"string": "str", "object": "dict", "array": "list"}
+
+
+def _frozenset(values: Any) -> str:
+    # Sorted so the generated source is stable across runs.
+    return "frozenset({" + ", ".join(repr(v) for v in sorted(values)) + "})" if values else "frozenset()"
+
+
+def _all(terms: List[str]) -> str:
+    if "False" in terms:
+        return "False"
+    terms = [t for t in terms if t != "True"]
+    if not terms:
+        return "True"
+    return terms[0] if len(terms) == 1 else "(" + " and ".join(terms) + ")"
+
+
+def _any(terms: List[str]) -> str:
+    if "True" in terms:
+        return "True"
+    terms = [t for t in terms if t != "False"]
+    if not terms:
+        return "False"
+    return terms[0] if len(terms) == 1 else "(" + " or ".join(terms) + ")"
+
+
+class _Compiler:
+    def __init__(self, root: Dict[str, Any]) -> None:
+        self.root = root
+        self.names: Dict[str, str] = {}
+        self.defs: List[List[str]] = []
+        self.consts: Dict[str, str] = {}
+
+    # ---------------- helpers ---------------- #
+
+    def resolve(self, ref: str) -> Tuple[str, Any]:
+        if not ref.startswith("#"):
+            raise NotImplementedError(f"remote $ref not supported: {ref}")
+        pointer = ref[1:]
+        node: Any = self.root
+        for token in pointer.split("/")[1:]:
+            token = token.replace("~1", "/").replace("~0", "~")
+            node = node[int(token)] if isinstance(node, list) else node[token]
+        return pointer, node
+
+    def const(self, expr: str) -> str:
+        if expr not in self.consts:
+            self.consts[expr] = f"_C{len(self.consts)}"
+        return self.consts[expr]
+
+    def func_name(self, pointer: str) -> str:
+        parts = []
+        for token in pointer.split("/")[1:]:
+            if token in ("definitions", "properties", "anyOf"):
+                continue
+            parts.append("item" if token == "items" else re.sub(r"\W", "_", token))
+        base = "check_" + ("_".join(parts) or "root")
+        name, n = base, 2
+        while name in self.names.values():
+            name, n = f"{base}_{n}", n + 1
+        return name
+
+    # ---------------- code generation ---------------- #
+
+    def expr(self, schema: Any, pointer: str, v: str) -> str:
+        """Return a boolean Python expression validating ``v`` against ``schema``."""
+        if schema is True:
+            return "True"
+        if schema is False:
+            return "False"
+        if not isinstance(schema, dict):
+            raise NotImplementedError(f"unsupported schema at {pointer or '/'}")
+        if "$ref" in schema:
+            # Draft 7: siblings of $ref are ignored.
+            target, node = self.resolve(schema["$ref"])
+            return self.expr(node, target, v)
+        keys = set(schema) - _ANNOTATIONS
+        unknown = keys - _STRUCTURAL - _INLINE
+        if unknown:
+            raise NotImplementedError(f"unsupported keywords at {pointer or '/'}: {sorted(unknown)}")
+        if keys & _STRUCTURAL or any(self.is_structural(sub) for sub in schema.get("anyOf", ())):
+            return f"{self.function(schema, pointer)}({v})"
+        return self.inline(schema, pointer, v)
+
+    def is_structural(self, schema: Any) -> bool:
+        while isinstance(schema, dict) and "$ref" in schema:
+            schema = self.resolve(schema["$ref"])[1]
+        return isinstance(schema, dict) and bool(set(schema) & _STRUCTURAL)
+
+    def inline(self, schema: Dict[str, Any], pointer: str, v: str) -> str:
+        terms: List[str] = []
+        types = schema.get("type")
+        known: Optional[str] = None
+        if types is not None:
+            types = [types] if isinstance(types, str) else types
+            checks = [_TYPE_CHECKS[t].format(v=v) for t in types]
+            terms.append(checks[0] if len(checks) == 1 else "(" + " or ".join(checks) + ")")
+            known = types[0] if len(types) == 1 else None
+
+        def guarded(type_name: str, check: str) -> str:
+            if known == type_name:
+                return check
+            return f"(not isinstance({v}, {_GUARDS[type_name]}) or {check})"
+
+        if "const" in schema:
+            terms.append(self.equals([schema["const"]], pointer, v))
+        if "enum" in schema:
+            terms.append(self.equals(schema["enum"], pointer, v))
+        if "minLength" in schema:
+            terms.append(guarded("string", f"len({v}) >= {int(schema['minLength'])}"))
+        if "pattern" in schema:
+            pattern = self.const(f"re.compile({schema['pattern']!r})")
+            terms.append(guarded("string", f"{pattern}.search({v}) is not None"))
+        if "anyOf" in schema:
+            terms.append(_any([self.expr(s, f"{pointer}/anyOf/{i}", v) for i, s in enumerate(schema["anyOf"])]))
+        if "not" in schema:
+            negated = self.expr(schema["not"], pointer + "/not", v)
+            terms.append({"True": "False", "False": "True"}.get(negated, f"not {negated}"))
+        return _all(terms)
+
+    def equals(self, values: List[Any], pointer: str, v: str) -> str:
+        if not all(isinstance(value, str) for value in values):
+            # jsonschema's equality treats bools/numbers specially; not needed by aid.schema.json.
+            raise NotImplementedError(f"non-string const/enum at {pointer}")
+        if len(values) == 1:
+            return f"{v} == {values[0]!r}"
+        return f"(isinstance({v}, str) and {v} in {self.const(_frozenset(values))})"
+
+    def function(self, schema: Dict[str, Any], pointer: str) -> str:
+        if pointer in self.names:
+            return self.names[pointer]
+        name = self.names[pointer] = self.func_name(pointer)
+        body: List[str] = []
+        self.defs.append(body)
+
+        head = self.inline({k: schema[k] for k in _INLINE if k in schema}, pointer, "x")
+        if head != "True":
+            body.append(f"    if not {head}:")
+            body.append("        return False")
+
+        types = schema.get("type")
+        if any(k in schema for k in ("properties", "required", "additionalProperties")):
+            indent = "    "
+            if types != "object":
+                body.append("    if isinstance(x, dict):")
+                indent = "        "
+            required = schema.get("required", ())
+            if required:
+                body.append(f"{indent}if not x.keys() >= {self.const(_frozenset(required))}:")
+                body.append(f"{indent}    return False")
+            properties = schema.get("properties", {})
+            additional = schema.get("additionalProperties", True)
+            if additional is False:
+                body.append(f"{indent}if not x.keys() <= {self.const(_frozenset(properties))}:")
+                body.append(f"{indent}    return False")
+            elif additional is not True:
+                raise NotImplementedError(f"schema-valued additionalProperties at {pointer}")
+            for prop, sub in properties.items():
+                check = self.expr(sub, f"{pointer}/properties/{prop}", "v")
+                if check == "True":
+                    continue
+                if prop in required:
+                    body.append(f"{indent}v = x[{prop!r}]")
+                    body.append(f"{indent}if not {check}:")
+                else:
+                    body.append(f"{indent}v = x.get({prop!r}, _MISSING)")
+                    body.append(f"{indent}if v is not _MISSING and not {check}:")
+                body.append(f"{indent}    return False")
+
+        if "items" in schema or "minItems" in schema:
+            indent = "    "
+            if types != "array":
+                body.append("    if isinstance(x, list):")
+                indent = "        "
+            if "minItems" in schema:
+                body.append(f"{indent}if len(x) < {int(schema['minItems'])}:")
+                body.append(f"{indent}    return False")
+            if "items" in schema:
+                if not isinstance(schema["items"], (dict, bool)):
+                    raise NotImplementedError(f"tuple items at {pointer}")
+                check = self.expr(schema["items"], pointer + "/items", "v")
+                if check != "True":
+                    body.append(f"{indent}for v in x:")
+                    body.append(f"{indent}    if not {check}:")
+                    body.append(f"{indent}        return False")
+
+        body.append("    return True")
+        body.insert(0, f"def {name}(x):")
+        return name
+
+    def module(self) -> str:
+        entry = self.expr(self.root, "", "x")
+        lines = [
+            "# Generated by aid_core_py.codegen -- do not edit.",
+            "import re",
+            "",
+            "_MISSING = object()",
+        ]
+        lines.extend(f"{name} = {expr}" for expr, name in self.consts.items())
+        for body in self.defs:
+            lines.append("")
+            lines.append("")
+            lines.extend(body)
+        lines.extend(["", "", "def is_valid(x):", f"    return {entry}", ""])
+        return "\n".join(lines)
+
+
+def compile_schema(schema: Dict[str, Any]) -> str:
+    """Return Python source for a module whose ``is_valid(instance)`` validates against ``schema``."""
+    return _Compiler(schema).module()
+
+
+def load(schema: Dict[str, Any]) -> Dict[str, Callable[[Any], bool]]:
+    """Compile ``schema`` and return the generated module namespace."""
+    namespace: Dict[str, Any] = {"__name__": "aid_core_py._compiled"}
+    exec(compile(compile_schema(schema), "<aid_core_py._compiled>", "exec"), namespace)
+    return namespace
+
+
+def main() -> None:
+    if len(sys.argv) > 1:
+        with open(sys.argv[1], "r", encoding="utf-8") as fh:
+            schema = json.load(fh)
+    else:
+        from . import _SCHEMA as schema
+    sys.stdout.write(compile_schema(schema))
+
+
+if __name__ == "__main__":
+    main()
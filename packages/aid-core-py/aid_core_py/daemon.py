@@ -0,0 +1,353 @@
+"""Validation daemon for ``aid-validate --serve`` and its thin client.
+
+Each ``aid-validate`` run pays interpreter startup, the jsonschema import and
+the schema load before validating anything. ``aid-validate --serve`` keeps a
+warm validator resident and answers requests on a Unix domain socket (by
+default ``$XDG_RUNTIME_DIR/aid-validate-<uid>.sock``) or on a loopback TCP
+port (``--serve 127.0.0.1:8765``). ``aid-validate --client`` (or the
+``AID_VALIDATE_DAEMON`` environment variable) sends single-file and pair
+validations to it, and validates in-process when no daemon answers.
+
+The protocol is newline-delimited JSON, one request and one response per
+line, any number per connection::
+
+    {"op": "manifest", "manifest": "<JSON text>", "mode": "all", "max_errors": 50, "time_budget": null}
+    {"op": "txt", "txt": "v=aid1;uri=...;p=mcp"}
+    {"op": "pair", "manifest": "<JSON text>", "txt": "v=aid1;..."}
+    {"op": "ping"}
+
+``mode``, ``max_errors`` and ``time_budget`` are optional (no ``mode``:
+``validate_manifest``). A response has ``ok`` and ``error`` (the exception
+text, as printed by the CLI); with a ``mode`` it also has ``errors`` (the
+``ValidationIssue`` dicts) and ``complete``. A request the daemon cannot
+serve gets ``{"fault": "..."}`` instead. Clients only connect to a Unix
+socket owned by their user and closed to everyone else, and (where the
+platform reports it) served by a process of their user. They send a ``stamp``
+identifying their install's schema file; a daemon started from another
+install answers with a fault, so the client never validates against a
+schema it does not ship.
+
+Connections are served by threads; with ``jobs > 1`` validation runs in a
+pool of that many worker processes, each with a warm validator.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+from typing import TYPE_CHECKING, Any, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    import socketserver
+    from concurrent.futures import ProcessPoolExecutor
+
+ENV_VAR = "AID_VALIDATE_DAEMON"
+DEFAULT_PORT = 8765
+DEFAULT_TIMEOUT = 10.0
+MAX_REQUEST = 16 * 1024 * 1024
+OPS = {"manifest": ("manifest",), "txt": ("txt",), "pair": ("manifest", "txt"), "ping": ()}
+
+
+def default_address() -> str:
+    """``$AID_VALIDATE_DAEMON``, else a per-user socket path (or loopback port where there are no Unix sockets)."""
+    address = os.environ.get(ENV_VAR)
+    if address:
+        return address
+    if hasattr(socket, "AF_UNIX") and hasattr(os, "getuid"):
+        import tempfile
+
+        directory = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+        return os.path.join(directory, f"aid-validate-{os.getuid()}.sock")
+    return f"127.0.0.1:{DEFAULT_PORT}"
+
+
+def _parse_address(address: str) -> Tuple[int, Any]:
+    """``host:port`` (IPv6 hosts in brackets) is TCP; anything else is a Unix socket path."""
+    host, sep, port = address.rpartition(":")
+    if sep and port.isdigit() and host and "/" not in host and os.sep not in host:
+        host = host.strip("[]")
+        family = socket.AF_INET6 if ":" in host else socket.AF_INET
+        return family, (host, int(port))
+    if not hasattr(socket, "AF_UNIX"):
+        raise ValueError(f"{address!r}: Unix sockets are not available here; use host:port")
+    return socket.AF_UNIX, address
+
+
+def schema_stamp() -> str:
+    """Identifies the bundled schema file of this install (path, size, mtime); cheap, no schema load."""
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "aid.schema.json")
+    try:
+        st = os.stat(path)
+    except OSError:
+        return path
+    return f"{path}:{st.st_size}:{st.st_mtime_ns}"
+
+
+def _check_private_socket(path: str) -> None:
+    """Refuse a socket another user could have bound first (e.g. in a shared temp directory)."""
+    st = os.stat(path)
+    if st.st_uid != os.getuid() or st.st_mode & 0o077:
+        raise PermissionError(f"{path}: socket is not private to this user; not connecting")
+
+
+def _check_peer(sock: socket.socket, path: str) -> None:
+    if not hasattr(socket, "SO_PEERCRED"):
+        return
+    import struct
+
+    creds = sock.getsockopt(socket.SOL_SOCKET, socket.SO_PEERCRED, struct.calcsize("3i"))
+    _, uid, _ = struct.unpack("3i", creds)
+    if uid != os.getuid():
+        raise PermissionError(f"{path}: daemon runs as another user; not connecting")
+
+
+def _issue_text(issue: Dict[str, Any]) -> str:
+    return f"{issue['pointer'] or '/'}: {issue['message']}"
+
+
+def handle_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    """Answer one request (see the module docstring). Used in-process by the CLI too.
+
+    ``manifest`` may also be bytes here; over the wire it is JSON text.
+    """
+    from . import DEFAULT_MAX_ERRORS, check_manifest, validate_manifest, validate_txt
+
+    op = request.get("op")
+    fields = OPS.get(op)  # type: ignore[arg-type]
+    if fields is None:
+        return {"fault": f"unknown op {op!r}; expected one of {', '.join(OPS)}"}
+    for field in fields:
+        if not isinstance(request.get(field), (str, bytes)):
+            return {"fault": f"{op!r} requests need a {field!r} string"}
+    if op == "ping":
+        return {"ok": True, "pid": os.getpid(), "stamp": schema_stamp()}
+
+    mode = request.get("mode")
+    response: Dict[str, Any] = {"ok": True, "error": None}
+    try:
+        if op == "txt":
+            validate_txt(request["txt"])
+        elif op == "pair":
+            validate_manifest(request["manifest"])
+            validate_txt(request["txt"])
+        elif mode is not None:
+            report = check_manifest(
+                request["manifest"], mode, request.get("max_errors") or DEFAULT_MAX_ERRORS, request.get("time_budget")
+            )
+            errors = [issue.to_dict() for issue in report.errors]
+            response.update(ok=report.valid, errors=errors, complete=report.complete)
+            if not report.valid:
+                response["error"] = _issue_text(errors[0]) if errors else "invalid manifest"
+        else:
+            validate_manifest(request["manifest"])
+    except Exception as e:
+        response.update(ok=False, error=str(e))
+    return response
+
+
+def _warm_worker() -> None:
+    from . import _default_validator
+
+    _default_validator()
+
+
+def make_server(address: Optional[str] = None, jobs: int = 1) -> socketserver.BaseServer:
+    """Bind the daemon to ``address`` (default: ``default_address()``); call ``serve_forever()`` on it.
+
+    TCP addresses must be loopback: the daemon has no authentication. A Unix
+    socket is created readable by its owner only; a stale socket file is
+    replaced, one with a live daemon behind it raises OSError. With
+    ``jobs > 1`` requests are validated in that many worker processes.
+    """
+    import socketserver
+
+    family, sockaddr = _parse_address(address or default_address())
+    if family != socket.AF_UNIX:
+        _check_loopback(sockaddr[0])
+    executor: Optional[ProcessPoolExecutor] = None  # started once bound, below
+    stamp = schema_stamp()
+
+    class Handler(socketserver.StreamRequestHandler):
+        def handle(self) -> None:
+            while True:
+                line = self.rfile.readline(MAX_REQUEST + 1)
+                if not line:
+                    return
+                if len(line) > MAX_REQUEST:
+                    self._reply({"fault": f"request larger than {MAX_REQUEST} bytes"})
+                    return
+                self._reply(self._answer(line))
+
+        def _answer(self, line: bytes) -> Dict[str, Any]:
+            try:
+                request = json.loads(line)
+            except ValueError as e:
+                return {"fault": f"malformed request: {e}"}
+            if not isinstance(request, dict):
+                return {"fault": "malformed request: expected a JSON object"}
+            if request.get("stamp", stamp) != stamp:
+                return {"fault": "daemon serves another aid_core_py install; restart it"}
+            if executor is None or request.get("op") == "ping":
+                return handle_request(request)
+            try:
+                return executor.submit(handle_request, request).result()
+            except Exception as e:  # e.g. a worker died
+                return {"fault": f"worker failed: {e}"}
+
+        def _reply(self, response: Dict[str, Any]) -> None:
+            self.wfile.write(json.dumps(response, ensure_ascii=False).encode("utf-8") + b"\n")
+
+    server: socketserver.BaseServer
+    if family == socket.AF_UNIX:
+        _clear_stale_socket(sockaddr)
+
+        class UnixServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+            daemon_threads = True
+
+            def server_bind(self) -> None:
+                umask = os.umask(0o177)
+                try:
+                    super().server_bind()
+                finally:
+                    os.umask(umask)
+
+            def server_close(self) -> None:
+                super().server_close()
+                if executor is not None:
+                    executor.shutdown()
+                try:
+                    os.unlink(sockaddr)
+                except OSError:
+                    pass
+
+        server = UnixServer(sockaddr, Handler)
+        server.address = sockaddr  # type: ignore[attr-defined]
+    else:
+        class TCPServer(socketserver.ThreadingMixIn, socketserver.TCPServer):
+            daemon_threads = True
+            allow_reuse_address = True
+            address_family = family
+
+            def server_close(self) -> None:
+                super().server_close()
+                if executor is not None:
+                    executor.shutdown()
+
+        server = TCPServer(sockaddr, Handler)
+        host, port = server.server_address[:2]
+        server.address = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"  # type: ignore[attr-defined]
+    if jobs > 1:
+        from concurrent.futures import ProcessPoolExecutor
+
+        executor = ProcessPoolExecutor(max_workers=jobs, initializer=_warm_worker)
+    else:
+        _warm_worker()
+    return server
+
+
+def _clear_stale_socket(path: str) -> None:
+    if not os.path.exists(path):
+        return
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(path)
+    except OSError:
+        os.unlink(path)  # left behind by a daemon that did not shut down cleanly
+    else:
+        raise OSError(f"{path}: a daemon is already listening")
+    finally:
+        probe.close()
+
+
+def _check_loopback(host: str) -> None:
+    import ipaddress
+
+    if host == "localhost":
+        return
+    try:
+        loopback = ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        loopback = False
+    if not loopback:
+        raise ValueError(f"{host}: the daemon only listens on loopback addresses")
+
+
+def serve(address: Optional[str] = None, jobs: int = 1, quiet: bool = False) -> None:
+    """Run the daemon in the foreground until SIGINT or SIGTERM."""
+    import signal
+    import sys
+
+    server = make_server(address, jobs)
+
+    def stop(signum: int, frame: Any) -> None:
+        raise KeyboardInterrupt
+
+    signal.signal(signal.SIGTERM, stop)
+    if not quiet:
+        print(f"aid-validate: serving on {server.address}", file=sys.stderr)  # type: ignore[attr-defined]
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+class DaemonClient:
+    """A connection to a running daemon. Raises OSError if none listens at ``address``.
+
+    A Unix socket must belong to the current user and have no group or other
+    access (PermissionError otherwise), as the sockets ``make_server`` creates do.
+    """
+
+    def __init__(self, address: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT) -> None:
+        family, sockaddr = _parse_address(address or default_address())
+        if family == socket.AF_UNIX:
+            _check_private_socket(sockaddr)
+        self._sock = socket.socket(family, socket.SOCK_STREAM)
+        try:
+            self._sock.settimeout(timeout)
+            self._sock.connect(sockaddr)
+            if family == socket.AF_UNIX:
+                _check_peer(self._sock, sockaddr)
+        except BaseException:
+            self._sock.close()
+            raise
+        self._stream = self._sock.makefile("rb")
+        self._stamp = schema_stamp()
+
+    def request(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Send ``request`` and return the response (a ``fault`` one if the daemon could not serve it)."""
+        payload = {"stamp": self._stamp, **request}
+        self._sock.sendall(json.dumps(payload, ensure_ascii=False).encode("utf-8") + b"\n")
+        line = self._stream.readline()
+        if not line:
+            raise ConnectionError("daemon closed the connection")
+        return json.loads(line)
+
+    def close(self) -> None:
+        self._stream.close()
+        self._sock.close()
+
+    def __enter__(self) -> DaemonClient:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def request(
+    payload: Dict[str, Any], address: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT
+) -> Optional[Dict[str, Any]]:
+    """Answer ``payload`` through the daemon; None if no daemon (for this install) could serve it."""
+    if isinstance(payload.get("manifest"), bytes):
+        try:
+            payload = dict(payload, manifest=payload["manifest"].decode("utf-8"))
+        except UnicodeDecodeError:
+            return None  # not JSON text; let the in-process decoder report it
+    try:
+        with DaemonClient(address, timeout) as client:
+            response = client.request(payload)
+    except (OSError, ValueError):
+        return None
+    return None if "fault" in response else response
@@ -0,0 +1,403 @@
+"""Fast decoding of manifest dicts into the generated model classes.
+
+``aid_core_py.models`` is generated by quicktype: every optional field goes
+through ``from_union``, which tries each alternative in turn and swallows the
+``AssertionError`` of those that do not match, usually allocating a list and a
+lambda per field on the way. The decoders here build the same objects with
+direct type dispatch and no exceptions on the success path.
+
+The checks are strict (``type(x) is str``, exact enum values). Anything they
+do not accept is handed to the generated ``from_dict``, so unusual input (str
+subclasses, enum members instead of values) still decodes identically and
+malformed manifests raise exactly the errors they always did.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional, Type, TypeVar
+
+from . import instrument as _instrument
+from . import models as m
+
+T = TypeVar("T")
+
+_SCHEMES = m.Scheme._value2member_map_
+_PLACEMENT_INS = m.In._value2member_map_
+_SOURCES = m.Source._value2member_map_
+_CONFIG_TYPES = m.RequiredConfigType._value2member_map_
+_PATH_TYPES = m.RequiredPathType._value2member_map_
+_STATUSES = m.Status._value2member_map_
+_IMPLEMENTATION_TYPES = m.ImplementationType._value2member_map_
+_SCHEMA_VERSIONS = m.SchemaVersion._value2member_map_
+
+
+class _Mismatch(Exception):
+    """Input the fast path does not handle; the generated decoder takes over."""
+
+
+def _str_list(x: Any) -> List[str]:
+    if type(x) is not list:
+        raise _Mismatch
+    for item in x:
+        if type(item) is not str:
+            raise _Mismatch
+    return x[:]
+
+
+def _opt_str_list(x: Any) -> Optional[List[str]]:
+    return None if x is None else _str_list(x)
+
+
+def _enum(values: Dict[Any, Any], x: Any) -> Any:
+    member = values.get(x) if type(x) is str else None
+    if member is None:
+        raise _Mismatch
+    return member
+
+
+def _credential(obj: Any) -> m.Credential:
+    if type(obj) is not dict:
+        raise _Mismatch
+    description = obj.get("description")
+    key = obj.get("key")
+    if type(description) is not str or type(key) is not str:
+        raise _Mismatch
+    return m.Credential(description, key)
+
+
+def _oauth(obj: Any) -> m.Oauth:
+    if type(obj) is not dict:
+        raise _Mismatch
+    client_id = obj.get("clientId")
+    dynamic_client_registration = obj.get("dynamicClientRegistration")
+    if client_id is not None and type(client_id) is not str:
+        raise _Mismatch
+    if dynamic_client_registration is not None and type(dynamic_client_registration) is not bool:
+        raise _Mismatch
+    return m.Oauth(client_id, dynamic_client_registration, _opt_str_list(obj.get("scopes")))
+
+
+def _placement(obj: Any) -> m.Placement:
+    if type(obj) is not dict:
+        raise _Mismatch
+    format = obj.get("format")
+    key = obj.get("key")
+    if (format is not None and type(format) is not str) or type(key) is not str:
+        raise _Mismatch
+    return m.Placement(format, _enum(_PLACEMENT_INS, obj.get("in")), key)
+
+
+def _authentication(obj: Any) -> m.Authentication:
+    if type(obj) is not dict:
+        raise _Mismatch
+    scheme = _enum(_SCHEMES, obj.get("scheme"))
+    credentials = obj.get("credentials")
+    if credentials is not None:
+        if type(credentials) is not list:
+            raise _Mismatch
+        credentials = [_credential(c) for c in credentials]
+    description = obj.get("description")
+    if description is not None and type(description) is not str:
+        raise _Mismatch
+    placement = obj.get("placement")
+    if placement is not None:
+        placement = _placement(placement)
+    oauth = obj.get("oauth")
+    if oauth is not None:
+        oauth = _oauth(oauth)
+    return m.Authentication(scheme, credentials, description, placement, obj.get("tokenUrl"), oauth)
+
+
+def _capabilities(obj: Any) -> m.Capabilities:
+    if type(obj) is not dict:
+        raise _Mismatch
+    resource_links = obj.get("resourceLinks")
+    if resource_links is not None:
+        if type(resource_links) is not dict:
+            raise _Mismatch
+        resource_links = m.ResourceLinks()
+    structured_output = obj.get("structuredOutput")
+    if structured_output is not None:
+        if type(structured_output) is not dict:
+            raise _Mismatch
+        structured_output = m.StructuredOutput()
+    return m.Capabilities(resource_links, structured_output)
+
+
+def _certificate(obj: Any) -> m.Certificate:
+    if type(obj) is not dict:
+        raise _Mismatch
+    return m.Certificate(obj.get("enrollmentEndpoint"), _enum(_SOURCES, obj.get("source")))
+
+
+def _platform(obj: Any) -> Optional[m.Linux]:
+    if obj is None:
+        return None
+    if type(obj) is not dict:
+        raise _Mismatch
+    command = obj.get("command")
+    digest = obj.get("digest")
+    if (command is not None and type(command) is not str) or (digest is not None and type(digest) is not str):
+        raise _Mismatch
+    return m.Linux(_opt_str_list(obj.get("args")), command, digest)
+
+
+def _platform_overrides(obj: Any) -> m.PlatformOverrides:
+    if type(obj) is not dict:
+        raise _Mismatch
+    return m.PlatformOverrides(_platform(obj.get("linux")), _platform(obj.get("macos")), _platform(obj.get("windows")))
+
+
+def _execution(obj: Any) -> m.Execution:
+    if type(obj) is not dict:
+        raise _Mismatch
+    command = obj.get("command")
+    if type(command) is not str:
+        raise _Mismatch
+    platform_overrides = obj.get("platformOverrides")
+    if platform_overrides is not None:
+        platform_overrides = _platform_overrides(platform_overrides)
+    return m.Execution(_str_list(obj.get("args")), command, platform_overrides)
+
+
+def _package(obj: Any) -> m.Package:
+    if type(obj) is not dict:
+        raise _Mismatch
+    digest = obj.get("digest")
+    identifier = obj.get("identifier")
+    manager = obj.get("manager")
+    if (digest is not None and type(digest) is not str) or type(identifier) is not str or type(manager) is not str:
+        raise _Mismatch
+    return m.Package(digest, identifier, manager)
+
+
+def _required_config(obj: Any) -> m.RequiredConfig:
+    if type(obj) is not dict:
+        raise _Mismatch
+    default_value = obj.get("defaultValue")
+    kind = type(default_value)
+    if kind is int or kind is float:
+        default_value = float(default_value)
+    elif default_value is not None and kind is not bool and kind is not str:
+        raise _Mismatch
+    description = obj.get("description")
+    key = obj.get("key")
+    secret = obj.get("secret")
+    if type(description) is not str or type(key) is not str or (secret is not None and type(secret) is not bool):
+        raise _Mismatch
+    return m.RequiredConfig(default_value, description, key, secret, _enum(_CONFIG_TYPES, obj.get("type")))
+
+
+def _required_path(obj: Any) -> m.RequiredPath:
+    if type(obj) is not dict:
+        raise _Mismatch
+    description = obj.get("description")
+    key = obj.get("key")
+    if type(description) is not str or type(key) is not str:
+        raise _Mismatch
+    type_ = obj.get("type")
+    if type_ is not None:
+        type_ = _enum(_PATH_TYPES, type_)
+    return m.RequiredPath(description, key, type_)
+
+
+def _implementation(obj: Any) -> m.Implementation:
+    if type(obj) is not dict:
+        raise _Mismatch
+    get = obj.get
+    authentication = _authentication(get("authentication"))
+    capabilities = get("capabilities")
+    if capabilities is not None:
+        capabilities = _capabilities(capabilities)
+    certificate = get("certificate")
+    if certificate is not None:
+        certificate = _certificate(certificate)
+    mcp_version = get("mcpVersion")
+    name = get("name")
+    protocol = get("protocol")
+    title = get("title")
+    uri = get("uri")
+    if (
+        type(name) is not str
+        or type(protocol) is not str
+        or type(title) is not str
+        or (mcp_version is not None and type(mcp_version) is not str)
+        or (uri is not None and type(uri) is not str)
+    ):
+        raise _Mismatch
+    required_config = get("requiredConfig")
+    if required_config is not None:
+        if type(required_config) is not list:
+            raise _Mismatch
+        required_config = [_required_config(c) for c in required_config]
+    required_paths = get("requiredPaths")
+    if required_paths is not None:
+        if type(required_paths) is not list:
+            raise _Mismatch
+        required_paths = [_required_path(p) for p in required_paths]
+    status = get("status")
+    if status is not None:
+        status = _enum(_STATUSES, status)
+    execution = get("execution")
+    if execution is not None:
+        execution = _execution(execution)
+    package = get("package")
+    if package is not None:
+        package = _package(package)
+    return m.Implementation(
+        authentication,
+        capabilities,
+        certificate,
+        mcp_version,
+        name,
+        protocol,
+        required_config,
+        required_paths,
+        get("revocationURL"),
+        status,
+        _opt_str_list(get("tags")),
+        title,
+        _enum(_IMPLEMENTATION_TYPES, get("type")),
+        uri,
+        execution,
+        package,
+    )
+
+
+def _metadata(obj: Any) -> m.Metadata:
+    if type(obj) is not dict:
+        raise _Mismatch
+    content_version = obj.get("contentVersion")
+    if content_version is not None and type(content_version) is not str:
+        raise _Mismatch
+    return m.Metadata(content_version, obj.get("documentation"), obj.get("revocationURL"))
+
+
+def _manifest(obj: Any) -> m.AidManifest:
+    if type(obj) is not dict:
+        raise _Mismatch
+    implementations = obj.get("implementations")
+    if type(implementations) is not list:
+        raise _Mismatch
+    metadata = obj.get("metadata")
+    if metadata is not None:
+        metadata = _metadata(metadata)
+    name = obj.get("name")
+    if type(name) is not str:
+        raise _Mismatch
+    return m.AidManifest(
+        [_implementation(i) for i in implementations],
+        metadata,
+        name,
+        _enum(_SCHEMA_VERSIONS, obj.get("schemaVersion")),
+        obj.get("signature"),
+    )
+
+
+_DECODERS: Dict[type, Callable[[Any], Any]] = {
+    m.AidManifest: _manifest,
+    m.Authentication: _authentication,
+    m.Capabilities: _capabilities,
+    m.Certificate: _certificate,
+    m.Credential: _credential,
+    m.Execution: _execution,
+    m.Implementation: _implementation,
+    m.Linux: _platform,
+    m.Metadata: _metadata,
+    m.Oauth: _oauth,
+    m.Package: _package,
+    m.Placement: _placement,
+    m.PlatformOverrides: _platform_overrides,
+    m.RequiredConfig: _required_config,
+    m.RequiredPath: _required_path,
+}
+
+
+def from_dict(cls: Type[T], obj: Any) -> T:
+    """Equivalent of ``cls.from_dict(obj)`` for any model class, without the exception-driven unions."""
+    decoder = _DECODERS.get(cls)
+    if decoder is not None and obj is not None:
+        try:
+            return decoder(obj)
+        except _Mismatch:
+            pass
+    return cls.from_dict(obj)  # type: ignore[attr-defined]
+
+
+class InternPool:
+    """Deduplicates repeated field values across decoded manifests.
+
+    Registries holding many manifests see the same protocols, package
+    managers, tags and credential keys over and over; each decoded copy is a
+    separate string. Pass one pool to every ``manifest_from_dict`` call so
+    equal values share a single object. Unlike ``sys.intern`` the pool can be
+    dropped (or ``clear()``-ed) to release its strings.
+    """
+
+    __slots__ = ("_strings",)
+
+    def __init__(self) -> None:
+        self._strings: Dict[str, str] = {}
+
+    def __call__(self, value: str) -> str:
+        return self._strings.setdefault(value, value)
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def clear(self) -> None:
+        self._strings.clear()
+
+
+def _intern_list(values: Optional[List[str]], intern: Callable[[str], str]) -> Optional[List[str]]:
+    return None if values is None else [intern(v) for v in values]
+
+
+def _intern_implementation(impl: m.Implementation, intern: Callable[[str], str]) -> None:
+    # Only low-cardinality values; names, titles and descriptions are left alone.
+    impl.protocol = intern(impl.protocol)
+    if impl.mcp_version is not None:
+        impl.mcp_version = intern(impl.mcp_version)
+    impl.tags = _intern_list(impl.tags, intern)
+    auth = impl.authentication
+    for credential in auth.credentials or ():
+        credential.key = intern(credential.key)
+    if auth.placement is not None:
+        auth.placement.key = intern(auth.placement.key)
+        if auth.placement.format is not None:
+            auth.placement.format = intern(auth.placement.format)
+    if auth.oauth is not None:
+        auth.oauth.scopes = _intern_list(auth.oauth.scopes, intern)
+    for config in impl.required_config or ():
+        config.key = intern(config.key)
+    for path in impl.required_paths or ():
+        path.key = intern(path.key)
+    if impl.package is not None:
+        impl.package.manager = intern(impl.package.manager)
+    if impl.execution is not None:
+        impl.execution.command = intern(impl.execution.command)
+
+
+def _decode_manifest(obj: Any) -> m.AidManifest:
+    try:
+        return _manifest(obj)
+    except _Mismatch:
+        return m.AidManifest.from_dict(obj)
+
+
+def manifest_from_dict(obj: Any, intern: Optional[Callable[[str], str]] = None) -> m.AidManifest:
+    """Drop-in replacement for ``models.aid_manifest_from_dict``.
+
+    ``intern`` (an ``InternPool``, ``sys.intern`` or any ``str -> str``
+    callable) is applied to repetitive values such as protocols, tags,
+    package managers and credential keys.
+    """
+    profiler = _instrument.active
+    if profiler is None:
+        manifest = _decode_manifest(obj)
+    else:
+        with profiler.timer("from_dict"):
+            manifest = _decode_manifest(obj)
+    if intern is not None:
+        for impl in manifest.implementations:
+            _intern_implementation(impl, intern)
+    return manifest
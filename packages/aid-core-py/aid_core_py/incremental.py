@@ -0,0 +1,337 @@
+"""Incremental revalidation of successive versions of a manifest.
+
+An editor saving a large manifest over and over mostly changes one
+implementation or one top-level field at a time. ``IncrementalValidator``
+splits the manifest schema into independent parts: the top-level structure
+(``required``, ``additionalProperties``, the array's ``minItems``), each
+top-level field, and each element of array fields such as
+``implementations``. It checks each part on its own, and builds the error
+with jsonschema only over the parts that fail.
+
+Parts that are unchanged since the previous version (compared as JSON, so
+``1``, ``1.0`` and ``true`` differ) keep their previous result when checking
+them is expensive, i.e. when the schema could not be compiled (see
+``aid_core_py.codegen``). Compiled part checks cost about as much as the
+comparison, so they are simply re-run.
+
+The result is always the one ``ManifestValidator.error`` returns for the whole
+manifest. An array field with keywords relating its elements (e.g.
+``uniqueItems``) is checked as one part; a manifest schema with keywords
+relating fields (e.g. ``dependencies``) is always validated in full.
+"""
+from __future__ import annotations
+
+import threading
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Set, Tuple
+
+from . import JsonLike, ManifestValidator, _default_validator, _ensure_json, _pointer
+from .codegen import _ANNOTATIONS
+
+if TYPE_CHECKING:
+    from jsonschema.exceptions import ValidationError
+
+_OBJECT_KEYWORDS = frozenset({"type", "properties", "required", "additionalProperties"})
+_ARRAY_KEYWORDS = frozenset({"type", "items", "minItems", "maxItems"})
+
+Check = Callable[[Any], bool]
+
+
+def _same_json(a: Any, b: Any) -> bool:
+    """Equality of JSON values that, unlike ``==``, tells ``true``, ``1`` and ``1.0`` apart."""
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    if type(a) is dict:
+        if a.keys() != b.keys():
+            return False
+        for key, value in a.items():
+            if not _same_json(value, b[key]):
+                return False
+        return True
+    if type(a) is list:
+        return len(a) == len(b) and all(map(_same_json, a, b))
+    return a == b
+
+
+class _Part(NamedTuple):
+    check: Check
+    element: Optional[Check]
+    """For array fields, the check for one element (``check`` then covers the array itself)."""
+
+
+class _Plan:
+    """Per-part checks derived from the manifest schema, or ``ValueError`` if it cannot be split."""
+
+    def __init__(self, validator: ManifestValidator) -> None:
+        schema = validator.schema
+        self.compiled = validator.compiled
+        self._errors: Any = None
+        self.skip = threading.local()
+        pointer, node = self._resolve(schema, schema)
+        if not isinstance(node, dict) or set(node) - _ANNOTATIONS - _OBJECT_KEYWORDS:
+            raise ValueError("manifest schema has cross-field keywords")
+        additional = node.get("additionalProperties", True)
+        if not isinstance(additional, bool):
+            raise ValueError("schema-valued additionalProperties")
+        properties: Dict[str, Any] = node.get("properties", {})
+        shell = {k: node[k] for k in ("type", "required") if k in node}
+        shell["properties"] = {key: True for key in properties}
+        shell["additionalProperties"] = additional
+        self.shell = self._compile(validator, shell)
+        self.parts: Dict[str, _Part] = {}
+        for key, sub in properties.items():
+            sub_pointer, sub_node = self._resolve(schema, sub, pointer + _pointer(("properties", key)))
+            if (
+                isinstance(sub_node, dict)
+                and isinstance(sub_node.get("items"), dict)
+                and not set(sub_node) - _ANNOTATIONS - _ARRAY_KEYWORDS
+            ):
+                array = {k: sub_node[k] for k in ("type", "minItems", "maxItems") if k in sub_node}
+                element = self._pointed(validator, f"{sub_pointer}/items")
+                self.parts[key] = _Part(self._compile(validator, array), element)
+            else:
+                self.parts[key] = _Part(self._pointed(validator, sub_pointer), None)
+
+    @staticmethod
+    def _resolve(root: Dict[str, Any], node: Any, pointer: str = "") -> Tuple[str, Any]:
+        # Follows $ref chains (draft 7: siblings of $ref are ignored).
+        while isinstance(node, dict) and "$ref" in node:
+            ref = node["$ref"]
+            if not ref.startswith("#"):
+                raise ValueError(f"remote $ref not supported: {ref}")
+            pointer, node = ref[1:], root
+            for token in pointer.split("/")[1:]:
+                token = token.replace("~1", "/").replace("~0", "~")
+                node = node[int(token)] if isinstance(node, list) else node[token]
+        return pointer, node
+
+    def _compile(self, validator: ManifestValidator, schema: Dict[str, Any]) -> Check:
+        if self.compiled:
+            from . import codegen
+
+            try:
+                return codegen.load(schema)["is_valid"]
+            except NotImplementedError:
+                pass
+        cls = type(validator._generic_validator())
+        return cls(schema).is_valid
+
+    def _pointed(self, validator: ManifestValidator, pointer: str) -> Check:
+        # The whole schema, entered at ``pointer`` so that nested $refs resolve.
+        return self._compile(validator, {**validator.schema, "$ref": "#" + pointer})
+
+    def error_validator(self, validator: ManifestValidator) -> Any:
+        """The generic validator, extended to skip array elements listed in ``skip.indices``."""
+        if self._errors is None:
+            import jsonschema
+
+            generic = validator._generic_validator()
+            items = type(generic).VALIDATORS["items"]
+            skip = self.skip
+
+            def items_skipping_valid(validator: Any, schema: Any, instance: Any, parent: Any) -> Any:
+                known: Optional[Set[int]] = getattr(skip, "indices", {}).get(id(instance))
+                if known is None:
+                    yield from items(validator, schema, instance, parent)
+                    return
+                # Elements known to be valid yield no errors; leave them out.
+                for index, item in enumerate(instance):
+                    if index not in known:
+                        yield from validator.descend(item, schema, path=index)
+
+            cls = jsonschema.validators.extend(type(generic), {"items": items_skipping_valid})
+            self._errors = cls(validator.schema)
+        return self._errors
+
+    def iter_errors(self, validator: ManifestValidator, instance: Dict[str, Any]) -> Iterator[ValidationError]:
+        """jsonschema's errors for ``instance``, descending only into array elements that fail their check."""
+        skip: Dict[int, Set[int]] = {}
+        for key, value in instance.items():
+            part = self.parts.get(key)
+            if part is not None and part.element is not None and isinstance(value, list):
+                skip[id(value)] = {index for index, item in enumerate(value) if part.element(item)}
+        self.skip.indices = skip
+        try:
+            yield from self.error_validator(validator).iter_errors(instance)
+        finally:
+            self.skip.indices = {}
+
+
+# Plans are built once per validator (compiling the part checks takes milliseconds).
+_PLANS: "weakref.WeakKeyDictionary[ManifestValidator, Optional[_Plan]]" = weakref.WeakKeyDictionary()
+
+
+def _plan_for(validator: ManifestValidator) -> Optional[_Plan]:
+    if validator not in _PLANS:
+        try:
+            _PLANS[validator] = _Plan(validator)
+        except ValueError:
+            _PLANS[validator] = None
+    return _PLANS[validator]
+
+
+def iter_errors(instance: Any, validator: Optional[ManifestValidator] = None) -> Iterator[ValidationError]:
+    """jsonschema's errors for ``instance``, as ``validator`` (default: the cached one) reports them.
+
+    Array elements that pass their compiled check are not descended into, so
+    building the errors of a large manifest with one bad implementation
+    skips the valid ones. Falls back to the full search when the validator
+    is not compiled or its schema cannot be split into parts.
+    """
+    validator = validator or _default_validator()
+    if validator.compiled and isinstance(instance, dict):
+        plan = _plan_for(validator)
+        if plan is not None:
+            return plan.iter_errors(validator, instance)
+    return iter(validator._generic_validator().iter_errors(instance))
+
+
+class IncrementalValidator:
+    """Validate successive versions of a manifest, rechecking only what changed.
+
+    ``error(manifest)`` compares ``manifest`` with the version passed to the
+    previous call. ``revalidate(previous, manifest)`` compares with
+    ``previous`` instead; if that is not the last version this object
+    checked, it must be a manifest that passed validation.
+
+    Pass a new object for each version (e.g. re-parsed from the editor
+    buffer): a dict changed in place after being checked cannot be told
+    apart from its earlier version. Instances are not thread-safe.
+    """
+
+    def __init__(self, validator: Optional[ManifestValidator] = None) -> None:
+        self.validator = validator or _default_validator()
+        self._plan = _plan_for(self.validator)
+        self._reuse = self._plan is not None and not self._plan.compiled
+        # Results of the last version: field -> (value, ok); array field -> (elements, ok per element).
+        self._last: Any = None
+        self._fields: Dict[str, Tuple[Any, bool]] = {}
+        self._elements: Dict[str, Tuple[List[Any], List[bool]]] = {}
+        self.checked = 0
+        self.reused = 0
+
+    def _field(self, key: str, value: Any, check: Check) -> bool:
+        previous = self._fields.get(key)
+        if self._reuse and previous is not None and _same_json(previous[0], value):
+            self.reused += 1
+            ok = previous[1]
+        else:
+            self.checked += 1
+            ok = check(value)
+        self._fields[key] = (value, ok)
+        return ok
+
+    def _array(self, key: str, values: List[Any], check: Check) -> List[bool]:
+        old, old_ok = self._elements.get(key, ((), ()))
+        by_name: Dict[Any, List[int]] = {}
+        if self._reuse:
+            for index, item in enumerate(old):
+                if isinstance(item, dict) and isinstance(item.get("name"), str):
+                    by_name.setdefault(item["name"], []).append(index)
+        results: List[bool] = []
+        for index, item in enumerate(values):
+            ok: Optional[bool] = None
+            if self._reuse:
+                # Same position first, then an element with the same name (moved or shifted).
+                candidates = [index] if index < len(old) else []
+                if isinstance(item, dict):
+                    candidates += by_name.get(item.get("name"), ())
+                for candidate in candidates:
+                    if _same_json(old[candidate], item):
+                        ok = old_ok[candidate]
+                        break
+            if ok is None:
+                self.checked += 1
+                ok = check(item)
+            else:
+                self.reused += 1
+            results.append(ok)
+        self._elements[key] = (list(values), results)
+        return results
+
+    def _remember_valid(self, manifest: Dict[str, Any]) -> None:
+        """Record every part of ``manifest`` as valid (it passed validation)."""
+        self._last = manifest
+        self._fields, self._elements = {}, {}
+        assert self._plan is not None
+        for key, value in manifest.items():
+            part = self._plan.parts.get(key)
+            if part is None:
+                continue
+            if part.element is not None and isinstance(value, list):
+                self._elements[key] = (list(value), [True] * len(value))
+            else:
+                self._fields[key] = (value, True)
+
+    def error(self, manifest: JsonLike) -> Optional[ValidationError]:
+        """Return the error ``jsonschema.validate`` would raise for ``manifest``, or None."""
+        instance = _ensure_json(manifest)
+        plan = self._plan
+        if plan is None or not isinstance(instance, dict):
+            self._last = None
+            return self.validator.error(instance)
+        if not self._reuse and self.validator.is_valid(instance):
+            # Compiled checks: one pass over the whole manifest is the cheapest
+            # way to confirm validity; parts only matter for building the error.
+            self._last = instance
+            return None
+        ok = plan.shell(instance)
+        fields: Dict[str, Tuple[Any, bool]] = {}
+        elements: Dict[str, Tuple[List[Any], List[bool]]] = {}
+        skip: Dict[int, Set[int]] = {}
+        for key, value in instance.items():
+            part = plan.parts.get(key)
+            if part is None:
+                continue  # unknown key: the shell reports it
+            if part.element is not None and isinstance(value, list):
+                results = self._array(key, value, part.element)
+                elements[key] = self._elements[key]
+                ok = part.check(value) and all(results) and ok
+                skip[id(value)] = {index for index, result in enumerate(results) if result}
+            else:
+                ok = self._field(key, value, part.check) and ok
+                fields[key] = self._fields[key]
+        self._last, self._fields, self._elements = instance, fields, elements
+        if ok:
+            return None
+        from jsonschema.exceptions import best_match
+
+        plan.skip.indices = skip
+        try:
+            return best_match(plan.error_validator(self.validator).iter_errors(instance))
+        finally:
+            plan.skip.indices = {}
+
+    def revalidate(self, previous: JsonLike, manifest: JsonLike) -> Optional[ValidationError]:
+        """Like ``error(manifest)``, diffing against ``previous`` (a validated manifest)."""
+        if self._plan is not None and previous is not self._last:
+            previous = _ensure_json(previous)
+            if isinstance(previous, dict):
+                self._remember_valid(previous)
+        return self.error(manifest)
+
+    def validate(self, manifest: JsonLike) -> None:
+        """Raise jsonschema.ValidationError if ``manifest`` is invalid."""
+        error = self.error(manifest)
+        if error is not None:
+            raise error
+
+    def is_valid(self, manifest: JsonLike) -> bool:
+        return self.error(manifest) is None
+
+    def reset(self) -> None:
+        """Forget the previous version."""
+        self._last = None
+        self._fields, self._elements = {}, {}
+
+
+def revalidate(
+    previous: JsonLike, manifest: JsonLike, validator: Optional[ManifestValidator] = None
+) -> Optional[ValidationError]:
+    """Return the error for ``manifest`` (or None), rechecking only what changed since ``previous``.
+
+    ``previous`` must be a manifest that passed validation.
+    """
+    return IncrementalValidator(validator).revalidate(previous, manifest)
@@ -0,0 +1,289 @@
+"""In-memory inverted index over the implementations of many manifests.
+
+A directory of manifests (one per domain) answers questions such as "remote
+``mcp`` implementations using ``oauth2_code`` tagged ``tools``" or "local
+packages installed with ``npm``". ``ManifestIndex`` keeps, for each indexed
+field, a posting set of implementation ids per value; a query intersects the
+sets of its criteria, smallest first, instead of scanning every manifest.
+
+Indexed fields (``FIELDS``): ``protocol``, ``type``, ``scheme`` (the
+authentication scheme), ``tag`` (each of the implementation's tags),
+``manager`` (``package.manager``), ``status`` and ``mcp_version``.
+
+::
+
+    index = ManifestIndex()
+    index.add("example.com", manifest)          # AidManifest, dict or JSON text
+    index.query(type="remote", protocol="mcp", scheme="oauth2_code", tag="tools")
+    index.query(manager=["npm", "npx"])         # a collection matches any of its values
+    index.remove("example.com")
+    index.save("directory.idx.json")
+    index = ManifestIndex.load("directory.idx.json")
+
+``add`` with a key that is already indexed replaces its manifest. Snapshots
+store the posting lists and each manifest as its own JSON string; ``load``
+rebuilds no posting and decodes a manifest only when a query returns it
+(as a ``LazyAidManifest`` view) or its key is updated. Safe to share across
+threads.
+"""
+from __future__ import annotations
+
+import os
+import threading
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, NamedTuple, Optional, Set, Tuple, Union
+
+from . import JsonLike, _ensure_json
+
+if TYPE_CHECKING:
+    from .models import AidManifest, Implementation
+
+FIELDS = ("protocol", "type", "scheme", "tag", "manager", "status", "mcp_version")
+SNAPSHOT_VERSION = 1
+
+Criterion = Union[str, Iterable[str]]
+
+
+class Match(NamedTuple):
+    key: str
+    position: int
+    """Index of the implementation in ``manifest.implementations``."""
+
+    manifest: AidManifest
+
+    @property
+    def implementation(self) -> Implementation:
+        return self.manifest.implementations[self.position]
+
+
+def _value(x: Any) -> Any:
+    # Enum members (model input) index under their JSON value.
+    return getattr(x, "value", x)
+
+
+def _terms_from_dict(impl: Dict[str, Any]) -> Iterator[Tuple[str, str]]:
+    yield "protocol", impl.get("protocol")
+    yield "type", impl.get("type")
+    yield "scheme", (impl.get("authentication") or {}).get("scheme")
+    for tag in impl.get("tags") or ():
+        yield "tag", tag
+    yield "manager", (impl.get("package") or {}).get("manager")
+    yield "status", impl.get("status")
+    yield "mcp_version", impl.get("mcpVersion")
+
+
+def _terms_from_model(impl: Implementation) -> Iterator[Tuple[str, str]]:
+    yield "protocol", impl.protocol
+    yield "type", _value(impl.type)
+    yield "scheme", _value(impl.authentication.scheme) if impl.authentication is not None else None
+    for tag in impl.tags or ():
+        yield "tag", tag
+    yield "manager", impl.package.manager if impl.package is not None else None
+    yield "status", _value(impl.status)
+    yield "mcp_version", impl.mcp_version
+
+
+class ManifestIndex:
+    """Inverted index of manifest implementations by ``FIELDS``; see the module docstring."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._manifests: Dict[str, Any] = {}  # key -> AidManifest, or its JSON text (from a snapshot)
+        self._ids: Dict[str, List[int]] = {}  # key -> implementation ids, by position
+        self._owners: Dict[int, Tuple[str, int]] = {}  # implementation id -> (key, position)
+        # key -> (field, value, id) postings, to remove them; rebuilt on demand for loaded keys.
+        self._terms: Dict[str, List[Tuple[str, str, int]]] = {}
+        self._postings: Dict[str, Dict[str, Set[int]]] = {field: {} for field in FIELDS}
+        self._next_id = 0
+
+    def __len__(self) -> int:
+        return len(self._manifests)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._manifests
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._manifests)
+
+    def get(self, key: str) -> Optional[AidManifest]:
+        with self._lock:
+            manifest = self._manifests.get(key)
+            if isinstance(manifest, str):
+                from .lazy import lazy_manifest
+
+                manifest = self._manifests[key] = lazy_manifest(_ensure_json(manifest))
+            return manifest
+
+    def add(self, key: str, manifest: Union[JsonLike, AidManifest]) -> None:
+        """Index ``manifest`` under ``key`` (e.g. its domain), replacing any previous one.
+
+        ``manifest`` should be valid; it is not validated here.
+        """
+        from .models import AidManifest
+
+        if isinstance(manifest, AidManifest):
+            model = manifest
+            terms = [list(_terms_from_model(impl)) for impl in manifest.implementations]
+        else:
+            from .lazy import lazy_manifest
+
+            data = _ensure_json(manifest)
+            model = lazy_manifest(data)
+            terms = [list(_terms_from_dict(impl)) for impl in data["implementations"]]
+        with self._lock:
+            self._remove(key)
+            self._manifests[key] = model
+            ids = self._ids[key] = []
+            posted = self._terms[key] = []
+            for position, impl_terms in enumerate(terms):
+                ident = self._next_id
+                self._next_id += 1
+                ids.append(ident)
+                self._owners[ident] = (key, position)
+                for field, value in impl_terms:
+                    if value is not None:
+                        self._postings[field].setdefault(value, set()).add(ident)
+                        posted.append((field, value, ident))
+
+    def remove(self, key: str) -> bool:
+        """Drop the manifest indexed under ``key``; return False if there was none."""
+        with self._lock:
+            return self._remove(key)
+
+    def _remove(self, key: str) -> bool:
+        ids = self._ids.pop(key, None)
+        if ids is None:
+            return False
+        manifest = self._manifests.pop(key)
+        for ident in ids:
+            del self._owners[ident]
+        terms = self._terms.pop(key, None)
+        if terms is None:
+            data = _ensure_json(manifest) if isinstance(manifest, str) else manifest.to_dict()
+            terms = [
+                (field, value, ident)
+                for ident, impl in zip(ids, data["implementations"])
+                for field, value in _terms_from_dict(impl)
+                if value is not None
+            ]
+        for field, value, ident in terms:
+            postings = self._postings[field]
+            members = postings.get(value)
+            if members is None:
+                continue  # a repeated tag, already dropped
+            members.discard(ident)
+            if not members:
+                del postings[value]
+        return True
+
+    def _select(self, criteria: Dict[str, Optional[Criterion]]) -> Set[int]:
+        unknown = set(criteria) - set(FIELDS)
+        if unknown:
+            raise TypeError(f"unknown index field(s): {', '.join(sorted(unknown))}; expected {', '.join(FIELDS)}")
+        candidates: List[Set[int]] = []
+        for field, wanted in criteria.items():
+            if wanted is None:
+                continue
+            postings = self._postings[field]
+            if isinstance(wanted, str):
+                candidates.append(postings.get(wanted, set()))
+            else:
+                union: Set[int] = set()
+                for value in wanted:
+                    union |= postings.get(value, set())
+                candidates.append(union)
+        if not candidates:
+            return set(self._owners)
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for members in candidates[1:]:
+            if not result:
+                break
+            result &= members
+        return result
+
+    def query(self, all_tags: Iterable[str] = (), **criteria: Optional[Criterion]) -> List[Match]:
+        """Implementations matching every criterion, ordered by key and position.
+
+        Each criterion is a field of ``FIELDS`` with a value, or a collection
+        of values matching any of them; ``None`` is ignored. ``all_tags``
+        requires every one of the given tags. No criteria match everything.
+        """
+        with self._lock:
+            selected = self._select(criteria)
+            for tag in all_tags:
+                selected &= self._postings["tag"].get(tag, set())
+            owners = sorted(self._owners[ident] for ident in selected)
+            return [Match(key, position, self.get(key)) for key, position in owners]
+
+    def count(self, all_tags: Iterable[str] = (), **criteria: Optional[Criterion]) -> int:
+        """Number of implementations ``query`` would return."""
+        with self._lock:
+            selected = self._select(criteria)
+            for tag in all_tags:
+                selected &= self._postings["tag"].get(tag, set())
+            return len(selected)
+
+    def facets(self, field: str) -> Dict[str, int]:
+        """Value -> number of implementations for ``field``, e.g. ``facets("manager")``."""
+        if field not in self._postings:
+            raise KeyError(field)
+        with self._lock:
+            return {value: len(members) for value, members in self._postings[field].items()}
+
+    def save(self, path: Union[str, os.PathLike]) -> None:
+        """Write a snapshot of the index to ``path`` (atomically, via a temporary file)."""
+        from . import jsonio
+
+        with self._lock:
+            keys = list(self._manifests)
+            # Renumber implementation ids densely: key i's implementations follow key i-1's.
+            renumber: Dict[int, int] = {}
+            counts = []
+            for key in keys:
+                ids = self._ids[key]
+                counts.append(len(ids))
+                for ident in ids:
+                    renumber[ident] = len(renumber)
+            snapshot = {
+                "version": SNAPSHOT_VERSION,
+                "keys": keys,
+                "counts": counts,
+                "manifests": [
+                    m if isinstance(m, str) else jsonio.dumps(m.to_dict()).decode("utf-8")
+                    for m in map(self._manifests.__getitem__, keys)
+                ],
+                "postings": {
+                    field: {value: sorted(renumber[i] for i in members) for value, members in postings.items()}
+                    for field, postings in self._postings.items()
+                },
+            }
+        data = jsonio.dumps(snapshot)
+        tmp = f"{os.fspath(path)}.tmp{os.getpid()}"
+        with open(tmp, "wb") as fh:
+            fh.write(data)
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Union[str, os.PathLike]) -> ManifestIndex:
+        """Read a snapshot written by ``save``. Raises ValueError for other files or versions."""
+        from . import jsonio
+
+        with open(path, "rb") as fh:
+            snapshot = jsonio.loads(fh.read())
+        if not isinstance(snapshot, dict) or snapshot.get("version") != SNAPSHOT_VERSION:
+            raise ValueError(f"{os.fspath(path)}: not a manifest index snapshot (version {SNAPSHOT_VERSION})")
+        index = cls()
+        ident = 0
+        for key, count, manifest in zip(snapshot["keys"], snapshot["counts"], snapshot["manifests"]):
+            index._manifests[key] = manifest
+            index._ids[key] = list(range(ident, ident + count))
+            for position in range(count):
+                index._owners[ident + position] = (key, position)
+            ident += count
+        index._next_id = ident
+        for field in FIELDS:
+            index._postings[field] = {
+                value: set(members) for value, members in snapshot["postings"].get(field, {}).items()
+            }
+        return index
@@ -0,0 +1,208 @@
+"""Opt-in per-phase timers and counters.
+
+When validation is slow, the phases tell where the time goes:
+
+- ``read``: file I/O in ``aid-validate``;
+- ``decode``: JSON decoding of str/bytes input (``_ensure_json``);
+- ``validate``: schema validation (``ManifestValidator`` and the module-level helpers);
+- ``from_dict``: building the typed models (``fastmodels.manifest_from_dict``);
+- ``txt``: TXT record validation (``validate_txt``).
+
+Instrumentation is off by default. ``enable()`` installs a ``Profiler``
+that records every phase call: count, failures, bytes processed, total/min/max
+seconds and a histogram of durations over fixed ``BUCKETS`` (upper bounds in
+seconds, Prometheus-style). ``add_hook(fn)`` calls ``fn(event)`` with a
+``PhaseEvent`` after each phase, e.g. to forward to a metrics client.
+
+While disabled, instrumented code only tests ``instrument.active is None``.
+The ``--profile`` flag of ``aid-validate`` prints ``Profiler.summary()``.
+
+::
+
+    with instrument.profiling() as profiler:
+        run_workload()
+    print(profiler.summary())
+"""
+from __future__ import annotations
+
+import contextlib
+import threading
+import time
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional, Sequence
+
+BUCKETS = (1e-5, 5e-5, 1e-4, 5e-4, 1e-3, 5e-3, 1e-2, 5e-2, 0.1, 0.5, 1.0, float("inf"))
+"""Upper bounds (seconds) of the duration histogram buckets."""
+
+PHASES = ("read", "decode", "validate", "from_dict", "txt")
+
+
+class PhaseEvent(NamedTuple):
+    phase: str
+    seconds: float
+    ok: bool
+    nbytes: int
+
+
+class PhaseStats:
+    """Counters and duration histogram of one phase."""
+
+    __slots__ = ("calls", "failures", "bytes", "seconds", "min", "max", "buckets")
+
+    def __init__(self, size: int) -> None:
+        self.calls = 0
+        self.failures = 0
+        self.bytes = 0
+        self.seconds = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+        self.buckets = [0] * size
+
+    def to_dict(self, bounds: Sequence[float]) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "failures": self.failures,
+            "bytes": self.bytes,
+            "seconds": self.seconds,
+            "min": self.min if self.calls else 0.0,
+            "max": self.max,
+            "buckets": {("+Inf" if b == float("inf") else repr(b)): n for b, n in zip(bounds, self.buckets)},
+        }
+
+
+class _Timer:
+    __slots__ = ("profiler", "phase", "nbytes", "ok", "start")
+
+    def __init__(self, profiler: Profiler, phase: str, nbytes: int) -> None:
+        self.profiler = profiler
+        self.phase = phase
+        self.nbytes = nbytes
+        self.ok = True
+
+    def __enter__(self) -> _Timer:
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        self.profiler.record(self.phase, time.perf_counter() - self.start, self.ok and exc_type is None, self.nbytes)
+
+
+class Profiler:
+    """Thread-safe aggregate of phase timings, with optional hooks."""
+
+    def __init__(self, buckets: Sequence[float] = BUCKETS) -> None:
+        if list(buckets) != sorted(buckets) or buckets[-1] != float("inf"):
+            raise ValueError("buckets must be increasing and end with inf")
+        self.buckets = tuple(buckets)
+        self.phases: Dict[str, PhaseStats] = {}
+        self.hooks: List[Callable[[PhaseEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def timer(self, phase: str, nbytes: int = 0) -> _Timer:
+        """Context manager timing one call of ``phase``; set ``.ok = False`` to count a failure.
+
+        An exception escaping the block also counts as a failure.
+        """
+        return _Timer(self, phase, nbytes)
+
+    def record(self, phase: str, seconds: float, ok: bool = True, nbytes: int = 0) -> None:
+        with self._lock:
+            stats = self.phases.get(phase)
+            if stats is None:
+                stats = self.phases[phase] = PhaseStats(len(self.buckets))
+            stats.calls += 1
+            stats.failures += not ok
+            stats.bytes += nbytes
+            stats.seconds += seconds
+            stats.min = min(stats.min, seconds)
+            stats.max = max(stats.max, seconds)
+            for index, bound in enumerate(self.buckets):
+                if seconds <= bound:
+                    stats.buckets[index] += 1
+                    break
+        if self.hooks:
+            event = PhaseEvent(phase, seconds, ok, nbytes)
+            for hook in list(self.hooks):
+                hook(event)
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Phase name -> counters, JSON-ready. Histogram buckets are per bucket (not cumulative)."""
+        with self._lock:
+            return {phase: stats.to_dict(self.buckets) for phase, stats in self.phases.items()}
+
+    def merge(self, snapshot: Dict[str, Dict[str, Any]]) -> None:
+        """Add a ``snapshot()`` taken elsewhere (e.g. in a worker process) to these counters."""
+        with self._lock:
+            for phase, data in snapshot.items():
+                stats = self.phases.get(phase)
+                if stats is None:
+                    stats = self.phases[phase] = PhaseStats(len(self.buckets))
+                if len(data["buckets"]) != len(stats.buckets):
+                    raise ValueError("snapshot uses different buckets")
+                stats.calls += data["calls"]
+                stats.failures += data["failures"]
+                stats.bytes += data["bytes"]
+                stats.seconds += data["seconds"]
+                if data["calls"]:
+                    stats.min = min(stats.min, data["min"])
+                stats.max = max(stats.max, data["max"])
+                for index, count in enumerate(data["buckets"].values()):
+                    stats.buckets[index] += count
+
+    def reset(self) -> None:
+        with self._lock:
+            self.phases.clear()
+
+    def summary(self) -> str:
+        """A table of the phases: calls, failures, bytes, total and mean time, and the slowest call."""
+        rows = [f"{'phase':10} {'calls':>8} {'failed':>7} {'bytes':>12} {'total ms':>10} {'mean us':>9} {'max ms':>8}"]
+        snapshot = self.snapshot()
+        for phase in sorted(snapshot, key=lambda p: (PHASES.index(p) if p in PHASES else len(PHASES), p)):
+            s = snapshot[phase]
+            mean = s["seconds"] / s["calls"] * 1e6 if s["calls"] else 0.0
+            rows.append(
+                f"{phase:10} {s['calls']:8} {s['failures']:7} {s['bytes']:12} "
+                f"{s['seconds'] * 1e3:10.2f} {mean:9.1f} {s['max'] * 1e3:8.2f}"
+            )
+        return "\n".join(rows)
+
+
+active: Optional[Profiler] = None
+"""The installed profiler, or None when instrumentation is disabled."""
+
+
+def enable(profiler: Optional[Profiler] = None) -> Profiler:
+    """Start recording into ``profiler`` (a new one if None) and return it."""
+    global active
+    active = profiler if profiler is not None else Profiler()
+    return active
+
+
+def disable() -> Optional[Profiler]:
+    """Stop recording; return the profiler that was installed."""
+    global active
+    profiler, active = active, None
+    return profiler
+
+
+@contextlib.contextmanager
+def profiling(profiler: Optional[Profiler] = None) -> Iterator[Profiler]:
+    """Record phases inside the ``with`` block, then restore the previous state."""
+    global active
+    previous = active
+    installed = enable(profiler)
+    try:
+        yield installed
+    finally:
+        active = previous
+
+
+def add_hook(hook: Callable[[PhaseEvent], None]) -> Profiler:
+    """Call ``hook(event)`` after every phase; enables instrumentation if needed."""
+    profiler = active if active is not None else enable()
+    profiler.hooks.append(hook)
+    return profiler
+
+
+def remove_hook(hook: Callable[[PhaseEvent], None]) -> None:
+    if active is not None and hook in active.hooks:
+        active.hooks.remove(hook)
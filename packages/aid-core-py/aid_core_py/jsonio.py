@@ -0,0 +1,192 @@
+"""Pluggable JSON decoder/encoder backend.
+
+Manifest decoding (``validate_manifest``, ``parse_manifest``, the CLI, the
+NDJSON stream and the resolver) goes through ``loads``, which uses the
+fastest installed backend: ``orjson`` if importable, else the stdlib ``json``
+module. Select one explicitly with ``set_backend(name)`` or the
+``AID_JSON_BACKEND`` environment variable, and add others with
+``register_backend``. ``python -m aid_core_py.jsonio [files...]`` benchmarks
+every installed backend.
+
+``loads`` accepts ``str``, ``bytes``, ``bytearray`` and ``memoryview``;
+backends that parse UTF-8 buffers directly (orjson) do so without decoding to
+``str`` first. Input the backend rejects is re-parsed with the stdlib, so
+error messages are the stdlib's and stdlib extensions (``NaN``,
+``Infinity``, lone surrogates) still decode. orjson reads integers beyond
+64 bits as floats.
+
+``dumps`` returns compact UTF-8 JSON bytes, equal to
+``json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()``
+except that non-stdlib backends may spell float exponents differently
+(``1e16`` for ``1e+16``) and write NaN/Infinity as ``null``.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sys
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Union
+
+Buffer = Union[str, bytes, bytearray, memoryview]
+
+ENV_VAR = "AID_JSON_BACKEND"
+
+
+class JsonBackend(NamedTuple):
+    name: str
+    loads: Callable[[Buffer], Any]
+    """Decode a JSON document; raise ValueError on invalid input."""
+
+    dumps: Callable[[Any, bool], bytes]
+    """``dumps(obj, sort_keys)`` -> compact UTF-8 JSON."""
+
+
+def _stdlib_loads(data: Buffer) -> Any:
+    if isinstance(data, memoryview):
+        data = data.tobytes()
+    return json.loads(data)
+
+
+def _stdlib_dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    return json.dumps(obj, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _orjson() -> JsonBackend:
+    import orjson
+
+    orjson_loads, orjson_dumps = orjson.loads, orjson.dumps
+    decode_error, encode_error = orjson.JSONDecodeError, orjson.JSONEncodeError
+
+    def loads(data: Buffer) -> Any:
+        try:
+            return orjson_loads(data)
+        except decode_error:
+            return _stdlib_loads(data)
+
+    def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+        try:
+            return orjson_dumps(obj, option=orjson.OPT_SORT_KEYS if sort_keys else 0)
+        except encode_error:  # e.g. integers beyond 64 bits or non-str keys
+            return _stdlib_dumps(obj, sort_keys)
+
+    return JsonBackend("orjson", loads, dumps)
+
+
+STDLIB = JsonBackend("stdlib", _stdlib_loads, _stdlib_dumps)
+
+# name -> factory, in order of preference. Factories raise ImportError when
+# the backend is not installed.
+_FACTORIES: Dict[str, Callable[[], JsonBackend]] = {"orjson": _orjson, "stdlib": lambda: STDLIB}
+_BACKEND: Optional[JsonBackend] = None
+
+
+def register_backend(name: str, factory: Callable[[], JsonBackend], preferred: bool = False) -> None:
+    """Make ``factory`` available as backend ``name``.
+
+    With ``preferred=True`` it is tried first when the backend is picked
+    automatically. Takes effect for automatic selection on the next
+    ``set_backend()`` call.
+    """
+    _FACTORIES.pop(name, None)
+    if preferred:
+        items = list(_FACTORIES.items())
+        _FACTORIES.clear()
+        _FACTORIES[name] = factory
+        _FACTORIES.update(items)
+    else:
+        _FACTORIES[name] = factory
+
+
+def available_backends() -> List[str]:
+    """Names of the registered backends that can be loaded, in order of preference."""
+    names = []
+    for name, factory in _FACTORIES.items():
+        try:
+            factory()
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+
+def set_backend(name: Optional[str] = None) -> JsonBackend:
+    """Select backend ``name``, or the preferred installed one if None.
+
+    Raises ValueError for an unknown name and ImportError if the backend's
+    library is not installed.
+    """
+    global _BACKEND
+    if name is None:
+        for factory in _FACTORIES.values():
+            try:
+                _BACKEND = factory()
+                break
+            except ImportError:
+                continue
+        else:
+            _BACKEND = STDLIB
+        return _BACKEND
+    if name not in _FACTORIES:
+        raise ValueError(f"unknown JSON backend {name!r}; available: {', '.join(available_backends())}")
+    _BACKEND = _FACTORIES[name]()
+    return _BACKEND
+
+
+def get_backend() -> JsonBackend:
+    """The current backend, chosen on first use (``AID_JSON_BACKEND`` or the preferred installed one)."""
+    backend = _BACKEND
+    if backend is None:
+        backend = set_backend(os.environ.get(ENV_VAR) or None)
+    return backend
+
+
+def loads(data: Buffer) -> Any:
+    """Decode ``data`` with the current backend."""
+    return get_backend().loads(data)
+
+
+def dumps(obj: Any, sort_keys: bool = False) -> bytes:
+    """Encode ``obj`` as compact UTF-8 JSON with the current backend."""
+    return get_backend().dumps(obj, sort_keys)
+
+
+def benchmark(documents: List[bytes], repeat: int = 5) -> Dict[str, Dict[str, float]]:
+    """Microseconds per document for ``loads`` and ``dumps`` of each installed backend (best of ``repeat``)."""
+    results: Dict[str, Dict[str, float]] = {}
+    for name in available_backends():
+        backend = _FACTORIES[name]()
+        decoded = [backend.loads(doc) for doc in documents]
+        timings: Dict[str, float] = {}
+        for op, run in (
+            ("loads", lambda: [backend.loads(doc) for doc in documents]),
+            ("dumps", lambda: [backend.dumps(obj, False) for obj in decoded]),
+        ):
+            best = float("inf")
+            for _ in range(repeat):
+                start = time.perf_counter()
+                run()
+                best = min(best, time.perf_counter() - start)
+            timings[op] = best / len(documents) * 1e6
+        results[name] = timings
+    return results
+
+
+def main() -> None:
+    paths = sys.argv[1:]
+    if paths:
+        documents = []
+        for path in paths:
+            with open(path, "rb") as fh:
+                documents.append(fh.read())
+    else:
+        from . import _load_schema
+
+        documents = [json.dumps(_load_schema()).encode("utf-8")]
+    print(f"{len(documents)} document(s), {sum(map(len, documents))} bytes")
+    for name, timings in benchmark(documents).items():
+        print(f"{name:10} loads {timings['loads']:9.1f} us/doc   dumps {timings['dumps']:9.1f} us/doc")
+
+
+if __name__ == "__main__":
+    main()
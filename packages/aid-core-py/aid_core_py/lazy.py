@@ -0,0 +1,181 @@
+"""Lazy ``AidManifest`` view backed by the raw manifest dict.
+
+``AidManifest.from_dict`` converts every implementation up front, including
+nested ``requiredConfig``, ``execution.platformOverrides`` and
+``certificate``. A ``LazyAidManifest`` keeps the dict and converts
+``metadata`` and each implementation only when it is first accessed, caching
+the result. It is an ``AidManifest`` subclass with the same attributes, so it
+works anywhere the eager model does.
+
+``to_dict()`` on a view whose sub-objects were never materialized (or
+assigned) returns the original dict itself; otherwise untouched parts are
+reused as-is and only materialized ones are rebuilt.
+"""
+from __future__ import annotations
+
+from collections.abc import MutableSequence
+from typing import Any, Dict, Iterator, List, Optional
+
+from . import fastmodels
+from . import models as m
+
+_UNSET: Any = object()
+
+
+class LazyImplementations(MutableSequence):
+    """List of implementations converted one by one on first access."""
+
+    __slots__ = ("_raw", "_items", "_changed")
+
+    def __init__(self, raw: List[Any]) -> None:
+        self._raw = list(raw)
+        self._items: List[Any] = [_UNSET] * len(raw)
+        self._changed = False
+
+    def _get(self, index: int) -> m.Implementation:
+        item = self._items[index]
+        if item is _UNSET:
+            item = self._items[index] = fastmodels.from_dict(m.Implementation, self._raw[index])
+            self._changed = True
+        return item
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self._get(i) for i in range(*index.indices(len(self._items)))]
+        return self._get(range(len(self._items))[index])
+
+    def __setitem__(self, index: Any, value: Any) -> None:
+        self._changed = True
+        if isinstance(index, slice):
+            value = list(value)
+            self._items[index] = value
+            self._raw[index] = [None] * len(value)
+        else:
+            self._items[index] = value
+
+    def __delitem__(self, index: Any) -> None:
+        self._changed = True
+        del self._items[index]
+        del self._raw[index]
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[m.Implementation]:
+        for index in range(len(self._items)):
+            yield self._get(index)
+
+    def insert(self, index: int, value: m.Implementation) -> None:
+        self._changed = True
+        self._items.insert(index, value)
+        self._raw.insert(index, None)
+
+    def __repr__(self) -> str:
+        return f"<LazyImplementations {self.materialized}/{len(self._items)} loaded>"
+
+    @property
+    def materialized(self) -> int:
+        """Number of implementations converted so far."""
+        return sum(item is not _UNSET for item in self._items)
+
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [raw if item is _UNSET else item.to_dict() for raw, item in zip(self._raw, self._items)]
+
+
+class LazyAidManifest(m.AidManifest):
+    """``AidManifest`` whose sub-objects are converted on first access."""
+
+    __slots__ = ("_raw", "_implementations", "_metadata", "_overrides")
+
+    def __init__(self, raw: Dict[str, Any]) -> None:
+        assert isinstance(raw, dict)
+        self._raw = raw
+        self._implementations: Optional[LazyImplementations] = None
+        self._metadata: Any = _UNSET
+        self._overrides: Dict[str, Any] = {}
+
+    @property  # type: ignore[override]
+    def implementations(self) -> LazyImplementations:
+        if self._implementations is None:
+            raw = self._raw.get("implementations")
+            assert isinstance(raw, list)
+            self._implementations = LazyImplementations(raw)
+        return self._implementations
+
+    @implementations.setter
+    def implementations(self, value: List[m.Implementation]) -> None:
+        impls = LazyImplementations([])
+        impls[:] = value
+        self._implementations = impls
+
+    @property  # type: ignore[override]
+    def metadata(self) -> Optional[m.Metadata]:
+        if self._metadata is _UNSET:
+            raw = self._raw.get("metadata")
+            self._metadata = None if raw is None else fastmodels.from_dict(m.Metadata, raw)
+        return self._metadata
+
+    @metadata.setter
+    def metadata(self, value: Optional[m.Metadata]) -> None:
+        self._metadata = value
+
+    # Scalars are cheap to read from the dict every time; assignments are
+    # kept aside so the dict given by the caller is never modified.
+
+    @property  # type: ignore[override]
+    def name(self) -> str:
+        if "name" in self._overrides:
+            return self._overrides["name"]
+        return m.from_str(self._raw.get("name"))
+
+    @name.setter
+    def name(self, value: str) -> None:
+        self._overrides["name"] = value
+
+    @property  # type: ignore[override]
+    def schema_version(self) -> m.SchemaVersion:
+        if "schema_version" in self._overrides:
+            return self._overrides["schema_version"]
+        return m.SchemaVersion(self._raw.get("schemaVersion"))
+
+    @schema_version.setter
+    def schema_version(self, value: m.SchemaVersion) -> None:
+        self._overrides["schema_version"] = value
+
+    @property  # type: ignore[override]
+    def signature(self) -> Any:
+        if "signature" in self._overrides:
+            return self._overrides["signature"]
+        return self._raw.get("signature")
+
+    @signature.setter
+    def signature(self, value: Any) -> None:
+        self._overrides["signature"] = value
+
+    @property
+    def untouched(self) -> bool:
+        """True while no sub-object has been materialized or assigned."""
+        impls = self._implementations
+        return self._metadata is _UNSET and not self._overrides and (impls is None or not impls._changed)
+
+    def to_dict(self) -> dict:
+        if self.untouched:
+            return self._raw
+        result: dict = {}
+        impls = self._implementations
+        result["implementations"] = self._raw["implementations"] if impls is None else impls.to_list()
+        if self._metadata is _UNSET:
+            if self._raw.get("metadata") is not None:
+                result["metadata"] = self._raw["metadata"]
+        elif self._metadata is not None:
+            result["metadata"] = m.to_class(m.Metadata, self._metadata)
+        result["name"] = m.from_str(self.name)
+        result["schemaVersion"] = m.to_enum(m.SchemaVersion, self.schema_version)
+        if self.signature is not None:
+            result["signature"] = self.signature
+        return result
+
+
+def lazy_manifest(obj: Any) -> LazyAidManifest:
+    """Wrap a manifest dict in a ``LazyAidManifest`` without converting anything."""
+    return LazyAidManifest(obj)
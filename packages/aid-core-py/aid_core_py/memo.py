@@ -0,0 +1,197 @@
+"""Content-addressed memo for manifest validation.
+
+Crawls and registries see the same manifest many times. ``ValidationMemo``
+keeps a bounded LRU of validation results (and, optionally, decoded models)
+so duplicates skip revalidation. Manifest text (``str`` or bytes) is keyed
+by the SHA-256 of its raw bytes, so a hit skips decoding as well;
+re-serialized copies are separate entries. A dict is validated by the
+compiled check and only memoized when it is invalid (building the error is
+the costly path) or with ``cache_models=True``, keyed by ``content_hash``:
+hashing canonical JSON costs more than checking a valid manifest.
+
+``content_hash`` identifies a manifest by its canonical JSON (sorted keys, no
+whitespace, ASCII escapes), whatever its key order or formatting.
+
+A ``ValidationMemo`` has the same ``error``/``validate``/``is_valid``/``parse``
+methods as ``ManifestValidator`` and can be passed wherever a validator is
+accepted, e.g. ``Resolver(validator=ValidationMemo())``.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from . import JsonLike, ManifestValidator, _default_validator, _ensure_json, _load_schema, _schema_hash
+
+if TYPE_CHECKING:
+    from jsonschema.exceptions import ValidationError
+
+    from .models import AidManifest
+
+DEFAULT_MAXSIZE = 4096
+
+_UNSET: Any = object()
+
+
+def canonical_json(manifest: JsonLike) -> bytes:
+    """Canonical UTF-8 JSON of ``manifest``: sorted keys, no whitespace, non-ASCII escaped.
+
+    Two manifests that decode to equal JSON values have the same canonical
+    form, whatever their key order or formatting.
+    """
+    return json.dumps(_ensure_json(manifest), sort_keys=True, separators=(",", ":")).encode("ascii")
+
+
+def content_hash(manifest: JsonLike) -> str:
+    """Hex SHA-256 of ``canonical_json(manifest)``."""
+    return hashlib.sha256(canonical_json(manifest)).hexdigest()
+
+
+class ValidationMemo:
+    """Bounded LRU of validation results keyed by manifest content; see the module docstring.
+
+    Each entry holds the ValidationError (or None) for a manifest and, with
+    ``cache_models=True``, the ``AidManifest`` built by ``parse``. Cached
+    models are shared between callers and must not be modified.
+
+    ``schema_hash`` is the hash of the schema the entries were computed
+    with. When it changes (the validator is replaced, e.g. with
+    ``clear(ManifestValidator(new_schema))``, or the bundled schema is
+    updated) the entries are dropped on the next lookup. Safe to share
+    across threads.
+    """
+
+    def __init__(
+        self,
+        validator: Optional[ManifestValidator] = None,
+        maxsize: int = DEFAULT_MAXSIZE,
+        cache_models: bool = False,
+    ) -> None:
+        self.validator = validator or _default_validator()
+        self.maxsize = maxsize
+        self.cache_models = cache_models
+        self._custom_hash: Optional[Tuple[Any, str]] = None
+        self.schema_hash = self._current_schema_hash()
+        self._entries: "OrderedDict[str, List[Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _current_schema_hash(self) -> str:
+        schema = self.validator.schema
+        if schema is _load_schema():
+            return _schema_hash()
+        cached = self._custom_hash
+        if cached is None or cached[0] is not schema:
+            canonical = json.dumps(schema, sort_keys=True, separators=(",", ":"))
+            cached = self._custom_hash = (schema, hashlib.sha256(canonical.encode("utf-8")).hexdigest())
+        return cached[1]
+
+    def _entry(self, manifest: JsonLike) -> Tuple[List[Any], Optional[Dict[str, Any]]]:
+        """Return the ``[error, model]`` entry for ``manifest``, validating it on a miss.
+
+        The second item is the decoded manifest when this call decoded it.
+        """
+        current = self._current_schema_hash()
+        if current != self.schema_hash:
+            with self._lock:
+                self._entries.clear()
+                self.schema_hash = current
+        instance = None
+        if isinstance(manifest, str):
+            key = "raw:" + hashlib.sha256(manifest.encode("utf-8", "surrogatepass")).hexdigest()
+        elif isinstance(manifest, (bytes, bytearray, memoryview)):
+            key = "raw:" + hashlib.sha256(manifest).hexdigest()
+        else:
+            instance = manifest
+            if not self.cache_models and self.validator.is_valid(instance):
+                return [None, _UNSET], instance
+            key = content_hash(instance)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry, instance
+            self.misses += 1
+        if instance is None:
+            instance = _ensure_json(manifest)
+        entry = [self.validator.error(instance), _UNSET]
+        if self.maxsize > 0:
+            with self._lock:
+                # Another thread may have stored the same key meanwhile; keep theirs.
+                entry = self._entries.setdefault(key, entry)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return entry, instance
+
+    def error(self, manifest: JsonLike) -> Optional[ValidationError]:
+        """Return the error ``jsonschema.validate`` would raise, or None if valid."""
+        return self._entry(manifest)[0][0]
+
+    def validate(self, manifest: JsonLike) -> None:
+        """Raise jsonschema.ValidationError if manifest is invalid."""
+        error = self.error(manifest)
+        if error is not None:
+            # The same error object is raised on every hit; drop the previous traceback.
+            raise error.with_traceback(None)
+
+    def is_valid(self, manifest: JsonLike) -> bool:
+        return self.error(manifest) is None
+
+    def validate_many(self, manifests: Iterable[JsonLike]) -> Iterator[Optional[ValidationError]]:
+        """Yield ``None`` for each valid manifest, or its ValidationError, in input order."""
+        for manifest in manifests:
+            yield self.error(manifest)
+
+    def iter_errors(self, manifest: JsonLike) -> Iterator[ValidationError]:
+        return self.validator.iter_errors(manifest)
+
+    def parse(self, manifest: JsonLike) -> AidManifest:
+        """Like ``ManifestValidator.parse``, skipping validation for known manifests.
+
+        With ``cache_models=True`` the decoded model is cached as well and the
+        same object is returned for every duplicate.
+        """
+        entry, instance = self._entry(manifest)
+        if entry[0] is not None:
+            raise entry[0].with_traceback(None)
+        model = entry[1]
+        if model is _UNSET:
+            from .fastmodels import manifest_from_dict
+
+            model = manifest_from_dict(_ensure_json(manifest) if instance is None else instance)
+            if self.cache_models:
+                entry[1] = model
+        return model
+
+    def clear(self, validator: Optional[ManifestValidator] = None) -> None:
+        """Drop all entries.
+
+        If ``validator`` is given, it replaces the current one (typically a
+        ``ManifestValidator`` built for the new schema).
+        """
+        with self._lock:
+            self._entries.clear()
+            if validator is not None:
+                self.validator = validator
+            self.schema_hash = self._current_schema_hash()
+
+    def stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+        }
@@ -1,3 +1,5 @@
+# Generated by scripts/generate-sdk.ts: quicktype output with __slots__ added
+# by addPythonSlots(). Do not edit by hand; run `pnpm sdk:generate`.
 from typing import Any, Optional, List, Union, TypeVar, Callable, Type, cast
 from enum import Enum
 
@@ -56,6 +58,7 @@ def to_float(x: Any) -> float:
 
 
 class Credential:
+    __slots__ = ("description", "key")
     description: str
     key: str
 
@@ -78,6 +81,7 @@ class Credential:
 
 
 class Oauth:
+    __slots__ = ("client_id", "dynamic_client_registration", "scopes")
     client_id: Optional[str]
     dynamic_client_registration: Optional[bool]
     """If true, signals support for RFC 7591 Dynamic Client Registration."""
@@ -115,6 +119,7 @@ class In(Enum):
 
 
 class Placement:
+    __slots__ = ("format", "placement_in", "key")
     format: Optional[str]
     placement_in: In
     key: str
@@ -154,6 +159,7 @@ class Scheme(Enum):
 
 
 class Authentication:
+    __slots__ = ("scheme", "credentials", "description", "placement", "token_url", "oauth")
     scheme: Scheme
     credentials: Optional[List[Credential]]
     description: Optional[str]
@@ -197,6 +203,7 @@ class Authentication:
 
 
 class ResourceLinks:
+    __slots__ = ()
     pass
 
     def __init__(self, ) -> None:
@@ -213,6 +220,7 @@ class ResourceLinks:
 
 
 class StructuredOutput:
+    __slots__ = ()
     pass
 
     def __init__(self, ) -> None:
@@ -230,6 +238,7 @@ class StructuredOutput:
 
 class Capabilities:
     """A hint about supported MCP capabilities."""
+    __slots__ = ("resource_links", "structured_output")
 
     resource_links: Optional[ResourceLinks]
     structured_output: Optional[StructuredOutput]
@@ -260,6 +269,7 @@ class Source(Enum):
 
 
 class Certificate:
+    __slots__ = ("enrollment_endpoint", "source")
     enrollment_endpoint: Any
     source: Source
 
@@ -283,6 +293,7 @@ class Certificate:
 
 
 class Linux:
+    __slots__ = ("args", "command", "digest")
     args: Optional[List[str]]
     command: Optional[str]
     digest: Optional[str]
@@ -313,6 +324,7 @@ class Linux:
 
 
 class PlatformOverrides:
+    __slots__ = ("linux", "macos", "windows")
     linux: Optional[Linux]
     macos: Optional[Linux]
     windows: Optional[Linux]
@@ -342,6 +354,7 @@ class PlatformOverrides:
 
 
 class Execution:
+    __slots__ = ("args", "command", "platform_overrides")
     args: List[str]
     command: str
     platform_overrides: Optional[PlatformOverrides]
@@ -369,6 +382,7 @@ class Execution:
 
 
 class Package:
+    __slots__ = ("digest", "identifier", "manager")
     digest: Optional[str]
     identifier: str
     manager: str
@@ -402,6 +416,7 @@ class RequiredConfigType(Enum):
 
 
 class RequiredConfig:
+    __slots__ = ("default_value", "description", "key", "secret", "type")
     default_value: Optional[Union[float, bool, str]]
     description: str
     key: str
@@ -443,6 +458,7 @@ class RequiredPathType(Enum):
 
 
 class RequiredPath:
+    __slots__ = ("description", "key", "type")
     description: str
     key: str
     type: Optional[RequiredPathType]
@@ -480,6 +496,7 @@ class ImplementationType(Enum):
 
 
 class Implementation:
+    __slots__ = ("authentication", "capabilities", "certificate", "mcp_version", "name", "protocol", "required_config", "required_paths", "revocation_url", "status", "tags", "title", "type", "uri", "execution", "package")
     authentication: Authentication
     capabilities: Optional[Capabilities]
     """A hint about supported MCP capabilities."""
@@ -573,6 +590,7 @@ class Implementation:
 
 
 class Metadata:
+    __slots__ = ("content_version", "documentation", "revocation_url")
     content_version: Optional[str]
     documentation: Any
     revocation_url: Any
@@ -609,6 +627,7 @@ class AidManifest:
     """Canonical JSON configuration manifest for an Agent Interface Discovery (AID) profile.
     Version 1.
     """
+    __slots__ = ("implementations", "metadata", "name", "schema_version", "signature")
     implementations: List[Implementation]
     metadata: Optional[Metadata]
     name: str
@@ -0,0 +1,484 @@
+"""Asyncio resolution of a domain's AID profile.
+
+Python counterpart of ``resolveDomain`` in ``packages/aid-core/src/resolver.ts``:
+``_agent.<domain>`` TXT lookup, ``config=`` manifest fetch, then validation,
+yielded step by step. ``resolve_many`` resolves large domain lists concurrently
+on a single event loop.
+
+DNS is spoken directly over UDP (falling back to TCP on truncation) and
+manifests are fetched with a minimal HTTP/1.1 client, so no third-party
+packages are needed.
+"""
+from __future__ import annotations
+
+import asyncio
+import random
+import struct
+from typing import Any, AsyncIterator, Awaitable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from . import ManifestValidator, _default_validator, _parse_txt, jsonio
+
+DEFAULT_DNS_TIMEOUT = 5.0
+DEFAULT_FETCH_TIMEOUT = 10.0
+DEFAULT_CONCURRENCY = 100
+MAX_MANIFEST_BYTES = 1 << 20
+_FALLBACK_NAMESERVER = "1.1.1.1"
+
+_TYPE_TXT = 16
+_CLASS_IN = 1
+RCODE_NOERROR = 0
+RCODE_NXDOMAIN = 3
+
+
+class ResolutionStep(NamedTuple):
+    """One step of the discovery chain; mirrors the TS ``ResolutionStep`` union.
+
+    ``type`` is one of ``dns_query``, ``dns_error``, ``dns_success``,
+    ``inline_profile``, ``manifest_fetch``, ``manifest_success``,
+    ``manifest_error``, ``validation_start``, ``validation_success``,
+    ``validation_error`` or ``actionable_profile``; ``data`` uses the same
+    (camelCase) keys as the TS implementation.
+    """
+
+    type: str
+    data: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    message: Optional[str] = None
+
+
+class TxtAnswer(NamedTuple):
+    rcode: int
+    records: List[str]
+    """TXT rdata with multi-string records concatenated."""
+
+    ttl: int
+    """Minimum TTL across the returned TXT records (0 if none)."""
+
+
+class HttpResponse(NamedTuple):
+    status: int
+    headers: Dict[str, str]
+    """Lower-cased header names."""
+
+    body: bytes
+    url: str
+
+
+class ResolverError(Exception):
+    pass
+
+
+# ---------------- DNS ---------------- #
+
+
+def _system_nameserver() -> str:
+    try:
+        with open("/etc/resolv.conf", "r", encoding="utf-8") as fh:
+            for line in fh:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0] == "nameserver":
+                    return parts[1]
+    except OSError:
+        pass
+    return _FALLBACK_NAMESERVER
+
+
+def _encode_query(qid: int, name: str) -> bytes:
+    header = struct.pack("!HHHHHH", qid, 0x0100, 1, 0, 0, 0)  # RD=1, one question
+    labels = b"".join(
+        bytes([len(label)]) + label for label in (p.encode("idna") for p in name.rstrip(".").split(".")) if label
+    )
+    return header + labels + b"\x00" + struct.pack("!HH", _TYPE_TXT, _CLASS_IN)
+
+
+def _skip_name(msg: bytes, offset: int) -> int:
+    while True:
+        length = msg[offset]
+        if length & 0xC0 == 0xC0:  # compression pointer ends the name
+            return offset + 2
+        offset += 1
+        if length == 0:
+            return offset
+        offset += length
+
+
+def _decode_response(qid: int, msg: bytes) -> Tuple[bool, TxtAnswer]:
+    """Return (truncated, answer) for a DNS response message."""
+    if len(msg) < 12:
+        raise ResolverError("DNS response too short")
+    rid, flags, qdcount, ancount, _, _ = struct.unpack_from("!HHHHHH", msg)
+    if rid != qid:
+        raise ResolverError("DNS response id mismatch")
+    truncated = bool(flags & 0x0200)
+    rcode = flags & 0x000F
+    offset = 12
+    for _ in range(qdcount):
+        offset = _skip_name(msg, offset) + 4
+    records: List[str] = []
+    ttls: List[int] = []
+    for _ in range(ancount):
+        offset = _skip_name(msg, offset)
+        rtype, rclass, ttl, rdlength = struct.unpack_from("!HHIH", msg, offset)
+        offset += 10
+        rdata = msg[offset:offset + rdlength]
+        offset += rdlength
+        if rtype != _TYPE_TXT or rclass != _CLASS_IN:
+            continue  # e.g. CNAME in the answer chain
+        chunks, i = [], 0
+        while i < len(rdata):
+            n = rdata[i]
+            chunks.append(rdata[i + 1:i + 1 + n])
+            i += 1 + n
+        records.append(b"".join(chunks).decode("utf-8", "replace"))
+        ttls.append(ttl)
+    return truncated, TxtAnswer(rcode, records, min(ttls) if ttls else 0)
+
+
+class _UdpQuery(asyncio.DatagramProtocol):
+    def __init__(self, qid: int, packet: bytes) -> None:
+        self.qid = qid
+        self.packet = packet
+        self.done: "asyncio.Future[Tuple[bool, TxtAnswer]]" = asyncio.get_running_loop().create_future()
+
+    def connection_made(self, transport: Any) -> None:
+        transport.sendto(self.packet)
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        if self.done.done():
+            return
+        try:
+            self.done.set_result(_decode_response(self.qid, data))
+        except ResolverError:
+            pass  # stray or spoofed datagram; keep waiting
+        except Exception as e:
+            self.done.set_exception(ResolverError(f"malformed DNS response: {e}"))
+
+    def error_received(self, exc: Exception) -> None:
+        if not self.done.done():
+            self.done.set_exception(exc)
+
+
+async def _query_tcp(name: str, nameserver: str, port: int) -> TxtAnswer:
+    qid = random.getrandbits(16)
+    packet = _encode_query(qid, name)
+    reader, writer = await asyncio.open_connection(nameserver, port)
+    try:
+        writer.write(struct.pack("!H", len(packet)) + packet)
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+        return _decode_response(qid, await reader.readexactly(length))[1]
+    finally:
+        writer.close()
+
+
+async def query_txt(name: str, nameserver: Optional[str] = None, port: int = 53) -> TxtAnswer:
+    """Query ``name`` for TXT records over UDP, retrying over TCP if truncated."""
+    nameserver = nameserver or _system_nameserver()
+    qid = random.getrandbits(16)
+    loop = asyncio.get_running_loop()
+    transport, protocol = await loop.create_datagram_endpoint(
+        lambda: _UdpQuery(qid, _encode_query(qid, name)), remote_addr=(nameserver, port)
+    )
+    try:
+        truncated, answer = await protocol.done
+    finally:
+        transport.close()
+    if truncated:
+        return await _query_tcp(name, nameserver, port)
+    return answer
+
+
+# ---------------- HTTP ---------------- #
+
+_SSL_CONTEXT: Any = None
+
+
+def _ssl_context() -> Any:
+    global _SSL_CONTEXT
+    if _SSL_CONTEXT is None:
+        import ssl
+
+        _SSL_CONTEXT = ssl.create_default_context()
+    return _SSL_CONTEXT
+
+
+async def _read_body(reader: asyncio.StreamReader, headers: Dict[str, str], max_bytes: int) -> bytes:
+    if "chunked" in headers.get("transfer-encoding", "").lower():
+        body = bytearray()
+        while True:
+            size = int((await reader.readline()).split(b";", 1)[0].strip() or b"0", 16)
+            if size == 0:
+                while (await reader.readline()).strip():
+                    pass  # trailers
+                return bytes(body)
+            if len(body) + size > max_bytes:
+                raise ResolverError(f"manifest larger than {max_bytes} bytes")
+            body += await reader.readexactly(size)
+            await reader.readline()
+    if "content-length" in headers:
+        length = int(headers["content-length"])
+        if length > max_bytes:
+            raise ResolverError(f"manifest larger than {max_bytes} bytes")
+        return await reader.readexactly(length)
+    # Delimited by the server closing the connection: read() returns what is
+    # buffered, so keep reading until EOF.
+    body = bytearray()
+    while True:
+        chunk = await reader.read(65536)
+        if not chunk:
+            return bytes(body)
+        body += chunk
+        if len(body) > max_bytes:
+            raise ResolverError(f"manifest larger than {max_bytes} bytes")
+
+
+async def http_get(
+    url: str,
+    headers: Optional[Dict[str, str]] = None,
+    max_bytes: int = MAX_MANIFEST_BYTES,
+    max_redirects: int = 5,
+) -> HttpResponse:
+    """Minimal asyncio HTTP/1.1 GET (one request per connection), following redirects."""
+    from urllib.parse import urljoin, urlsplit
+
+    for _ in range(max_redirects + 1):
+        parts = urlsplit(url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            raise ResolverError(f"unsupported manifest URL: {url}")
+        https = parts.scheme == "https"
+        port = parts.port or (443 if https else 80)
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=_ssl_context() if https else None
+        )
+        try:
+            target = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+            host = parts.hostname if parts.port is None else f"{parts.hostname}:{parts.port}"
+            lines = [f"GET {target} HTTP/1.1", f"Host: {host}", "Accept: application/json",
+                     "User-Agent: aid-core-py", "Connection: close"]
+            lines.extend(f"{k}: {v}" for k, v in (headers or {}).items())
+            writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+            status_line = (await reader.readline()).decode("latin-1").split(" ", 2)
+            if len(status_line) < 2 or not status_line[0].startswith("HTTP/"):
+                raise ResolverError("malformed HTTP response")
+            status = int(status_line[1])
+            response_headers: Dict[str, str] = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1").strip()
+                if not line:
+                    break
+                key, _, value = line.partition(":")
+                response_headers[key.strip().lower()] = value.strip()
+            if status in (301, 302, 303, 307, 308) and "location" in response_headers:
+                url = urljoin(url, response_headers["location"])
+                continue
+            body = b"" if status in (204, 304) else await _read_body(reader, response_headers, max_bytes)
+            return HttpResponse(status, response_headers, body, url)
+        finally:
+            writer.close()
+    raise ResolverError("too many redirects")
+
+
+# ---------------- Resolution ---------------- #
+
+
+def _pick_record(records: List[str]) -> Optional[str]:
+    for record in records:
+        if record.lstrip().startswith("v=aid1"):
+            return record
+    return records[0] if records else None
+
+
+def _inline_implementation(kv: Dict[str, str]) -> Dict[str, Any]:
+    """Build the actionable implementation for a simple (inline) profile, as the TS resolver does."""
+    if not kv.get("uri"):
+        raise ValueError(
+            "Simple inline profile is missing required field (uri). "
+            "Local implementations require an extended profile manifest."
+        )
+    auth = kv.get("auth") or "none"
+    protocol = kv.get("proto") or "unknown"
+    tags = kv["tags"].split(",") if kv.get("tags") else []
+    tags.append(protocol)
+    return {
+        "name": kv.get("name") or "Remote Inline Profile",
+        "type": "remote",
+        "protocol": protocol,
+        "tags": tags,
+        "execution": {"uri": kv["uri"]},
+        "auth": {
+            "scheme": auth,
+            "description": f"Authentication via {auth}",
+            "requiredSecrets": ["TOKEN"] if auth in ("pat", "apikey", "basic") else [],
+        },
+        "requiredConfig": [],
+    }
+
+
+class Resolver:
+    """Resolves domains to AID profiles; reusable and safe to share within one event loop.
+
+    ``dns_timeout`` and ``fetch_timeout`` bound the TXT lookup and the manifest
+    download separately. ``cache`` (e.g. ``aid_core_py.cache.ResolutionCache``)
+    short-circuits repeated TXT lookups; ``manifest_cache`` (e.g.
+    ``aid_core_py.cache.ManifestCache``) revalidates manifests with
+    conditional GETs and reuses their stored validation result.
+    """
+
+    def __init__(
+        self,
+        nameserver: Optional[str] = None,
+        port: int = 53,
+        dns_timeout: float = DEFAULT_DNS_TIMEOUT,
+        fetch_timeout: float = DEFAULT_FETCH_TIMEOUT,
+        validator: Optional[ManifestValidator] = None,
+        max_manifest_bytes: int = MAX_MANIFEST_BYTES,
+        cache: Any = None,
+        manifest_cache: Any = None,
+    ) -> None:
+        self.nameserver = nameserver or _system_nameserver()
+        self.port = port
+        self.dns_timeout = dns_timeout
+        self.fetch_timeout = fetch_timeout
+        self.validator = validator
+        self.max_manifest_bytes = max_manifest_bytes
+        self.cache = cache
+        self.manifest_cache = manifest_cache
+
+    async def lookup_txt(self, record_name: str) -> TxtAnswer:
+        def query() -> Awaitable[TxtAnswer]:
+            return asyncio.wait_for(query_txt(record_name, self.nameserver, self.port), self.dns_timeout)
+
+        if self.cache is None:
+            return await query()
+        return await self.cache.get_or_fetch(record_name, query)
+
+    async def fetch_manifest(self, url: str, headers: Optional[Dict[str, str]] = None) -> HttpResponse:
+        return await asyncio.wait_for(
+            http_get(url, headers, max_bytes=self.max_manifest_bytes), self.fetch_timeout
+        )
+
+    async def _download(self, url: str) -> str:
+        response = await self.fetch_manifest(url)
+        if response.status >= 400:
+            raise ResolverError(f"Request failed with status {response.status}.")
+        return response.body.decode("utf-8")
+
+    def check_manifest(self, content: str) -> Tuple[Any, Optional[str]]:
+        """Parse and validate manifest text; return ``(manifest, None)`` or ``(None, error message)``."""
+        try:
+            manifest = jsonio.loads(content)
+            error = (self.validator or _default_validator()).error(manifest)
+        except ValueError as e:
+            return None, str(e)
+        if error is not None:
+            return None, error.message
+        return manifest, None
+
+    async def resolve(self, domain: str) -> AsyncIterator[ResolutionStep]:
+        """Yield each ResolutionStep of resolving ``domain``."""
+        domain = domain.rstrip(".")
+        record_name = f"_agent.{domain}"
+        yield ResolutionStep("dns_query", {"recordName": record_name})
+
+        try:
+            answer = await self.lookup_txt(record_name)
+        except asyncio.TimeoutError:
+            yield ResolutionStep("dns_error", error=f"DNS query timed out after {self.dns_timeout}s.")
+            return
+        except Exception as e:
+            yield ResolutionStep("dns_error", error=str(e) or "An unknown error occurred during DNS query.")
+            return
+        txt_record = _pick_record(answer.records) if answer.rcode == RCODE_NOERROR else None
+        if txt_record is None:
+            yield ResolutionStep("dns_error", error=f"DNS query returned status {answer.rcode} or no answer.")
+            return
+        txt_record = txt_record.replace('"', "")
+        yield ResolutionStep("dns_success", {"txtRecord": txt_record})
+
+        kv = _parse_txt(txt_record)
+        manifest_url = kv.get("config")
+        if manifest_url:
+            yield ResolutionStep("manifest_fetch", {"manifestUrl": manifest_url})
+            try:
+                if self.manifest_cache is None:
+                    manifest_content = await self._download(manifest_url)
+                    manifest, error = self.check_manifest(manifest_content)
+                else:
+                    manifest_content, manifest, error = await self.manifest_cache.get_or_fetch(
+                        manifest_url, self.fetch_manifest, self.check_manifest
+                    )
+            except asyncio.TimeoutError:
+                yield ResolutionStep("manifest_error", error=f"Manifest fetch timed out after {self.fetch_timeout}s.")
+                return
+            except Exception as e:
+                yield ResolutionStep("manifest_error", error=str(e) or type(e).__name__)
+                return
+            yield ResolutionStep("manifest_success", {"manifestContent": manifest_content})
+
+            yield ResolutionStep("validation_start")
+            if error is None:
+                yield ResolutionStep("validation_success", {"manifest": manifest})
+            else:
+                yield ResolutionStep("validation_error", {"manifestContent": manifest_content}, error=error)
+            return
+
+        if txt_record.startswith("v=aid1"):
+            yield ResolutionStep("inline_profile", message="TXT record is an inline profile. Parsing...")
+            try:
+                implementation = _inline_implementation(kv)
+            except ValueError as e:
+                yield ResolutionStep("validation_error", error=str(e))
+                return
+            yield ResolutionStep("actionable_profile", {"implementations": [implementation], "domain": domain})
+            return
+
+        yield ResolutionStep("dns_error", error="Invalid TXT record format.")
+
+    async def resolve_all(self, domain: str) -> List[ResolutionStep]:
+        return [step async for step in self.resolve(domain)]
+
+    async def resolve_many(
+        self, domains: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY
+    ) -> AsyncIterator[Tuple[str, List[ResolutionStep]]]:
+        """Resolve ``domains`` with at most ``concurrency`` in flight.
+
+        Yields ``(domain, steps)`` as each resolution finishes (not in input
+        order). Domains are pulled lazily, so the input may be a generator.
+        """
+        pending = iter(domains)
+        results: "asyncio.Queue[Any]" = asyncio.Queue()
+        done = object()
+
+        async def worker() -> None:
+            try:
+                for domain in pending:
+                    await results.put((domain, await self.resolve_all(domain)))
+            finally:
+                await results.put(done)
+
+        workers = [asyncio.ensure_future(worker()) for _ in range(max(1, concurrency))]
+        try:
+            remaining = len(workers)
+            while remaining:
+                item = await results.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+
+
+async def resolve_domain(domain: str, **options: Any) -> AsyncIterator[ResolutionStep]:
+    """Yield each ResolutionStep of resolving ``domain`` (options as for ``Resolver``)."""
+    async for step in Resolver(**options).resolve(domain):
+        yield step
+
+
+async def resolve_many(
+    domains: Iterable[str], concurrency: int = DEFAULT_CONCURRENCY, **options: Any
+) -> AsyncIterator[Tuple[str, List[ResolutionStep]]]:
+    """Resolve many domains on one event loop; yields ``(domain, steps)`` as they complete."""
+    async for item in Resolver(**options).resolve_many(domains, concurrency):
+        yield item
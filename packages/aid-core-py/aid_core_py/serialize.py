@@ -0,0 +1,300 @@
+"""Direct-to-JSON serialization of model objects.
+
+``json.dumps(manifest.to_dict())`` first copies the whole manifest into nested
+dicts (through ``to_class``/``from_union`` wrappers) and then encodes that
+copy. ``dump_manifest`` writes the JSON text straight from the model objects,
+following the key order of the generated ``to_dict`` methods (or sorted keys),
+and produces exactly the bytes ``json.dumps(manifest.to_dict(), ...)`` would
+under the same options.
+
+With ``fp`` the output is written in chunks of about ``chunk_size`` bytes as
+it is produced, so large manifests can be streamed to a file or socket.
+
+``backend=True`` instead encodes ``to_dict()`` with the configured
+``aid_core_py.jsonio`` backend (compact UTF-8). With orjson this is much
+faster for dict-backed lazy views, at the cost of exact ``json.dumps``
+float formatting.
+"""
+from __future__ import annotations
+
+import json
+from functools import lru_cache
+from json.encoder import encode_basestring, encode_basestring_ascii
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from . import jsonio
+from . import models as m
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Field kinds.
+_STR, _ENUM, _ANY, _OBJ, _STR_LIST, _OBJ_LIST = range(6)
+
+# (json key, attribute, kind, optional) in to_dict order; optional fields are
+# omitted when None, exactly like the generated to_dict.
+_FIELDS: Dict[type, List[Tuple[str, str, int, bool]]] = {
+    m.Credential: [("description", "description", _STR, False), ("key", "key", _STR, False)],
+    m.Oauth: [
+        ("clientId", "client_id", _STR, True),
+        ("dynamicClientRegistration", "dynamic_client_registration", _ANY, True),
+        ("scopes", "scopes", _STR_LIST, True),
+    ],
+    m.Placement: [("format", "format", _STR, True), ("in", "placement_in", _ENUM, False), ("key", "key", _STR, False)],
+    m.Authentication: [
+        ("scheme", "scheme", _ENUM, False),
+        ("credentials", "credentials", _OBJ_LIST, True),
+        ("description", "description", _STR, True),
+        ("placement", "placement", _OBJ, True),
+        ("tokenUrl", "token_url", _ANY, True),
+        ("oauth", "oauth", _OBJ, True),
+    ],
+    m.ResourceLinks: [],
+    m.StructuredOutput: [],
+    m.Capabilities: [
+        ("resourceLinks", "resource_links", _OBJ, True),
+        ("structuredOutput", "structured_output", _OBJ, True),
+    ],
+    m.Certificate: [("enrollmentEndpoint", "enrollment_endpoint", _ANY, True), ("source", "source", _ENUM, False)],
+    m.Linux: [("args", "args", _STR_LIST, True), ("command", "command", _STR, True), ("digest", "digest", _STR, True)],
+    m.PlatformOverrides: [("linux", "linux", _OBJ, True), ("macos", "macos", _OBJ, True), ("windows", "windows", _OBJ, True)],
+    m.Execution: [
+        ("args", "args", _STR_LIST, False),
+        ("command", "command", _STR, False),
+        ("platformOverrides", "platform_overrides", _OBJ, True),
+    ],
+    m.Package: [("digest", "digest", _STR, True), ("identifier", "identifier", _STR, False), ("manager", "manager", _STR, False)],
+    m.RequiredConfig: [
+        ("defaultValue", "default_value", _ANY, True),
+        ("description", "description", _STR, False),
+        ("key", "key", _STR, False),
+        ("secret", "secret", _ANY, True),
+        ("type", "type", _ENUM, False),
+    ],
+    m.RequiredPath: [("description", "description", _STR, False), ("key", "key", _STR, False), ("type", "type", _ENUM, True)],
+    m.Implementation: [
+        ("authentication", "authentication", _OBJ, False),
+        ("capabilities", "capabilities", _OBJ, True),
+        ("certificate", "certificate", _OBJ, True),
+        ("mcpVersion", "mcp_version", _STR, True),
+        ("name", "name", _STR, False),
+        ("protocol", "protocol", _STR, False),
+        ("requiredConfig", "required_config", _OBJ_LIST, True),
+        ("requiredPaths", "required_paths", _OBJ_LIST, True),
+        ("revocationURL", "revocation_url", _ANY, True),
+        ("status", "status", _ENUM, True),
+        ("tags", "tags", _STR_LIST, True),
+        ("title", "title", _STR, False),
+        ("type", "type", _ENUM, False),
+        ("uri", "uri", _STR, True),
+        ("execution", "execution", _OBJ, True),
+        ("package", "package", _OBJ, True),
+    ],
+    m.Metadata: [
+        ("contentVersion", "content_version", _STR, True),
+        ("documentation", "documentation", _ANY, True),
+        ("revocationURL", "revocation_url", _ANY, True),
+    ],
+    m.AidManifest: [
+        ("implementations", "implementations", _OBJ_LIST, False),
+        ("metadata", "metadata", _OBJ, True),
+        ("name", "name", _STR, False),
+        ("schemaVersion", "schema_version", _ENUM, False),
+        ("signature", "signature", _ANY, True),
+    ],
+}
+
+
+def _writer_source(sort_keys: bool, encode_str: Callable[[str], str], item_separator: str, key_separator: str) -> str:
+    """Python source with one ``w_<Class>(obj, append)`` function per model class."""
+    lines: List[str] = []
+    for cls, fields in _FIELDS.items():
+        if sort_keys:
+            fields = sorted(fields)
+        lines.append(f"def w_{cls.__name__}(o, a):")
+        if not fields:
+            lines.append("    a('{}')")
+            lines.append("")
+            continue
+        # The text before each key ('{' or the item separator) is a constant
+        # once a required field has been written; before that it is tracked
+        # at run time in ``s``.
+        static = not fields[0][3]
+        if not static:
+            lines.append("    s = '{'")
+        first = True
+        for key, attr, kind, optional in fields:
+            prefix = encode_str(key) + key_separator
+
+            def lead(suffix: str = "") -> str:
+                if static:
+                    return repr(("{" if first else item_separator) + prefix + suffix)
+                return f"s + {repr(prefix + suffix)}"
+
+            indent = "    "
+            value = f"o.{attr}"
+            if optional:
+                lines.append(f"    v = {value}")
+                lines.append("    if v is not None:")
+                indent, value = "        ", "v"
+            if kind == _STR:
+                lines.append(f"{indent}a({lead()} + e({value}))")
+            elif kind == _ENUM:
+                lines.append(f"{indent}a({lead()} + e({value}.value))")
+            elif kind == _ANY:
+                lines.append(f"{indent}a({lead()} + j({value}))")
+            elif kind == _STR_LIST:
+                lines.append(f"{indent}a({lead('[')} + {repr(item_separator)}.join(map(e, from_list(from_str, {value}))) + ']')")
+            elif kind == _OBJ:
+                lines.append(f"{indent}a({lead()})")
+                lines.append(f"{indent}w[type({value})]({value}, a)")
+            else:  # _OBJ_LIST
+                lines.append(f"{indent}a({lead('[')})")
+                lines.append(f"{indent}for i, x in enumerate({value}):")
+                lines.append(f"{indent}    if i:")
+                lines.append(f"{indent}        a({repr(item_separator)})")
+                lines.append(f"{indent}    w[type(x)](x, a)")
+                lines.append(f"{indent}a(']')")
+            if not static:
+                if optional:
+                    lines.append(f"{indent}s = {repr(item_separator)}")
+                else:
+                    static = True
+            first = False
+        lines.append("    a('}')" if static else "    a('{}' if s == '{' else '}')")
+        lines.append("")
+    lines.append("w = {" + ", ".join(f"{cls.__name__}: w_{cls.__name__}" for cls in _FIELDS) + "}")
+    return "\n".join(lines) + "\n"
+
+
+class _Placeholder:
+    __slots__ = ()
+
+
+_PLACEHOLDER: Any = object()
+
+
+class _Writer:
+    """Generated per-class functions appending JSON text for model objects."""
+
+    def __init__(
+        self,
+        sort_keys: bool = False,
+        ensure_ascii: bool = True,
+        separators: Optional[Tuple[str, str]] = None,
+        allow_nan: bool = True,
+    ) -> None:
+        self.item_separator, key_separator = separators or (", ", ": ")
+        encode_str: Callable[[str], str] = encode_basestring_ascii if ensure_ascii else encode_basestring
+        # Free-form (Any-typed) fields and scalars go through the stdlib
+        # encoder configured like the json.dumps call being reproduced.
+        self.encoder = json.JSONEncoder(
+            sort_keys=sort_keys,
+            ensure_ascii=ensure_ascii,
+            separators=(self.item_separator, key_separator),
+            allow_nan=allow_nan,
+        )
+        namespace: Dict[str, Any] = {cls.__name__: cls for cls in _FIELDS}
+        namespace.update(e=encode_str, j=self.encoder.encode, from_list=m.from_list, from_str=m.from_str)
+        source = _writer_source(sort_keys, encode_str, self.item_separator, key_separator)
+        exec(compile(source, "<aid_core_py._serializer>", "exec"), namespace)
+        self.write: Dict[type, Callable[[Any, Callable[[str], None]], None]] = namespace["w"]
+        self.write[_Placeholder] = lambda obj, append: append(_PLACEHOLDER)
+
+
+@lru_cache(maxsize=16)
+def _writer(
+    sort_keys: bool = False,
+    ensure_ascii: bool = True,
+    separators: Optional[Tuple[str, str]] = None,
+    allow_nan: bool = True,
+) -> _Writer:
+    return _Writer(sort_keys, ensure_ascii, separators, allow_nan)
+
+
+def _backend_dump(manifest: m.AidManifest, options: Dict[str, Any]) -> bytes:
+    sort_keys = options.pop("sort_keys", False)
+    if options:
+        raise TypeError(f"backend=True only supports sort_keys, got {', '.join(sorted(options))}")
+    return jsonio.dumps(manifest.to_dict(), sort_keys=sort_keys)
+
+
+def iter_dump_manifest(
+    manifest: m.AidManifest,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: bool = False,
+    **options: Any,
+) -> Iterator[bytes]:
+    """Yield the UTF-8 JSON of ``manifest`` in chunks of roughly ``chunk_size`` bytes.
+
+    ``options`` are ``sort_keys``, ``ensure_ascii``, ``separators`` and
+    ``allow_nan``, with the same meaning and defaults as for ``json.dumps``.
+    With ``backend=True`` only ``sort_keys`` is accepted.
+    """
+    if backend:
+        data = memoryview(_backend_dump(manifest, options))
+        for start in range(0, len(data), chunk_size):
+            yield data[start:start + chunk_size].tobytes()
+        return
+    if options.get("separators") is not None:
+        options["separators"] = tuple(options["separators"])
+    writer = _writer(**options)
+    out: List[str] = []
+    size = 0
+    if type(manifest) is not m.AidManifest:
+        # Subclasses (e.g. the lazy view) define their own to_dict.
+        for piece in writer.encoder.iterencode(manifest.to_dict()):
+            out.append(piece)
+            size += len(piece)
+            if size >= chunk_size:
+                yield "".join(out).encode("utf-8")
+                out, size = [], 0
+        yield "".join(out).encode("utf-8")
+        return
+
+    # The manifest is written by the generated function with a placeholder
+    # standing in for the implementations, which are then written one by one
+    # so that a chunk can be flushed after each of them.
+    skeleton = m.AidManifest(
+        [_Placeholder()], manifest.metadata, manifest.name, manifest.schema_version, manifest.signature
+    )
+    head: List[Any] = []
+    writer.write[m.AidManifest](skeleton, head.append)
+    split = next(i for i, piece in enumerate(head) if piece is _PLACEHOLDER)
+    out.append("".join(head[:split]))
+    append = out.append
+    write = writer.write
+    for index, impl in enumerate(m.from_list(lambda x: x, manifest.implementations)):
+        if index:
+            append(writer.item_separator)
+        mark = len(out)
+        write[type(impl)](impl, append)
+        size += sum(map(len, out[mark:]))
+        if size >= chunk_size:
+            yield "".join(out).encode("utf-8")
+            out, size = [], 0
+            append = out.append
+    out.append("".join(head[split + 1:]))
+    yield "".join(out).encode("utf-8")
+
+
+def dump_manifest(
+    manifest: m.AidManifest,
+    fp: Optional[BinaryIO] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    backend: bool = False,
+    **options: Any,
+) -> Optional[bytes]:
+    """Serialize ``manifest`` to UTF-8 JSON without building intermediate dicts.
+
+    Returns the bytes, or, if ``fp`` is given, writes them to ``fp`` in chunks
+    and returns None. The output is identical to
+    ``json.dumps(manifest.to_dict(), **options).encode("utf-8")``; with
+    ``backend=True`` it is ``jsonio.dumps(manifest.to_dict())``.
+    """
+    if fp is None:
+        if backend:
+            return _backend_dump(manifest, options)
+        return b"".join(iter_dump_manifest(manifest, chunk_size=1 << 62, **options))
+    for chunk in iter_dump_manifest(manifest, chunk_size=chunk_size, backend=backend, **options):
+        fp.write(chunk)
+    return None
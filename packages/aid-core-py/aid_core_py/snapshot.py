@@ -0,0 +1,221 @@
+"""Memory-mapped binary snapshots of a registry of validated manifests.
+
+``write_snapshot(path, manifests)`` validates each manifest once and stores
+it under its key (e.g. the domain). ``SnapshotReader(path)`` maps the file
+and reads only the header, so opening takes well under a millisecond
+whatever the size; ``reader[key]`` binary-searches the key and decodes that
+one manifest into ``aid_core_py.models`` objects, without revalidating.
+
+Layout (little-endian), version 1::
+
+    header      magic "AIDSNAP\\0", version, flags, count, schema SHA-256,
+                offsets of the sections below
+    records     one compact UTF-8 JSON document per manifest
+    string table  u32 end offset per key, then the UTF-8 keys, sorted
+    index       per key (same order): u64 offset in records, u32 record length
+
+Records are JSON so that decoding runs in the JSON backend
+(``aid_core_py.jsonio``); a token-level binary encoding with interned
+strings is half the size but decodes several times slower in Python.
+
+The header carries the hash of the bundled schema the manifests were
+validated against. Opening a snapshot written for another schema raises
+``StaleSnapshotError``; rebuild it from the source manifests.
+"""
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+from . import _default_validator, _ensure_json
+
+if TYPE_CHECKING:
+    from .models import AidManifest
+
+MAGIC = b"AIDSNAP\0"
+VERSION = 1
+
+# magic, version, flags, count, schema hash, records offset, strings offset, index offset, end of file
+_HEADER = struct.Struct("<8sIII32sQQQQ")
+_END = struct.Struct("<I")
+_ENTRY = struct.Struct("<QI")
+
+Source = Union[Mapping[str, Any], Iterable[Tuple[str, Any]]]
+
+
+class StaleSnapshotError(ValueError):
+    """The snapshot was validated against a different schema than the bundled one."""
+
+
+def write_snapshot(path: Union[str, os.PathLike], manifests: Source, validate: bool = True) -> int:
+    """Write ``manifests`` (a mapping or ``(key, manifest)`` pairs) to ``path``; return the count.
+
+    Manifests may be dicts, JSON text or ``AidManifest`` models. With
+    ``validate=True`` each is validated first and the first invalid one
+    raises jsonschema.ValidationError (nothing is written). A key given more
+    than once keeps its last manifest. The file is replaced atomically.
+    """
+    from . import _schema_hash, jsonio
+    from .models import AidManifest
+
+    items = manifests.items() if isinstance(manifests, Mapping) else manifests
+    validator = _default_validator() if validate else None
+    tmp = f"{os.fspath(path)}.tmp{os.getpid()}"
+    entries: Dict[bytes, Tuple[int, int]] = {}
+    try:
+        with open(tmp, "wb") as fh:
+            fh.write(b"\0" * _HEADER.size)
+            offset = 0  # within the records section
+            for key, manifest in items:
+                data = manifest.to_dict() if isinstance(manifest, AidManifest) else _ensure_json(manifest)
+                if validator is not None:
+                    validator.validate(data)
+                record = jsonio.dumps(data)
+                fh.write(record)
+                entries[key.encode("utf-8")] = (offset, len(record))
+                offset += len(record)
+
+            keys = sorted(entries)
+            strings_offset = _HEADER.size + offset
+            end = 0
+            for key in keys:
+                end += len(key)
+                fh.write(_END.pack(end))
+            fh.write(b"".join(keys))
+            index_offset = strings_offset + _END.size * len(keys) + end
+            for key in keys:
+                fh.write(_ENTRY.pack(*entries[key]))
+            size = index_offset + _ENTRY.size * len(keys)
+            fh.seek(0)
+            fh.write(
+                _HEADER.pack(
+                    MAGIC, VERSION, 0, len(keys), bytes.fromhex(_schema_hash()),
+                    _HEADER.size, strings_offset, index_offset, size,
+                )
+            )
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+        raise
+    return len(entries)
+
+
+class SnapshotReader:
+    """Read-only, memory-mapped view of a snapshot; a mapping of key -> ``AidManifest``.
+
+    Manifests are decoded on every access (cache them if needed). Readers
+    can be shared across threads; ``close()`` (or ``with``) unmaps the file.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], check_schema: bool = True) -> None:
+        self.path = os.fspath(path)
+        with open(self.path, "rb") as fh:
+            try:
+                self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise ValueError(f"{self.path}: not an AID snapshot") from None
+        try:
+            self._open(check_schema)
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _open(self, check_schema: bool) -> None:
+        if len(self._map) < _HEADER.size:
+            raise ValueError(f"{self.path}: not an AID snapshot")
+        magic, version, _flags, count, schema, records, strings, index, size = _HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError(f"{self.path}: not an AID snapshot")
+        if version != VERSION:
+            raise ValueError(f"{self.path}: unsupported snapshot version {version} (expected {VERSION})")
+        if size != len(self._map):
+            raise ValueError(f"{self.path}: truncated snapshot ({len(self._map)} of {size} bytes)")
+        self.schema_hash = schema.hex()
+        if check_schema:
+            from . import _schema_hash
+
+            if self.schema_hash != _schema_hash():
+                raise StaleSnapshotError(f"{self.path}: snapshot was written for a different schema; rebuild it")
+        self._count = count
+        self._records = records
+        self._ends = strings
+        self._blob = strings + _END.size * count
+        self._index = index
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> SnapshotReader:
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _key(self, i: int) -> bytes:
+        start = _END.unpack_from(self._map, self._ends + _END.size * (i - 1))[0] if i else 0
+        end = _END.unpack_from(self._map, self._ends + _END.size * i)[0]
+        return self._map[self._blob + start:self._blob + end]
+
+    def _find(self, key: str) -> int:
+        target = key.encode("utf-8")
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._key(mid) < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count and self._key(lo) == target:
+            return lo
+        return -1
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self._find(key) >= 0
+
+    def keys(self) -> Iterator[str]:
+        """The keys, in sorted (UTF-8 byte) order."""
+        for i in range(self._count):
+            yield self._key(i).decode("utf-8")
+
+    __iter__ = keys
+
+    def raw(self, key: str) -> bytes:
+        """The stored JSON of ``key``'s manifest; KeyError if absent."""
+        i = self._find(key)
+        if i < 0:
+            raise KeyError(key)
+        offset, length = _ENTRY.unpack_from(self._map, self._index + _ENTRY.size * i)
+        start = self._records + offset
+        return self._map[start:start + length]
+
+    def get_dict(self, key: str) -> Dict[str, Any]:
+        from .jsonio import loads
+
+        return loads(self.raw(key))
+
+    def __getitem__(self, key: str) -> AidManifest:
+        from .fastmodels import manifest_from_dict
+
+        return manifest_from_dict(self.get_dict(key))
+
+    def get(self, key: str, default: Optional[AidManifest] = None) -> Optional[AidManifest]:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def items(self) -> Iterator[Tuple[str, AidManifest]]:
+        for key in self.keys():
+            yield key, self[key]
+
+
+def read_snapshot(path: Union[str, os.PathLike]) -> SnapshotReader:
+    """Open the snapshot at ``path`` (see ``SnapshotReader``)."""
+    return SnapshotReader(path)
+
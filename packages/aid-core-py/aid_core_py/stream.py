@@ -0,0 +1,100 @@
+"""Streaming validation of newline-delimited JSON (NDJSON) manifests."""
+from __future__ import annotations
+
+from typing import IO, TYPE_CHECKING, Any, Iterable, Iterator, List, NamedTuple, Optional, Union
+
+from . import ManifestValidator, _default_validator
+
+if TYPE_CHECKING:
+    from jsonschema.exceptions import ValidationError
+
+_BATCH_LINES = 256
+_MAX_BATCHES = 16
+_DONE = object()
+
+
+class RecordResult(NamedTuple):
+    line: int
+    """1-based line number of the record in the stream."""
+
+    error: Optional[Union["ValidationError", ValueError]]
+    """None if valid; a ValidationError, or ValueError for undecodable JSON."""
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _prefetch(lines: Iterable[Any]) -> Iterator[List[Any]]:
+    """Read ``lines`` on a background thread in bounded batches.
+
+    Reading (I/O, which releases the GIL) overlaps with validation on the
+    caller's thread; at most ``_MAX_BATCHES`` batches are buffered, so memory
+    stays constant regardless of stream size.
+    """
+    import queue
+    import threading
+
+    batches: "queue.Queue[Any]" = queue.Queue(maxsize=_MAX_BATCHES)
+    stop = threading.Event()
+
+    def put(item: Any) -> bool:
+        while not stop.is_set():
+            try:
+                batches.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def reader() -> None:
+        try:
+            batch: List[Any] = []
+            for line in lines:
+                batch.append(line)
+                if len(batch) >= _BATCH_LINES:
+                    if not put(batch):
+                        return
+                    batch = []
+            if batch and not put(batch):
+                return
+            put(_DONE)
+        except BaseException as e:  # re-raised on the consumer side
+            put(e)
+
+    thread = threading.Thread(target=reader, name="aid-ndjson-reader", daemon=True)
+    thread.start()
+    try:
+        while True:
+            item = batches.get()
+            if item is _DONE:
+                return
+            if isinstance(item, BaseException):
+                raise item
+            yield item
+    finally:
+        # Unblocks the reader if the consumer stops early.
+        stop.set()
+
+
+def iter_validate(
+    stream: Union[IO[str], IO[bytes], Iterable[Union[str, bytes]]],
+    validator: Optional[ManifestValidator] = None,
+) -> Iterator[RecordResult]:
+    """Validate each NDJSON record in ``stream`` and yield a RecordResult as it goes.
+
+    Blank lines are skipped. ``stream`` may yield ``str`` or ``bytes`` lines
+    (binary streams avoid a decode copy).
+    """
+    validator = validator or _default_validator()
+    lineno = 0
+    for batch in _prefetch(stream):
+        for line in batch:
+            lineno += 1
+            if not line.strip():
+                continue
+            try:
+                error = validator.error(line)
+            except ValueError as e:  # JSONDecodeError / UnicodeDecodeError
+                error = e
+            yield RecordResult(lineno, error)
@@ -0,0 +1,243 @@
+"""Bulk scanner for ``_agent`` TXT records in BIND zone files and AXFR dumps.
+
+The file is memory-mapped and searched with a compiled regular expression
+for lines whose owner name starts with ``_agent`` (case-insensitively, as
+DNS names compare), so only the matching records are ever copied into
+Python objects. Records on the following lines that inherit the owner
+(lines starting with whitespace) belong to it too. Each record's TXT rdata
+(quoted, possibly multi-string and parenthesised across lines) is unescaped
+and concatenated, and the ``v=aid1`` key/value pairs are parsed from the
+bytes. Records are checked with the same rules as ``validate_txt``. An
+``_agent`` line whose TTL, class or type cannot be read is reported as a
+record with an ``error`` rather than skipped.
+"""
+from __future__ import annotations
+
+import mmap
+import re
+from bisect import bisect_right
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# An owner name starting a line; the searches run in C over the mmap, without copies.
+_OWNER = re.compile(rb"_agent(?=[.\s])", re.IGNORECASE)
+_OWNER_LINE = re.compile(rb"\n_agent(?=[.\s])", re.IGNORECASE)
+_NEWLINE = re.compile(rb"\n")
+_CLASSES = frozenset({b"IN", b"CH", b"HS", b"CS"})
+_TTL = re.compile(rb"(?:\d+[smhdw])+", re.IGNORECASE)
+_TTL_PART = re.compile(rb"(\d+)([smhdw])", re.IGNORECASE)
+_TTL_UNITS = {b"s": 1, b"m": 60, b"h": 3600, b"d": 86400, b"w": 604800}
+_TYPE = re.compile(rb"[A-Za-z][A-Za-z0-9-]*")
+
+
+class ZoneRecord(NamedTuple):
+    line: int
+    """1-based line number where the record starts."""
+
+    offset: int
+    """Byte offset of the record in the file."""
+
+    owner: str
+    ttl: Optional[int]
+    txt: str
+    """TXT rdata with all character-strings concatenated (empty if the record could not be parsed)."""
+
+    fields: Dict[str, str]
+    """Key/value pairs following ``v=aid1``."""
+
+    error: Optional[str]
+    """None if the record parses and passes ``validate_txt``'s checks."""
+
+
+def _record_end(buf: Any, start: int) -> int:
+    """End offset of the logical record starting at ``start`` (handles quotes, comments and parentheses)."""
+    end = len(buf)
+    i, depth, quoted = start, 0, False
+    while i < end:
+        c = buf[i]
+        if quoted:
+            if c == 0x5C:  # backslash
+                i += 1
+            elif c == 0x22:
+                quoted = False
+        elif c == 0x22:
+            quoted = True
+        elif c == 0x3B:  # ';' comment runs to end of line
+            nl = buf.find(b"\n", i)
+            if nl < 0 or depth == 0:
+                return end if nl < 0 else nl
+            i = nl
+        elif c == 0x28:
+            depth += 1
+        elif c == 0x29:
+            depth -= 1
+        elif c == 0x0A and depth <= 0:
+            return i
+        i += 1
+    return end
+
+
+def _tokens(record: bytes) -> List[Tuple[bool, bytes]]:
+    """Split a record into (quoted, value) tokens, unescaping quoted strings."""
+    tokens: List[Tuple[bool, bytes]] = []
+    i, n = 0, len(record)
+    while i < n:
+        c = record[i]
+        if c in b" \t\r\n()":
+            i += 1
+        elif c == 0x3B:
+            nl = record.find(b"\n", i)
+            i = n if nl < 0 else nl
+        elif c == 0x22:
+            out = bytearray()
+            i += 1
+            while i < n and record[i] != 0x22:
+                if record[i] == 0x5C and i + 1 < n:
+                    digits = record[i + 1:i + 4]
+                    if len(digits) == 3 and digits.isdigit():
+                        out.append(int(digits) & 0xFF)
+                        i += 4
+                        continue
+                    i += 1
+                out.append(record[i])
+                i += 1
+            tokens.append((True, bytes(out)))
+            i += 1
+        else:
+            j = i
+            while j < n and record[j] not in b" \t\r\n();\"":
+                j += 1
+            tokens.append((False, record[i:j]))
+            i = j
+    return tokens
+
+
+def _aid_fields(rdata: bytes) -> Tuple[Dict[str, str], Optional[str]]:
+    start = rdata.find(b"v=aid1")
+    if start < 0:
+        return {}, "TXT record missing 'v=aid1'"
+    fields: Dict[str, str] = {}
+    for part in rdata[start:].split(b";"):
+        key, sep, value = part.strip().partition(b"=")
+        if sep:
+            fields[key.decode("utf-8", "replace")] = value.decode("utf-8", "replace")
+    if "uri" not in fields and "config" not in fields:
+        return fields, "TXT record must contain either 'uri' or 'config' key"
+    return fields, None
+
+
+def _origins(buf: Any) -> Tuple[List[int], List[str]]:
+    positions: List[int] = []
+    names: List[str] = []
+    pos = buf.find(b"$ORIGIN")
+    while pos >= 0:
+        if pos == 0 or buf[pos - 1] == 0x0A:
+            end = buf.find(b"\n", pos)
+            parts = bytes(buf[pos:end if end >= 0 else len(buf)]).split(b";", 1)[0].split()
+            if len(parts) >= 2:
+                positions.append(pos)
+                names.append(parts[1].decode("ascii", "replace").rstrip("."))
+        pos = buf.find(b"$ORIGIN", pos + 7)
+    return positions, names
+
+
+def _ttl(value: bytes) -> Optional[int]:
+    """Seconds for a BIND TTL (``3600``, ``1h``, ``1h30m``), or None if ``value`` is not one."""
+    if value.isdigit():
+        return int(value)
+    if not _TTL.fullmatch(value):
+        return None
+    return sum(int(count) * _TTL_UNITS[unit.lower()] for count, unit in _TTL_PART.findall(value))
+
+
+def _txt_record(tokens: List[Tuple[bool, bytes]]) -> Optional[Tuple[Optional[int], bytes]]:
+    """``(ttl, rdata)`` of the tokens following the owner name, or None if not a TXT record.
+
+    Raises ValueError if the TTL, class and type cannot be told apart.
+    """
+    ttl: Optional[int] = None
+    i = 0
+    while i < len(tokens) and not tokens[i][0]:
+        value = tokens[i][1]
+        seconds = _ttl(value)
+        if seconds is not None:
+            ttl = seconds
+        elif value.upper() not in _CLASSES:
+            break
+        i += 1
+    if i >= len(tokens):
+        if tokens:
+            raise ValueError("record has no type")
+        return None  # blank line
+    quoted, value = tokens[i]
+    if quoted or not _TYPE.fullmatch(value):
+        raise ValueError(f"unrecognised TTL, class or type {value.decode('utf-8', 'replace')!r}")
+    if value.upper() != b"TXT":
+        return None
+    return ttl, b"".join(value for _, value in tokens[i + 1:])
+
+
+def _owner_starts(buf: Any) -> Iterator[int]:
+    if _OWNER.match(buf):
+        yield 0
+    for match in _OWNER_LINE.finditer(buf):
+        yield match.start() + 1
+
+
+def scan_buffer(buf: Any) -> Iterator[ZoneRecord]:
+    """Yield a ZoneRecord for each ``_agent`` TXT record in ``buf`` (bytes or mmap)."""
+    origin_pos, origin_names = _origins(buf)
+    size = len(buf)
+    line, counted, resume = 1, 0, 0
+    for start in _owner_starts(buf):
+        if start < resume:
+            continue  # inside a record already read (e.g. parenthesised rdata)
+        end = _record_end(buf, start)
+        tokens = _tokens(bytes(buf[start:end]))
+        owner = tokens[0][1].decode("ascii", "replace") if tokens and not tokens[0][0] else ""
+        lowered = owner.lower()
+        if lowered != "_agent" and not lowered.startswith("_agent."):
+            resume = end
+            continue
+        if not owner.endswith("."):
+            idx = bisect_right(origin_pos, start) - 1
+            if idx >= 0:
+                owner = f"{owner}.{origin_names[idx]}."
+        # The record itself, then the records on following lines inheriting its owner.
+        offset, rest = start, tokens[1:]
+        while True:
+            try:
+                found = _txt_record(rest)
+            except ValueError as e:
+                line += len(_NEWLINE.findall(buf, counted, offset))
+                counted = offset
+                yield ZoneRecord(line, offset, owner, None, "", {}, str(e))
+            else:
+                if found is not None:
+                    line += len(_NEWLINE.findall(buf, counted, offset))
+                    counted = offset
+                    ttl, rdata = found
+                    fields, error = _aid_fields(rdata)
+                    yield ZoneRecord(line, offset, owner, ttl, rdata.decode("utf-8", "replace"), fields, error)
+            offset = end + 1
+            while offset < size and buf[offset] in b"\r\n;":
+                # Blank and comment lines keep the owner.
+                nl = buf.find(b"\n", offset)
+                offset = size if nl < 0 else nl + 1
+            if offset >= size or buf[offset] not in b" \t":
+                break
+            end = _record_end(buf, offset)
+            rest = _tokens(bytes(buf[offset:end]))
+        resume = end
+
+
+def scan_zone(path: str) -> Iterator[ZoneRecord]:
+    """Memory-map the zone file at ``path`` and yield its ``_agent`` TXT records."""
+    with open(path, "rb") as fh:
+        try:
+            mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:  # empty file
+            return
+        try:
+            yield from scan_buffer(mm)
+        finally:
+            mm.close()
@@ -0,0 +1,95 @@
+"""Shared corpus and helpers for the test modules (``from conftest import ...``)."""
+import copy
+import json
+import random
+import sys
+from enum import Enum
+from pathlib import Path
+
+import pytest
+
+from aid_core_py import cli, models
+
+ROOT = Path(__file__).resolve().parents[3]
+FIXTURES_DIR = ROOT / "packages" / "aid-conformance" / "tests" / "fixtures"
+EXAMPLES = sorted((ROOT / "packages" / "examples" / "public").glob("*/.well-known/aid.json"))
+CORPUS = sorted(
+    p
+    for p in [
+        *FIXTURES_DIR.glob("*/*.json"),
+        *EXAMPLES,
+        *(ROOT / "packages" / "aid-web" / "public" / "samples").glob("*.json"),
+    ]
+    if p.exists()
+)
+VALID = [json.loads(p.read_text(encoding="utf-8")) for p in EXAMPLES]
+INVALID = {"schemaVersion": "2", "name": "Invalid", "implementations": []}
+
+# Values and keys the fuzzer writes into manifests: schema enums, near misses and wrong types.
+VALUES = [
+    None, 0, 1, 1.0, 1.5, True, False, "", "x", "1", "2", [], {}, ["x"], [1], {"x": 1},
+    "remote", "local", "none", "pat", "apikey", "basic", "oauth2_code", "oauth2_device",
+    "mtls", "custom", "header", "query", "cli_arg", "file", "directory", "enrollment",
+    "string", "integer", "boolean", "active", "deprecated", "2025-06-18", "2025-6-18",
+    "https://example.com",
+]
+_KEYS = ["extra", "uri", "oauth", "credentials", "placement", "description", "type", "tokenUrl", "package"]
+
+
+def _containers(node, out):
+    if isinstance(node, (dict, list)):
+        out.append(node)
+        for child in node.values() if isinstance(node, dict) else node:
+            _containers(child, out)
+    return out
+
+
+def mutate(manifest, rng):
+    """A deep copy of ``manifest`` with one to three random edits."""
+    manifest = copy.deepcopy(manifest)
+    for _ in range(rng.randint(1, 3)):
+        target = rng.choice(_containers(manifest, []))
+        op = rng.random()
+        if isinstance(target, dict):
+            if target and op < 0.3:
+                del target[rng.choice(list(target))]
+            elif target and op < 0.8:
+                target[rng.choice(list(target))] = copy.deepcopy(rng.choice(VALUES))
+            else:
+                target[rng.choice(_KEYS)] = copy.deepcopy(rng.choice(VALUES))
+        else:
+            if target and op < 0.4:
+                target.pop(rng.randrange(len(target)))
+            elif target and op < 0.7:
+                target.append(copy.deepcopy(rng.choice(target)))
+            elif target:
+                target[rng.randrange(len(target))] = copy.deepcopy(rng.choice(VALUES))
+    return manifest
+
+
+def fuzzed_manifests(n=1500, seed=1234):
+    """``n`` mutated copies of the example manifests, reproducible from ``seed``."""
+    rng = random.Random(seed)
+    return [mutate(rng.choice(VALID), rng) for _ in range(n)]
+
+
+def same_model(a, b):
+    """Deep equality of generated model objects, requiring identical types throughout."""
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, Enum):
+        return a is b
+    if isinstance(a, list):
+        return len(a) == len(b) and all(same_model(x, y) for x, y in zip(a, b))
+    if type(a).__module__ == models.__name__:
+        return all(same_model(getattr(a, k), getattr(b, k)) for k in type(a).__slots__)
+    return a == b
+
+
+def run_cli(monkeypatch, capsys, *argv):
+    """Run ``aid-validate *argv``; returns ``(exit code, stdout, stderr)``."""
+    monkeypatch.setattr(sys, "argv", ["aid-validate", *argv])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    out, err = capsys.readouterr()
+    return exit_info.value.code, out, err
@@ -0,0 +1,112 @@
+import copy
+import json
+
+import pytest
+
+from aid_core_py import actionable
+from aid_core_py.actionable import ImplementationCache, LaunchCommand, compile_implementations, get_implementations
+from aid_core_py.fastmodels import manifest_from_dict
+from conftest import VALID
+
+LOCAL = {
+    "type": "local",
+    "name": "cli",
+    "title": "CLI",
+    "protocol": "mcp",
+    "package": {"manager": "npx", "identifier": "@example/server"},
+    "execution": {
+        "command": "npx",
+        "args": ["-y", "@example/server"],
+        "platformOverrides": {
+            "windows": {"command": "npx.cmd"},
+            "macos": {"args": ["--mac"]},
+        },
+    },
+    "authentication": {"scheme": "pat", "placement": {"in": "header", "key": "Authorization"}},
+}
+MANIFEST = {"schemaVersion": "1", "name": "Example", "implementations": [LOCAL]}
+
+
+def _ts_get_implementations(manifest):
+    """Line-by-line transliteration of getImplementations in packages/aid-core/src/resolver.ts."""
+    out = []
+    for impl in manifest["implementations"]:
+        auth = impl["authentication"]
+        actionable_ = {
+            "name": impl["title"],
+            "type": impl["type"],
+            "protocol": impl["protocol"],
+            "tags": impl.get("tags"),
+            "execution": {},
+            "auth": {"scheme": auth["scheme"], "description": auth.get("description", ""), "requiredSecrets": []},
+            "requiredConfig": impl.get("requiredConfig"),
+            "certificate": impl.get("certificate"),
+            "requiredPaths": impl.get("requiredPaths"),
+        }
+        if impl["type"] == "remote":
+            actionable_["execution"]["uri"] = impl.get("uri")
+        else:
+            actionable_["execution"]["command"] = impl["execution"]["command"]
+            actionable_["execution"]["args"] = impl["execution"]["args"]
+            actionable_["execution"]["platformOverrides"] = impl["execution"].get("platformOverrides")
+        if auth.get("placement"):
+            actionable_["auth"]["placement"] = auth["placement"]
+        if auth.get("credentials"):
+            actionable_["auth"]["requiredSecrets"] = [c["key"] for c in auth["credentials"]]
+        elif auth["scheme"] in ("pat", "apikey", "basic"):
+            actionable_["auth"]["requiredSecrets"] = ["TOKEN"]
+        out.append(_drop_none(actionable_))
+    return out
+
+
+def _drop_none(value):
+    # JSON.stringify drops undefined properties.
+    if isinstance(value, dict):
+        return {k: _drop_none(v) for k, v in value.items() if v is not None}
+    return value
+
+
+@pytest.mark.parametrize("manifest", VALID + [MANIFEST])
+def test_matches_typescript(manifest):
+    plans = compile_implementations(manifest)
+    assert [p.to_dict() for p in plans] == _ts_get_implementations(manifest)
+    assert [p.to_dict() for p in compile_implementations(manifest_from_dict(manifest))] == [
+        p.to_dict() for p in plans
+    ]
+
+
+def test_platform_commands():
+    [plan] = compile_implementations(MANIFEST)
+    assert plan.commands == {
+        "linux": LaunchCommand("npx", ("-y", "@example/server")),
+        "macos": LaunchCommand("npx", ("--mac",)),
+        "windows": LaunchCommand("npx.cmd", ("-y", "@example/server")),
+    }
+    assert plan.launch("windows").command == "npx.cmd"
+    assert plan.launch() == plan.commands[actionable.current_platform()]
+    assert plan.auth.required_secrets == ("TOKEN",)
+    assert not hasattr(plan, "__dict__")
+
+    remote = next(p for doc in VALID for p in compile_implementations(doc) if p.type == "remote")
+    assert remote.launch() is None and remote.uri
+
+
+def test_memoized_by_text_or_key():
+    cache = ImplementationCache(maxsize=2)
+    raw = json.dumps(MANIFEST)
+    plans = cache.get(raw)
+    assert cache.get(raw.encode()) is plans
+    assert cache.get(json.dumps(MANIFEST, indent=2)) is not plans  # other bytes, other entry
+    assert cache.get(MANIFEST, key="k") is cache.get({"ignored": True}, key="k")
+    assert cache.stats()["evictions"] == 1 and cache.stats()["hits"] == 2
+    # Dicts and models without a key are compiled each time, not memoized.
+    assert cache.get(MANIFEST) is not cache.get(MANIFEST)
+    assert cache.get(manifest_from_dict(MANIFEST))[0].to_dict() == plans[0].to_dict()
+    edited = copy.deepcopy(MANIFEST)
+    edited["implementations"][0]["title"] = "Renamed"
+    assert cache.get(edited)[0].name == "Renamed"
+    assert len(cache) == 2 and cache.stats()["misses"] == 3
+    cache.clear()
+    assert len(cache) == 0 and cache.stats()["hits"] == 0
+    assert get_implementations(raw) is get_implementations(raw.encode())
+    assert get_implementations(MANIFEST, key="doc")[0].to_dict() == plans[0].to_dict()
@@ -0,0 +1,67 @@
+import json
+
+import pytest
+
+from aid_core_py import bench, validate_manifest
+
+
+def test_synthetic_manifests_are_valid():
+    for size in bench.SIZES:
+        manifest = bench.synthetic_manifest(size)
+        validate_manifest(manifest)
+        assert len({impl["name"] for impl in manifest["implementations"]}) == size
+
+
+def test_run_covers_every_hot_path():
+    inputs = bench.load_inputs(sizes=(1, 5))
+    results = bench.run(inputs, repeat=1, min_time=0)
+    names = set(results["results"])
+    for label in inputs:
+        for op in (
+            "validate_manifest", "memo_text", "error_edit", "revalidate_edit",
+            "from_dict", "fast_from_dict", "to_dict", "build_txt_record",
+        ):
+            assert f"{op}/{label}" in names
+    assert {"validate_txt/records", "_parse_txt/records", "parse_txt/records", "parse_txt_many/records"} <= names
+    assert all(r["us"] > 0 for r in results["results"].values())
+    assert json.loads(json.dumps(results)) == results
+
+    only = bench.run(inputs, repeat=1, min_time=0, only="synthetic-5")
+    assert set(only["results"]) == {n for n in names if n.endswith("synthetic-5")}
+
+
+def test_compare_flags_regressions():
+    def doc(**timings):
+        return {"version": bench.FORMAT_VERSION, "results": {k: {"us": v} for k, v in timings.items()}}
+
+    baseline = doc(a=10.0, b=10.0, c=10.0)
+    current = doc(a=12.0, b=14.0, c=5.0, new=1.0)
+    [regression] = bench.compare(current, baseline)
+    assert regression.name == "b" and regression.ratio == pytest.approx(1.4)
+    assert [r.name for r in bench.compare(current, baseline, threshold=0.1)] == ["a", "b"]
+    with pytest.raises(ValueError, match="not a benchmark results document"):
+        bench.compare(current, {"results": {}})
+
+
+def test_txt_records_sets_the_batch_size():
+    inputs = bench.load_inputs(fixtures=None, sizes=(1, 5))
+    cases = dict(bench._cases(inputs, txt_records=7))
+    parsed = cases["parse_txt_many/records"]()
+    assert len(parsed) == 7 and all(record.v == "aid1" for record in parsed)
+    assert len(dict(bench._cases(inputs))["parse_txt/records"]()) == 2
+
+
+def test_main_writes_and_compares(tmp_path, capsys):
+    output = tmp_path / "results.json"
+    args = ["--repeat", "1", "--min-time", "0", "--sizes", "1", "-k", "synthetic"]
+    assert bench.main(args + ["-o", str(output)]) == 0
+    saved = json.loads(output.read_text())
+    assert set(saved["results"]) and all("synthetic-1" in name for name in saved["results"])
+
+    for result in saved["results"].values():
+        result["us"] /= 100
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(saved))
+    capsys.readouterr()
+    assert bench.main(args + ["-b", str(baseline)]) == 1
+    assert "validate_manifest/synthetic-1" in capsys.readouterr().err
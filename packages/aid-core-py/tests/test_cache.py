@@ -0,0 +1,247 @@
+import asyncio
+import hashlib
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+from aid_core_py import resolver as resolver_mod
+from aid_core_py.cache import ManifestCache, ResolutionCache
+from aid_core_py.resolver import RCODE_NXDOMAIN, HttpResponse, Resolver, TxtAnswer
+
+RECORD = "v=aid1;uri=https://api.example.com;proto=mcp"
+
+
+class Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_ttl_and_negative_caching():
+    clock = Clock()
+    cache = ResolutionCache(negative_ttl=5, clock=clock)
+    cache.put("_agent.a.example", TxtAnswer(0, [RECORD], 30))
+    cache.put("_agent.nx.example", TxtAnswer(RCODE_NXDOMAIN, [], 0))
+    cache.put("_agent.empty.example", TxtAnswer(0, [], 0))
+    cache.put("_agent.servfail.example", TxtAnswer(2, [], 0))
+
+    assert cache.get("_agent.A.example.").records == [RECORD]
+    assert cache.get("_agent.nx.example").rcode == RCODE_NXDOMAIN
+    assert cache.get("_agent.empty.example") is not None
+    assert cache.get("_agent.servfail.example") is None
+
+    clock.now += 6
+    assert cache.get("_agent.nx.example") is None
+    assert cache.get("_agent.a.example") is not None
+    clock.now += 25
+    assert cache.get("_agent.a.example") is None
+    assert cache.stats() == {"size": 1, "hits": 4, "misses": 3, "evictions": 0, "coalesced": 0}
+
+
+def test_lru_eviction():
+    cache = ResolutionCache(maxsize=2)
+    for name in ("a", "b"):
+        cache.put(name, TxtAnswer(0, [RECORD], 60))
+    assert cache.get("a") is not None  # "b" is now least recently used
+    cache.put("c", TxtAnswer(0, [RECORD], 60))
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.evictions == 1 and len(cache) == 2
+
+
+def test_concurrent_lookups_are_coalesced():
+    cache = ResolutionCache()
+    calls = 0
+
+    async def fetch():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return TxtAnswer(0, [RECORD], 60)
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fetch("_agent.a.example", fetch) for _ in range(50)))
+
+    answers = asyncio.run(main())
+    assert calls == 1 and all(a.records == [RECORD] for a in answers)
+    assert cache.coalesced == 49 and cache.misses == 50
+
+
+def test_errors_are_shared_but_not_cached():
+    cache = ResolutionCache()
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise asyncio.TimeoutError()
+
+    async def main():
+        return await asyncio.gather(*(cache.get_or_fetch("x", fail) for _ in range(3)), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(r, asyncio.TimeoutError) for r in results)
+    assert len(cache) == 0
+
+
+def test_resolver_uses_cache(monkeypatch):
+    queries = []
+
+    async def fake_query(name, nameserver=None, port=53):
+        queries.append(name)
+        return TxtAnswer(0, [RECORD], 300) if name == "_agent.hot.example" else TxtAnswer(RCODE_NXDOMAIN, [], 0)
+
+    monkeypatch.setattr(resolver_mod, "query_txt", fake_query)
+    cache = ResolutionCache()
+    resolver = Resolver(nameserver="127.0.0.1", cache=cache)
+
+    async def main():
+        return [await resolver.resolve_all(d) for d in ("hot.example", "hot.example", "nx.example", "nx.example")]
+
+    results = asyncio.run(main())
+    assert queries == ["_agent.hot.example", "_agent.nx.example"]
+    assert results[0] == results[1] and results[1][-1].type == "actionable_profile"
+    assert results[3][-1].type == "dns_error"
+    assert cache.hits == 2
+
+
+@pytest.mark.parametrize("ttl,lifetime", [(0, 60), (10, 60), (80, 80), (10 ** 9, 100)])
+def test_ttl_is_clamped(ttl, lifetime):
+    clock = Clock()
+    cache = ResolutionCache(min_ttl=60, max_ttl=100, clock=clock)
+    cache.put("a", TxtAnswer(0, [RECORD], ttl))
+    clock.now += lifetime - 0.5
+    assert cache.get("a") is not None
+    clock.now += 1
+    assert cache.get("a") is None
+
+
+# ---------------- ManifestCache ---------------- #
+
+MANIFEST = (Path(__file__).resolve().parents[3] / "packages" / "examples" / "public" / "simple"
+            / ".well-known" / "aid.json").read_bytes()
+URL = "https://example.com/.well-known/aid.json"
+
+
+class Origin:
+    """Fake origin honouring If-None-Match; records the requests it sees."""
+
+    def __init__(self, body=MANIFEST, cache_control="max-age=60"):
+        self.body = body
+        self.cache_control = cache_control
+        self.requests = []
+
+    async def get(self, url, headers):
+        self.requests.append(dict(headers))
+        etag = '"%s"' % hashlib.sha1(self.body).hexdigest()
+        response_headers = {"etag": etag, "last-modified": "Wed, 01 Jan 2025 00:00:00 GMT",
+                            "cache-control": self.cache_control}
+        if headers.get("If-None-Match") == etag:
+            return HttpResponse(304, response_headers, b"", url)
+        return HttpResponse(200, response_headers, self.body, url)
+
+
+def _checker():
+    calls = []
+
+    def check(content):
+        calls.append(content)
+        return Resolver(nameserver="127.0.0.1").check_manifest(content)
+
+    return check, calls
+
+
+def test_manifest_cache_fresh_revalidate_and_change(tmp_path):
+    clock = Clock()
+    cache = ManifestCache(str(tmp_path), clock=clock)
+    origin = Origin()
+    check, checks = _checker()
+
+    def fetch():
+        return asyncio.run(cache.get_or_fetch(URL, origin.get, check))
+
+    content, manifest, error = fetch()
+    assert error is None and manifest == json.loads(MANIFEST) and len(checks) == 1
+
+    fetch()  # fresh: no request at all
+    assert len(origin.requests) == 1
+
+    clock.now += 61  # stale: conditional GET -> 304, no re-validation
+    content, manifest, error = fetch()
+    assert origin.requests[-1]["If-None-Match"] and "If-Modified-Since" in origin.requests[-1]
+    assert error is None and content == MANIFEST.decode() and len(checks) == 1
+
+    clock.now += 61
+    origin.body = b'{"schemaVersion": "2"}'
+    _, manifest, error = fetch()
+    assert manifest is None and "required property" in error and len(checks) == 2
+    assert cache.stats() == {"hits": 1, "revalidated": 1, "misses": 2}
+
+    # A second cache over the same directory (another process) sees the stored result.
+    other = ManifestCache(str(tmp_path), clock=clock)
+    assert asyncio.run(other.get_or_fetch(URL, origin.get, check))[2] == error
+    assert other.hits == 1
+
+
+@pytest.mark.parametrize("cache_control,stored", [("no-store", False), ("no-cache", True), ("", True)])
+def test_manifest_cache_control(tmp_path, cache_control, stored):
+    cache = ManifestCache(str(tmp_path), clock=Clock())
+    origin = Origin(cache_control=cache_control)
+    check, _ = _checker()
+    for _ in range(2):
+        asyncio.run(cache.get_or_fetch(URL, origin.get, check))
+    assert (cache.load(URL) is not None) == stored
+    assert len(origin.requests) == 2  # never fresh in any of these cases
+    assert bool(origin.requests[1]) == stored
+
+
+def test_manifest_cache_ignores_other_schema(tmp_path):
+    origin = Origin()
+    check, checks = _checker()
+    asyncio.run(ManifestCache(str(tmp_path), stamp="old").get_or_fetch(URL, origin.get, check))
+    asyncio.run(ManifestCache(str(tmp_path)).get_or_fetch(URL, origin.get, check))
+    assert len(checks) == 2 and origin.requests[1] == {}
+
+
+def _hammer(directory):
+    cache = ManifestCache(directory, default_ttl=0)
+    check = Resolver(nameserver="127.0.0.1").check_manifest
+    for i in range(30):
+        asyncio.run(cache.get_or_fetch(f"{URL}?{i % 3}", Origin().get, check))
+
+
+def test_manifest_cache_shared_between_processes(tmp_path):
+    import multiprocessing
+
+    procs = [multiprocessing.Process(target=_hammer, args=(str(tmp_path),)) for _ in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+        assert p.exitcode == 0
+    cache = ManifestCache(str(tmp_path))
+    assert all(cache.load(f"{URL}?{i}")["error"] is None for i in range(3))
+    assert sorted(os.listdir(tmp_path)) == sorted(os.path.basename(cache._path(f"{URL}?{i}")) for i in range(3))
+
+
+def test_resolver_uses_manifest_cache(monkeypatch, tmp_path):
+    origin = Origin()
+
+    async def fake_query(name, nameserver=None, port=53):
+        return TxtAnswer(0, [f"v=aid1;config={URL}"], 300)
+
+    async def fake_http_get(url, headers=None, max_bytes=0):
+        return await origin.get(url, headers or {})
+
+    monkeypatch.setattr(resolver_mod, "query_txt", fake_query)
+    monkeypatch.setattr(resolver_mod, "http_get", fake_http_get)
+    resolver = Resolver(nameserver="127.0.0.1", manifest_cache=ManifestCache(str(tmp_path)))
+
+    async def main():
+        return [await resolver.resolve_all("example.com") for _ in range(3)]
+
+    runs = asyncio.run(main())
+    assert all(run[-1].type == "validation_success" for run in runs)
+    assert runs[0] == runs[2] and len(origin.requests) == 1
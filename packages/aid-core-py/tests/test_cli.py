@@ -0,0 +1,63 @@
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from aid_core_py import cli
+from conftest import EXAMPLES, INVALID, ROOT, run_cli
+
+
+@pytest.fixture
+def corpus(tmp_path):
+    for i in range(300):
+        src = EXAMPLES[i % len(EXAMPLES)]
+        target = tmp_path / f"d{i % 7}" / f"m{i}.json"
+        target.parent.mkdir(exist_ok=True)
+        shutil.copy(src, target)
+    (tmp_path / "txt").mkdir()
+    for src in (ROOT / "packages" / "examples" / "public").glob("*/aid.txt"):
+        shutil.copy(src, tmp_path / "txt" / f"{src.parent.name}.txt")
+    return tmp_path
+
+
+def test_single_and_pair(monkeypatch, capsys, tmp_path):
+    code, out, _ = run_cli(monkeypatch, capsys, str(EXAMPLES[0]))
+    assert code == 0 and "validation passed" in out
+    txt = EXAMPLES[0].parents[1] / "aid.txt"
+    code, _, _ = run_cli(monkeypatch, capsys, str(EXAMPLES[0]), str(txt))
+    assert code == 0
+
+
+def test_batch_directory_jsonl(monkeypatch, capsys, corpus):
+    code, out, _ = run_cli(monkeypatch, capsys, str(corpus), "--jsonl", "--jobs", "2")
+    assert code == 0
+    results = [json.loads(line) for line in out.splitlines()]
+    assert len(results) == 300 + len(list((corpus / "txt").iterdir()))
+    assert all(r["ok"] and r["error"] is None and r["elapsed"] >= 0 for r in results)
+    assert [r["path"] for r in results] == sorted(r["path"] for r in results)
+
+
+def test_batch_glob_aggregate_exit_code(monkeypatch, capsys, corpus):
+    (corpus / "d0" / "bad.json").write_text(json.dumps(INVALID), encoding="utf-8")
+    (corpus / "d0" / "broken.json").write_text("{not json", encoding="utf-8")
+    code, out, _ = run_cli(monkeypatch, capsys, str(corpus / "d0" / "*.json"), "--jsonl")
+    assert code == 1
+    results = {Path(r["path"]).name: r for r in map(json.loads, out.splitlines())}
+    assert not results["bad.json"]["ok"] and "'1' was expected" in results["bad.json"]["error"]
+    assert not results["broken.json"]["ok"]
+    assert sum(r["ok"] for r in results.values()) == len(results) - 2
+
+
+def test_batch_summary_and_no_match(monkeypatch, capsys, corpus):
+    code, out, _ = run_cli(monkeypatch, capsys, str(corpus / "d1"), str(corpus / "d2"), "--jobs", "1")
+    assert code == 0 and "passed" in out
+    code, _, err = run_cli(monkeypatch, capsys, str(corpus / "*.nothing"))
+    assert code == 1 and "no files matched" in err
+
+
+def test_run_batch_parallel_matches_serial(corpus):
+    paths = cli._expand([str(corpus)])
+    serial = [(r["path"], r["ok"]) for r in cli.run_batch(paths, jobs=1)]
+    parallel = [(r["path"], r["ok"]) for r in cli.run_batch(paths, jobs=3, chunk_size=16)]
+    assert serial == parallel
@@ -0,0 +1,69 @@
+"""Differential tests: compiled validator vs. the generic jsonschema validator."""
+import copy
+import json
+
+import jsonschema
+import pytest
+
+from aid_core_py import ManifestValidator, _SCHEMA, codegen
+from conftest import CORPUS, ROOT, VALID, fuzzed_manifests
+
+GENERIC = jsonschema.Draft7Validator(_SCHEMA)
+COMPILED = codegen.load(_SCHEMA)["is_valid"]
+_VALIDATOR = ManifestValidator()
+
+
+def _assert_same_error(instance):
+    expected = jsonschema.exceptions.best_match(GENERIC.iter_errors(instance))
+    actual = _VALIDATOR.error(instance)
+    if expected is None:
+        assert actual is None
+    else:
+        assert actual is not None
+        assert actual.message == expected.message
+        assert actual.validator == expected.validator
+        assert list(actual.absolute_path) == list(expected.absolute_path)
+        assert list(actual.absolute_schema_path) == list(expected.absolute_schema_path)
+
+
+def test_corpus_is_present():
+    assert VALID
+    assert len(CORPUS) > len(VALID)
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda p: p.relative_to(ROOT).as_posix())
+def test_fixture_agrees_with_jsonschema(path):
+    instance = json.loads(path.read_text(encoding="utf-8"))
+    assert COMPILED(instance) == GENERIC.is_valid(instance)
+    _assert_same_error(instance)
+
+
+def test_fuzzed_manifests_agree_with_jsonschema():
+    fuzzed = fuzzed_manifests()
+    outcomes = [COMPILED(m) for m in fuzzed]
+    assert outcomes == [GENERIC.is_valid(m) for m in fuzzed]
+    # Make sure the fuzzer exercises both sides.
+    assert 0 < sum(outcomes) < len(outcomes)
+    for manifest in fuzzed[:200]:
+        _assert_same_error(manifest)
+
+
+@pytest.mark.parametrize("instance", [None, 1, "x", [], {}, {"schemaVersion": "1"}])
+def test_non_manifest_instances(instance):
+    assert COMPILED(instance) == GENERIC.is_valid(instance)
+
+
+def test_generated_source_is_deterministic():
+    source = codegen.compile_schema(_SCHEMA)
+    assert source == codegen.compile_schema(copy.deepcopy(_SCHEMA))
+    for name in ("implementations_item", "authentication", "requiredConfig_item", "execution"):
+        assert f"_{name}(x):" in source
+
+
+def test_unsupported_keyword_falls_back_to_generic():
+    schema = {"type": "object", "properties": {"n": {"type": "integer", "minimum": 3}}}
+    with pytest.raises(NotImplementedError):
+        codegen.compile_schema(schema)
+    validator = ManifestValidator(schema)
+    assert validator.is_valid({"n": 3})
+    assert not validator.is_valid({"n": 2})
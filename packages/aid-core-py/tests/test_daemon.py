@@ -0,0 +1,185 @@
+import json
+import os
+import socket
+import sys
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+from aid_core_py import check_manifest, cli, daemon
+from conftest import EXAMPLES, INVALID, run_cli
+
+TXT = (EXAMPLES[0].parents[1] / "aid.txt").read_text(encoding="utf-8")
+MANIFEST = EXAMPLES[0].read_text(encoding="utf-8")
+
+unix_only = pytest.mark.skipif(not hasattr(socket, "AF_UNIX"), reason="needs Unix sockets")
+
+
+def _start(address, jobs=1):
+    server = daemon.make_server(address, jobs)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+@pytest.fixture
+def socket_path():
+    # Short path: Unix socket paths are limited to about 100 bytes.
+    with tempfile.TemporaryDirectory() as directory:
+        yield str(Path(directory) / "aid.sock")
+
+
+@pytest.fixture
+def server(socket_path):
+    server = _start(socket_path)
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _expected_issues(manifest):
+    return [issue.to_dict() for issue in check_manifest(json.dumps(manifest), "all").errors]
+
+
+@unix_only
+def test_requests(server):
+    with daemon.DaemonClient(server.address) as client:
+        assert client.request({"op": "manifest", "manifest": MANIFEST}) == {"ok": True, "error": None}
+        bad = client.request({"op": "manifest", "manifest": json.dumps(INVALID)})
+        assert not bad["ok"] and "'1' was expected" in bad["error"]
+        report = client.request({"op": "manifest", "manifest": json.dumps(INVALID), "mode": "all"})
+        assert report["errors"] == _expected_issues(INVALID) and report["complete"]
+        assert client.request({"op": "manifest", "manifest": "{not json"})["ok"] is False
+        assert client.request({"op": "txt", "txt": TXT})["ok"]
+        assert not client.request({"op": "txt", "txt": "v=aid1;p=mcp"})["ok"]
+        assert client.request({"op": "pair", "manifest": MANIFEST, "txt": TXT})["ok"]
+        assert client.request({"op": "ping"})["stamp"] == daemon.schema_stamp()
+        assert "unknown op" in client.request({"op": "lint"})["fault"]
+        assert "'txt' string" in client.request({"op": "pair", "manifest": MANIFEST})["fault"]
+        assert "another aid_core_py install" in client.request({"op": "ping", "stamp": "elsewhere"})["fault"]
+
+    with socket.socket(socket.AF_UNIX) as raw:
+        raw.connect(server.address)
+        raw.sendall(b"[1]\n{oops\n")
+        replies = raw.makefile("rb")
+        assert "expected a JSON object" in json.loads(replies.readline())["fault"]
+        assert "malformed request" in json.loads(replies.readline())["fault"]
+
+
+@unix_only
+def test_concurrent_clients(server):
+    cases = [(MANIFEST, True), (json.dumps(INVALID), False)] * 10
+
+    def session(_):
+        with daemon.DaemonClient(server.address) as client:
+            return [client.request({"op": "manifest", "manifest": m})["ok"] for m, _ in cases]
+
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(session, range(16)))
+    assert results == [[ok for _, ok in cases]] * 16
+
+
+@unix_only
+def test_worker_processes(socket_path):
+    server = _start(socket_path, jobs=2)
+    try:
+        request = {"op": "manifest", "manifest": json.dumps(INVALID), "mode": "first"}
+        assert daemon.request(request, socket_path)["errors"] == _expected_issues(INVALID)[:1]
+        assert daemon.request({"op": "manifest", "manifest": MANIFEST.encode()}, socket_path)["ok"]
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_loopback_tcp():
+    server = _start("127.0.0.1:0")
+    try:
+        assert daemon.request({"op": "txt", "txt": TXT}, server.address)["ok"]
+    finally:
+        server.shutdown()
+        server.server_close()
+    with pytest.raises(ValueError, match="loopback"):
+        daemon.make_server("0.0.0.0:0")
+
+
+@unix_only
+def test_socket_file_lifecycle(socket_path):
+    Path(socket_path).write_text("")  # stale file left by a crashed daemon
+    server = _start(socket_path)
+    try:
+        with pytest.raises(OSError, match="already listening"):
+            daemon.make_server(socket_path)
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert not Path(socket_path).exists()
+    assert daemon.request({"op": "ping"}, socket_path) is None
+
+
+@unix_only
+def test_client_refuses_foreign_socket(monkeypatch, server):
+    assert daemon.request({"op": "ping"}, server.address)["ok"]
+    os.chmod(server.address, 0o666)  # e.g. bound first by another user in a shared temp dir
+    with pytest.raises(PermissionError, match="not private"):
+        daemon.DaemonClient(server.address)
+    assert daemon.request({"op": "ping"}, server.address) is None
+    os.chmod(server.address, 0o600)
+    uid = os.getuid()
+    monkeypatch.setattr(os, "getuid", lambda: uid + 1)
+    with pytest.raises(PermissionError):
+        daemon.DaemonClient(server.address)
+    if hasattr(socket, "SO_PEERCRED"):
+        monkeypatch.setattr(daemon, "_check_private_socket", lambda path: None)
+        with pytest.raises(PermissionError, match="another user"):
+            daemon.DaemonClient(server.address)
+
+
+@unix_only
+def test_cli_client_and_fallback(monkeypatch, capsys, tmp_path, server):
+    monkeypatch.delenv(daemon.ENV_VAR, raising=False)
+    answered = []
+    send = daemon.request
+
+    def spy(*args, **kwargs):
+        response = send(*args, **kwargs)
+        answered.append(response is not None)
+        return response
+
+    monkeypatch.setattr(daemon, "request", spy)
+    bad = tmp_path / "bad.json"
+    bad.write_text(json.dumps(INVALID), encoding="utf-8")
+    txt = EXAMPLES[0].parents[1] / "aid.txt"
+    runs = [(str(EXAMPLES[0]),), (str(EXAMPLES[0]), str(txt)), (str(bad),), (str(bad), "--mode", "all")]
+
+    local = [run_cli(monkeypatch, capsys, *argv) for argv in runs]
+    assert answered == []
+    via_daemon = [run_cli(monkeypatch, capsys, *argv, "--client", server.address) for argv in runs]
+    assert answered == [True] * len(runs)
+    assert via_daemon == local
+    assert local[3][0] == 1 and "/schemaVersion: '1' was expected" in local[3][2]
+
+    monkeypatch.setenv(daemon.ENV_VAR, server.address + ".missing")
+    assert run_cli(monkeypatch, capsys, *runs[3]) == local[3]
+    assert answered[-1] is False
+    code, _, err = run_cli(monkeypatch, capsys, str(tmp_path / "nope.json"))
+    assert code == 1 and "No such file" in err
+
+
+def test_serve_argument_errors(monkeypatch, capsys):
+    monkeypatch.setattr(sys, "argv", ["aid-validate", "x.json", "--serve"])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    assert exit_info.value.code == 2 and "--serve takes no paths" in capsys.readouterr().err
+    code, _, err = run_cli(monkeypatch, capsys, "--serve", "192.0.2.1:8765")
+    assert code == 1 and "loopback" in err
+
+
+def test_serve_jobs(monkeypatch, capsys):
+    served = []
+    monkeypatch.setattr(daemon, "serve", lambda address, jobs, quiet: served.append(jobs))
+    monkeypatch.setattr(os, "cpu_count", lambda: 6)
+    for argv in [(), ("--jobs", "3"), ("--jobs", "0")]:
+        assert run_cli(monkeypatch, capsys, "--serve", "127.0.0.1:0", *argv)[0] == 0
+    assert served == [1, 3, 6]
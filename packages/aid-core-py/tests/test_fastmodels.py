@@ -0,0 +1,109 @@
+"""The fast decoders must build exactly what the generated from_dict builds."""
+import json
+from enum import Enum
+
+import pytest
+
+from aid_core_py import fastmodels, models
+from conftest import CORPUS, VALID, fuzzed_manifests, same_model
+
+
+def _outcome(decode, obj):
+    try:
+        return decode(obj), None
+    except Exception as e:
+        return None, (type(e), str(e))
+
+
+def _assert_equivalent(obj):
+    expected, expected_error = _outcome(models.aid_manifest_from_dict, obj)
+    actual, actual_error = _outcome(fastmodels.manifest_from_dict, obj)
+    assert actual_error == expected_error
+    assert same_model(actual, expected)
+
+
+@pytest.mark.parametrize("path", CORPUS, ids=lambda p: str(p.relative_to(p.parents[2])))
+def test_corpus(path):
+    _assert_equivalent(json.loads(path.read_text(encoding="utf-8")))
+
+
+def test_fuzzed_manifests():
+    for manifest in fuzzed_manifests(1500, seed=99):
+        _assert_equivalent(manifest)
+
+
+def test_numbers_and_unusual_input():
+    manifest = json.loads(json.dumps(VALID[0]))
+    impl = manifest["implementations"][0]
+    impl["requiredConfig"] = [
+        {"key": "A", "description": "a", "type": "integer", "defaultValue": 3},
+        {"key": "B", "description": "b", "type": "boolean", "defaultValue": True, "secret": False},
+    ]
+    decoded = fastmodels.manifest_from_dict(manifest)
+    assert [type(c.default_value) for c in decoded.implementations[0].required_config] == [float, bool]
+    _assert_equivalent(manifest)
+
+    class Text(str):
+        pass
+
+    manifest["name"] = Text("subclass")  # not on the fast path, same result
+    _assert_equivalent(manifest)
+    manifest["schemaVersion"] = models.SchemaVersion.THE_1
+    _assert_equivalent(manifest)
+
+
+def test_from_dict_per_class():
+    impl = VALID[0]["implementations"][0]
+    assert same_model(fastmodels.from_dict(models.Implementation, impl), models.Implementation.from_dict(impl))
+    auth = impl["authentication"]
+    assert same_model(fastmodels.from_dict(models.Authentication, auth), models.Authentication.from_dict(auth))
+    with pytest.raises(AssertionError):
+        fastmodels.from_dict(models.Credential, {"key": 1})
+
+
+def test_models_have_no_instance_dict():
+    # scripts/generate-sdk.ts adds the slots; a regeneration that loses them fails here.
+    classes = [
+        cls for cls in vars(models).values()
+        if isinstance(cls, type) and cls.__module__ == models.__name__ and not issubclass(cls, Enum)
+    ]
+    assert len(classes) > 10
+    for cls in classes:
+        assert "__slots__" in vars(cls) and "__dict__" not in vars(cls), cls.__name__
+    manifest = fastmodels.manifest_from_dict(VALID[0])
+    assert not hasattr(manifest, "__dict__")
+    assert not hasattr(manifest.implementations[0], "__dict__")
+    assert not hasattr(manifest.implementations[0].authentication, "__dict__")
+
+
+def test_intern_pool_shares_values():
+    pool = fastmodels.InternPool()
+    first, second = (fastmodels.manifest_from_dict(json.loads(json.dumps(VALID[0])), intern=pool) for _ in range(2))
+    assert first.implementations[0].protocol is second.implementations[0].protocol
+    assert same_model(first, models.aid_manifest_from_dict(VALID[0]))
+    assert len(pool) > 0
+
+
+def _bytes_per_manifest(texts, intern=None, n=700):
+    import gc
+    import tracemalloc
+
+    tracemalloc.start()
+    try:
+        kept = [fastmodels.manifest_from_dict(json.loads(texts[i % len(texts)]), intern=intern) for i in range(n)]
+        gc.collect()
+        size = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    assert len(kept) == n
+    return size / n
+
+
+def test_memory_per_manifest():
+    # Measured on the bundled examples (decoded models plus the strings they
+    # keep alive): ~2970 B/manifest with per-instance __dict__, ~2520 B with
+    # __slots__, ~2110 B with __slots__ and an InternPool.
+    texts = [json.dumps(m) for m in VALID]
+    plain = _bytes_per_manifest(texts)
+    interned = _bytes_per_manifest(texts, fastmodels.InternPool())
+    assert interned < plain * 0.95
@@ -0,0 +1,71 @@
+"""Cold-start guards for `import aid_core_py` and `aid-validate --help`.
+
+Uses ``python -X importtime`` in a fresh interpreter and checks that the heavy
+modules (jsonschema and the schema loader) stay out of the cold path. Import
+times vary too much on shared runners to assert by default; set
+AID_IMPORT_BUDGET_MS (e.g. 75) to also enforce a millisecond budget.
+"""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+PKG_ROOT = Path(__file__).resolve().parents[1]
+BUDGET_MS = float(os.environ["AID_IMPORT_BUDGET_MS"]) if os.environ.get("AID_IMPORT_BUDGET_MS") else None
+HEAVY = ("jsonschema", "referencing", "rpds", "importlib.resources")
+
+
+def _importtime(code):
+    env = dict(os.environ, PYTHONPATH=str(PKG_ROOT))
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True,
+        text=True,
+        cwd=PKG_ROOT,
+        env=env,
+    )
+    cumulative = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cum, name = line[len("import time:"):].split("|")
+        cumulative[name.strip()] = int(cum) / 1000.0
+    return proc, cumulative
+
+
+def _assert_lean(modules):
+    heavy = sorted(m for m in modules if m.split(".")[0] in HEAVY or m in HEAVY)
+    assert not heavy, f"cold start imported {heavy}"
+
+
+def _assert_budget(modules, name):
+    if BUDGET_MS is not None:
+        assert modules[name] < BUDGET_MS, f"importing {name} took {modules[name]:.1f} ms"
+
+
+def test_import_is_lean():
+    proc, modules = _importtime("import aid_core_py")
+    assert proc.returncode == 0, proc.stderr
+    _assert_lean(modules)
+    _assert_budget(modules, "aid_core_py")
+
+
+def test_txt_helpers_do_not_load_schema():
+    code = (
+        "import sys, aid_core_py\n"
+        "aid_core_py.validate_txt(aid_core_py.build_txt_record({'domain': 'example.com', 'implementations': ["
+        "{'type': 'remote', 'uri': 'https://api.example.com', 'protocol': 'mcp', 'authentication': {'scheme': 'none'}}]}))\n"
+        "assert aid_core_py._SCHEMA_CACHE is None\n"
+    )
+    proc, modules = _importtime(code)
+    assert proc.returncode == 0, proc.stderr
+    _assert_lean(modules)
+
+
+def test_cli_help_is_lean():
+    code = "import sys; sys.argv = ['aid-validate', '--help']\nfrom aid_core_py.cli import main\nmain()"
+    proc, modules = _importtime(code)
+    assert proc.returncode == 0, proc.stderr
+    assert "usage:" in proc.stdout
+    _assert_lean(modules)
+    _assert_budget(modules, "aid_core_py.cli")
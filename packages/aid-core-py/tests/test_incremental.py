@@ -0,0 +1,173 @@
+import copy
+import random
+
+import pytest
+
+from aid_core_py import ManifestValidator, _SCHEMA, _default_validator
+from aid_core_py.incremental import IncrementalValidator, _same_json, iter_errors, revalidate
+from conftest import VALID, VALUES, mutate
+
+BASE = copy.deepcopy(max(VALID, key=lambda d: len(d["implementations"])))
+POOL = [impl for doc in VALID for impl in doc["implementations"]]
+GENERIC_VALIDATOR = ManifestValidator(compiled=False)
+
+
+def _assert_same(actual, expected):
+    if expected is None:
+        assert actual is None
+        return
+    assert actual is not None
+    assert actual.message == expected.message
+    assert actual.validator == expected.validator
+    assert actual.instance == expected.instance
+    assert list(actual.absolute_path) == list(expected.absolute_path)
+    assert list(actual.absolute_schema_path) == list(expected.absolute_schema_path)
+
+
+def _edit(manifest, rng):
+    """Return an edited copy of ``manifest`` (a fresh object, as an editor re-parse would produce)."""
+    manifest = copy.deepcopy(manifest)
+    impls = manifest.get("implementations")
+    op = rng.random()
+    if isinstance(impls, list) and op < 0.45:
+        kind = rng.random()
+        if impls and kind < 0.4:
+            index = rng.randrange(len(impls))
+            if rng.random() < 0.7:
+                impls[index] = mutate({"x": impls[index]}, rng).get("x", {})
+            else:
+                impls[index] = copy.deepcopy(rng.choice(POOL))
+        elif kind < 0.6:
+            impls.insert(rng.randrange(len(impls) + 1), copy.deepcopy(rng.choice(POOL)))
+        elif impls and kind < 0.8:
+            impls.pop(rng.randrange(len(impls)))
+        elif len(impls) > 1:
+            i, j = rng.sample(range(len(impls)), 2)
+            impls[i], impls[j] = impls[j], impls[i]
+    elif op < 0.6:
+        key = rng.choice(["name", "schemaVersion", "metadata", "signature", "extra", "implementations"])
+        if key in manifest and rng.random() < 0.3:
+            del manifest[key]
+        elif key == "metadata":
+            manifest[key] = copy.deepcopy(rng.choice([BASE.get("metadata"), {"contentVersion": 1}, {}]))
+        else:
+            manifest[key] = copy.deepcopy(rng.choice(VALUES))
+    elif op < 0.7:
+        # Same value under ==, different JSON type.
+        target = rng.choice(impls) if isinstance(impls, list) and impls else manifest
+        if isinstance(target, dict) and target:
+            key = rng.choice(list(target))
+            target[key] = {True: 1, 1: True, 1.0: True, 0: False, False: 0}.get(target[key], True) if not isinstance(
+                target[key], (dict, list)
+            ) else target[key]
+    elif op < 0.85:
+        return copy.deepcopy(BASE)  # back to a valid version
+    else:
+        manifest = mutate(manifest, rng)
+    return manifest
+
+
+def _run_sequence(validator, seed, steps):
+    rng = random.Random(seed)
+    incremental = IncrementalValidator(validator)
+    current = copy.deepcopy(BASE)
+    for _ in range(steps):
+        current = _edit(current, rng)
+        _assert_same(incremental.error(current), validator.error(current))
+    return incremental
+
+
+@pytest.mark.parametrize("seed", range(8))
+def test_random_edit_sequences_match_full_validation(seed):
+    _run_sequence(_default_validator(), seed, 150)
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_random_edit_sequences_generic_schema(seed):
+    incremental = _run_sequence(GENERIC_VALIDATOR, 100 + seed, 40)
+    assert incremental.reused > incremental.checked
+
+
+def test_same_json_is_type_strict():
+    assert _same_json({"a": [1, {"b": "x"}]}, {"a": [1, {"b": "x"}]})
+    for a, b in [(1, True), (1, 1.0), (0, False), ([1], [True]), ({"a": 1}, {"a": 1.0}), ({"a": 1}, {"b": 1})]:
+        assert a == b or isinstance(a, dict)
+        assert not _same_json(a, b)
+
+
+def test_type_flip_is_not_reused():
+    validator = IncrementalValidator(GENERIC_VALIDATOR)
+    doc = copy.deepcopy(BASE)
+    doc["implementations"][0]["tags"] = ["a"]
+    assert validator.error(doc) is None
+    edited = copy.deepcopy(doc)
+    edited["implementations"][0]["tags"] = ["a"]
+    edited["name"] = "renamed"
+    assert validator.error(edited) is None
+    checked = validator.checked
+    flipped = copy.deepcopy(edited)
+    flipped["implementations"][0]["tags"] = [1]
+    _assert_same(validator.error(flipped), GENERIC_VALIDATOR.error(flipped))
+    assert validator.checked == checked + 1
+
+
+def test_revalidate_against_given_previous():
+    calls = []
+
+    class Counting(ManifestValidator):
+        def error(self, manifest):
+            calls.append(manifest)
+            return super().error(manifest)
+
+    validator = Counting(compiled=False)
+    edited = copy.deepcopy(BASE)
+    edited["implementations"][-1]["title"] = ""
+    incremental = IncrementalValidator(validator)
+    _assert_same(incremental.revalidate(BASE, edited), validator.error(edited))
+    assert incremental.checked == 1  # only the edited implementation
+    calls.clear()
+    assert revalidate(BASE, copy.deepcopy(BASE), validator) is None
+    assert not calls
+
+
+def test_moved_implementations_are_matched_by_name():
+    validator = IncrementalValidator(GENERIC_VALIDATOR)
+    many = copy.deepcopy(BASE)
+    many["implementations"] = [dict(impl, name=f"impl-{i}") for i, impl in enumerate(BASE["implementations"] * 3)]
+    validator.error(many)
+    shifted = copy.deepcopy(many)
+    shifted["implementations"].insert(0, shifted["implementations"].pop())
+    before = validator.checked
+    assert validator.error(shifted) is None
+    assert validator.checked == before
+
+
+def test_cross_element_and_cross_field_keywords():
+    schema = copy.deepcopy(_SCHEMA)
+    schema["definitions"]["AidManifest"]["properties"]["implementations"]["uniqueItems"] = True
+    validator = ManifestValidator(schema)
+    incremental = IncrementalValidator(validator)
+    duplicated = copy.deepcopy(BASE)
+    duplicated["implementations"].append(copy.deepcopy(duplicated["implementations"][0]))
+    assert incremental.error(BASE) is None
+    _assert_same(incremental.error(duplicated), validator.error(duplicated))
+    assert incremental.error(duplicated).validator == "uniqueItems"
+
+    schema = copy.deepcopy(_SCHEMA)
+    schema["definitions"]["AidManifest"]["dependencies"] = {"signature": ["metadata"]}
+    validator = ManifestValidator(schema)
+    incremental = IncrementalValidator(validator)
+    signed = {k: v for k, v in BASE.items() if k != "metadata"}
+    signed["signature"] = "sig"
+    _assert_same(incremental.error(signed), validator.error(signed))
+    assert incremental.error(signed) is not None and incremental.checked == 0
+
+
+def test_iter_errors_matches_full_search():
+    def found(errors):
+        return sorted((e.message, list(e.absolute_path)) for e in errors)
+
+    for doc in [BASE, *(mutate(BASE, random.Random(seed)) for seed in range(40))]:
+        expected = found(GENERIC_VALIDATOR._generic_validator().iter_errors(doc))
+        assert found(iter_errors(doc)) == expected
+        assert found(iter_errors(doc, GENERIC_VALIDATOR)) == expected
@@ -0,0 +1,135 @@
+import copy
+import json
+import random
+
+import pytest
+
+from aid_core_py.fastmodels import manifest_from_dict
+from aid_core_py.index import FIELDS, ManifestIndex
+from conftest import VALID
+
+IMPLS = [impl for doc in VALID for impl in doc["implementations"]]
+TAGS = ["tools", "beta", "internal", "search", "chat"]
+VALUES = {
+    "protocol": ["mcp", "a2a", "openapi"],
+    "type": ["remote", "local"],
+    "scheme": ["none", "pat", "oauth2_code", "apikey"],
+    "tag": TAGS,
+    "manager": ["npm", "npx", "pip", "docker"],
+    "status": ["active", "deprecated"],
+    "mcp_version": ["2025-06-18", "2025-03-26"],
+}
+_DICT_PATHS = {
+    "protocol": lambda i: i.get("protocol"),
+    "type": lambda i: i.get("type"),
+    "scheme": lambda i: i["authentication"].get("scheme"),
+    "manager": lambda i: (i.get("package") or {}).get("manager"),
+    "status": lambda i: i.get("status"),
+    "mcp_version": lambda i: i.get("mcpVersion"),
+}
+
+
+def _manifest(rng, key):
+    impls = []
+    for n in range(rng.randint(1, 4)):
+        impl = copy.deepcopy(rng.choice(IMPLS))
+        impl["name"] = f"{key}-{n}"
+        impl["protocol"] = rng.choice(VALUES["protocol"])
+        impl["tags"] = rng.sample(TAGS, rng.randint(0, 3))
+        if rng.random() < 0.5:
+            impl["status"] = rng.choice(VALUES["status"])
+        if rng.random() < 0.5:
+            impl["mcpVersion"] = rng.choice(VALUES["mcp_version"])
+        if impl["type"] == "local":
+            impl["package"]["manager"] = rng.choice(VALUES["manager"])
+        impls.append(impl)
+    return {"schemaVersion": "1", "name": key, "implementations": impls}
+
+
+def _scan(corpus, all_tags=(), **criteria):
+    out = []
+    for key in sorted(corpus):
+        for position, impl in enumerate(corpus[key]["implementations"]):
+            ok = set(all_tags) <= set(impl.get("tags") or ())
+            for field, wanted in criteria.items():
+                wanted = {wanted} if isinstance(wanted, str) else set(wanted)
+                if field == "tag":
+                    ok = ok and bool(wanted & set(impl.get("tags") or ()))
+                else:
+                    ok = ok and _DICT_PATHS[field](impl) in wanted
+            if ok:
+                out.append((key, position))
+    return out
+
+
+def _random_query(rng):
+    criteria = {}
+    for field in rng.sample(FIELDS, rng.randint(0, 3)):
+        values = VALUES[field]
+        criteria[field] = rng.choice(values) if rng.random() < 0.7 else rng.sample(values, 2)
+    all_tags = rng.sample(TAGS, rng.randint(0, 2)) if rng.random() < 0.3 else ()
+    return all_tags, criteria
+
+
+def _check(index, corpus, rng, queries=150):
+    for _ in range(queries):
+        all_tags, criteria = _random_query(rng)
+        expected = _scan(corpus, all_tags, **criteria)
+        matches = index.query(all_tags, **criteria)
+        assert [(m.key, m.position) for m in matches] == expected
+        assert index.count(all_tags, **criteria) == len(expected)
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_queries_match_linear_scan_through_updates(seed, tmp_path):
+    rng = random.Random(seed)
+    corpus = {f"d{i}.example": _manifest(rng, f"d{i}.example") for i in range(200)}
+    index = ManifestIndex()
+    for key, manifest in corpus.items():
+        index.add(key, manifest if rng.random() < 0.5 else manifest_from_dict(manifest))
+    _check(index, corpus, rng)
+
+    for _ in range(100):
+        key = f"d{rng.randrange(260)}.example"
+        if key in corpus and rng.random() < 0.4:
+            assert index.remove(key)
+            del corpus[key]
+        else:
+            corpus[key] = _manifest(rng, key)
+            index.add(key, json.dumps(corpus[key]))
+    assert not index.remove("missing.example")
+    assert len(index) == len(corpus)
+    _check(index, corpus, rng)
+
+    path = tmp_path / "index.json"
+    index.save(path)
+    loaded = ManifestIndex.load(path)
+    _check(loaded, corpus, rng)
+    assert {f: loaded.facets(f) for f in FIELDS} == {f: index.facets(f) for f in FIELDS}
+    for _ in range(30):
+        key = rng.choice(sorted(corpus))
+        loaded.remove(key)
+        del corpus[key]
+    loaded.add("new.example", _manifest(rng, "new.example"))
+    corpus["new.example"] = loaded.get("new.example").to_dict()
+    _check(loaded, corpus, rng)
+    loaded.save(path)
+    _check(ManifestIndex.load(path), corpus, rng)
+
+
+def test_match_and_errors(tmp_path):
+    doc = copy.deepcopy(VALID[0])
+    doc["implementations"][0]["tags"] = ["x", "x"]
+    index = ManifestIndex()
+    index.add("a.example", doc)
+    [match] = index.query(tag="x")
+    assert match.implementation.name == doc["implementations"][0]["name"]
+    assert index.facets("tag")["x"] == 1
+    index.remove("a.example")
+    assert index.facets("tag") == {} and index.query() == []
+    with pytest.raises(TypeError, match="unknown index field"):
+        index.query(color="red")
+    path = tmp_path / "other.json"
+    path.write_text('{"version": 99}')
+    with pytest.raises(ValueError, match="not a manifest index snapshot"):
+        ManifestIndex.load(path)
@@ -0,0 +1,109 @@
+import json
+import sys
+
+import pytest
+
+from aid_core_py import ManifestValidator, check_manifest, instrument, parse_manifest, validate_manifest, validate_txt
+from aid_core_py.cli import run_batch
+from conftest import VALID
+
+TXT = "v=aid1;uri=https://api.example.com;proto=mcp"
+
+
+@pytest.fixture(autouse=True)
+def no_profiler():
+    instrument.disable()
+    yield
+    instrument.disable()
+
+
+def test_disabled_records_nothing():
+    profiler = instrument.Profiler()
+    validate_manifest(json.dumps(VALID[0]))
+    assert instrument.active is None and profiler.snapshot() == {}
+
+
+def test_phases_counters_and_failures():
+    raw = json.dumps(VALID[0]).encode()
+    bad = {**VALID[0], "schemaVersion": "2"}
+    with instrument.profiling() as profiler:
+        validate_manifest(raw)
+        parse_manifest(raw)
+        assert not ManifestValidator().is_valid(bad)
+        assert not check_manifest(bad, "fast").valid
+        with pytest.raises(Exception):
+            validate_manifest(bad)
+        with pytest.raises(ValueError):
+            validate_manifest(b"{not json")
+        validate_txt(TXT)
+    assert instrument.active is None
+    stats = profiler.snapshot()
+    assert stats["decode"]["calls"] == 3 and stats["decode"]["failures"] == 1
+    assert stats["decode"]["bytes"] == 2 * len(raw) + len(b"{not json")
+    assert stats["validate"]["calls"] == 5 and stats["validate"]["failures"] == 3
+    assert stats["from_dict"]["calls"] == 1
+    assert stats["txt"] == {**stats["txt"], "calls": 1, "failures": 0, "bytes": len(TXT)}
+    for phase in stats.values():
+        assert sum(phase["buckets"].values()) == phase["calls"]
+        assert list(phase["buckets"])[-1] == "+Inf"
+        assert phase["min"] <= phase["max"] and phase["seconds"] >= phase["max"]
+    assert profiler.summary().splitlines()[1].startswith("decode")
+
+
+def test_hooks_and_buckets():
+    events = []
+    profiler = instrument.add_hook(events.append)
+    assert instrument.active is profiler
+    validate_manifest(VALID[0])
+    instrument.remove_hook(events.append)
+    validate_manifest(VALID[0])
+    assert [(e.phase, e.ok) for e in events] == [("validate", True)]
+
+    profiler = instrument.Profiler(buckets=(0.1, 1.0, float("inf")))
+    for seconds in (0.05, 0.1, 0.5, 5.0):
+        profiler.record("x", seconds)
+    assert list(profiler.snapshot()["x"]["buckets"].values()) == [2, 1, 1]
+    with pytest.raises(ValueError):
+        instrument.Profiler(buckets=(1.0, 0.1))
+
+
+def test_merge():
+    a, b = instrument.Profiler(), instrument.Profiler()
+    a.record("validate", 0.001, True, 10)
+    b.record("validate", 0.002, False, 5)
+    b.record("read", 0.5)
+    a.merge(json.loads(json.dumps(b.snapshot())))
+    stats = a.snapshot()
+    assert stats["validate"]["calls"] == 2 and stats["validate"]["failures"] == 1
+    assert stats["validate"]["bytes"] == 15 and stats["validate"]["max"] == 0.002
+    assert stats["read"]["calls"] == 1
+
+
+def test_batch_workers_are_merged(tmp_path):
+    paths = []
+    for index in range(6):
+        path = tmp_path / f"{index}.json"
+        path.write_text(json.dumps(VALID[index % len(VALID)]))
+        paths.append(str(path))
+    with instrument.profiling() as profiler:
+        results = list(run_batch(paths, jobs=2, chunk_size=2))
+    assert all(r["ok"] for r in results)
+    stats = profiler.snapshot()
+    assert stats["read"]["calls"] == 6 and stats["validate"]["calls"] == 6
+    assert stats["read"]["bytes"] == sum(len(open(p, "rb").read()) for p in paths)
+
+
+def test_cli_profile(monkeypatch, capsys, tmp_path):
+    from aid_core_py import cli
+
+    registered = []
+    monkeypatch.setattr("atexit.register", registered.append)
+    path = tmp_path / "aid.json"
+    path.write_text(json.dumps(VALID[0]))
+    monkeypatch.setattr(sys, "argv", ["aid-validate", str(path), "--profile"])
+    with pytest.raises(SystemExit):
+        cli.main()
+    [report] = registered
+    report()
+    err = capsys.readouterr().err
+    assert err.startswith("phase") and "\nread " in err and "\nvalidate " in err
@@ -0,0 +1,132 @@
+import json
+import sys
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+from aid_core_py import fastmodels, jsonio, parse_manifest, validate_manifest
+from aid_core_py.lazy import lazy_manifest
+from aid_core_py.serialize import dump_manifest
+from conftest import CORPUS, VALID
+
+BACKENDS = jsonio.available_backends()
+TRICKY = [
+    b"[1.5e-07, 1e+16, -0.0, 18446744073709551615, -9223372036854775808]",
+    b'{"a": NaN, "b": -Infinity}',
+    '{"s": "café \\ud800"}'.encode(),
+    b'{"dup": 1, "dup": 2}',
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_backend(monkeypatch):
+    monkeypatch.setattr(jsonio, "_BACKEND", None)
+    monkeypatch.setattr(jsonio, "_FACTORIES", dict(jsonio._FACTORIES))
+    monkeypatch.delenv(jsonio.ENV_VAR, raising=False)
+
+
+def test_preferred_backend_is_picked():
+    assert BACKENDS[-1] == "stdlib"
+    assert jsonio.get_backend().name == BACKENDS[0]
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_loads_matches_stdlib(name):
+    backend = jsonio.set_backend(name)
+    for path in CORPUS:
+        raw = path.read_bytes()
+        expected = json.loads(raw)
+        for data in (raw, bytearray(raw), memoryview(raw), raw.decode("utf-8")):
+            assert backend.loads(data) == expected
+    for raw in TRICKY:
+        assert json.dumps(backend.loads(raw)) == json.dumps(json.loads(raw))
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_decode_errors_are_stdlib_errors(name):
+    backend = jsonio.set_backend(name)
+    for raw in (b"{not json", b"", b'{"a": 1', b"\xff"):
+        with pytest.raises(ValueError) as expected:
+            json.loads(raw)
+        with pytest.raises(ValueError) as actual:
+            backend.loads(raw)
+        assert str(actual.value) == str(expected.value)
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_dumps_is_compact_utf8(name):
+    backend = jsonio.set_backend(name)
+    for doc in VALID + [{"name": "café", "n": [1, 2**70, True, None]}]:
+        for sort_keys in (False, True):
+            expected = json.dumps(doc, sort_keys=sort_keys, separators=(",", ":"), ensure_ascii=False)
+            assert backend.dumps(doc, sort_keys) == expected.encode("utf-8")
+
+
+def test_unknown_backend():
+    with pytest.raises(ValueError, match="unknown JSON backend 'nope'"):
+        jsonio.set_backend("nope")
+
+
+def test_env_var_and_register(monkeypatch):
+    calls = []
+
+    def custom():
+        calls.append(1)
+        return jsonio.JsonBackend("custom", lambda data: calls.append(data) or json.loads(data), jsonio.STDLIB.dumps)
+
+    def missing():
+        raise ImportError("not installed")
+
+    jsonio.register_backend("custom", custom, preferred=True)
+    jsonio.register_backend("missing", missing, preferred=True)
+    assert jsonio.available_backends()[0] == "custom"
+    assert jsonio.get_backend().name == "custom"
+    raw = json.dumps(VALID[0])
+    validate_manifest(raw)
+    assert calls[-1] == raw
+
+    monkeypatch.setattr(jsonio, "_BACKEND", None)
+    monkeypatch.setenv(jsonio.ENV_VAR, "stdlib")
+    assert jsonio.get_backend() is jsonio.STDLIB
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_validation_accepts_buffers(name):
+    jsonio.set_backend(name)
+    raw = json.dumps(VALID[0]).encode()
+    for data in (raw, bytearray(raw), memoryview(raw)):
+        validate_manifest(data)
+        assert parse_manifest(data).name == VALID[0]["name"]
+    bad = json.dumps({**VALID[0], "schemaVersion": "2"}).encode()
+    with pytest.raises(ValidationError):
+        validate_manifest(memoryview(bad))
+
+
+@pytest.mark.parametrize("name", BACKENDS)
+def test_dump_manifest_backend(name):
+    jsonio.set_backend(name)
+    for doc in VALID:
+        for model in (fastmodels.manifest_from_dict(doc), lazy_manifest(doc)):
+            expected = json.dumps(model.to_dict(), separators=(",", ":"), ensure_ascii=False).encode()
+            assert dump_manifest(model, backend=True) == expected
+            assert json.loads(dump_manifest(model, backend=True, sort_keys=True)) == model.to_dict()
+    with pytest.raises(TypeError, match="only supports sort_keys"):
+        dump_manifest(lazy_manifest(VALID[0]), backend=True, indent=2)
+
+
+def test_cli_json_backend(monkeypatch, capsys, tmp_path):
+    from aid_core_py import cli
+
+    path = tmp_path / "aid.json"
+    path.write_bytes(json.dumps(VALID[0]).encode())
+    for name in BACKENDS:
+        monkeypatch.setattr(sys, "argv", ["aid-validate", str(path), "--json-backend", name])
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main()
+        assert exit_info.value.code == 0
+        assert jsonio.get_backend().name == name
+    monkeypatch.setattr(sys, "argv", ["aid-validate", str(path), "--json-backend", "nope"])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    assert exit_info.value.code == 2
+    assert "unknown JSON backend" in capsys.readouterr().err
@@ -0,0 +1,64 @@
+import copy
+import json
+
+import pytest
+
+from aid_core_py import fastmodels, models
+from aid_core_py.lazy import LazyAidManifest, lazy_manifest
+from conftest import VALID, same_model
+
+MANY = copy.deepcopy(VALID[0])
+MANY["implementations"] = [copy.deepcopy(i) for i in MANY["implementations"] * 50]
+
+
+def test_untouched_round_trip_returns_original():
+    view = lazy_manifest(MANY)
+    assert view.name == MANY["name"] and view.schema_version is models.SchemaVersion.THE_1
+    assert len(view.implementations) == len(MANY["implementations"])
+    assert view.to_dict() is MANY
+    assert models.aid_manifest_to_dict(view) is MANY
+
+
+def test_materializes_only_what_is_accessed():
+    view = lazy_manifest(MANY)
+    impl = view.implementations[7]
+    assert view.implementations.materialized == 1
+    assert view.implementations[7] is impl  # cached
+    assert same_model(impl, models.Implementation.from_dict(MANY["implementations"][7]))
+    assert view.implementations[-1].name == MANY["implementations"][-1]["name"]
+    assert view.implementations.materialized == 2
+
+
+@pytest.mark.parametrize("index", range(len(VALID)))
+def test_same_attributes_as_eager_model(index):
+    raw = VALID[index]
+    view, eager = lazy_manifest(raw), fastmodels.manifest_from_dict(raw)
+    assert isinstance(view, models.AidManifest)
+    for name in models.AidManifest.__annotations__:
+        actual, expected = getattr(view, name), getattr(eager, name)
+        assert same_model(list(actual) if name == "implementations" else actual, expected), name
+    assert view.to_dict() == eager.to_dict()
+
+
+def test_mutations_are_serialized_and_raw_is_untouched():
+    raw = json.loads(json.dumps(VALID[0]))
+    snapshot = json.dumps(raw)
+    view = lazy_manifest(raw)
+    view.name = "renamed"
+    view.implementations[0].title = "Changed"
+    del view.implementations[-1]
+    result = view.to_dict()
+    assert result is not raw and json.dumps(raw) == snapshot
+    assert result["name"] == "renamed" and result["implementations"][0]["title"] == "Changed"
+    assert len(result["implementations"]) == len(raw["implementations"]) - 1
+    assert result["implementations"][1:] == raw["implementations"][1:-1]
+
+    view.implementations = [fastmodels.from_dict(models.Implementation, raw["implementations"][0])]
+    assert len(view.to_dict()["implementations"]) == 1
+
+
+def test_errors_surface_on_access():
+    view = LazyAidManifest({"name": "x", "schemaVersion": "1", "implementations": [{"name": 1}]})
+    assert view.name == "x"
+    with pytest.raises(AssertionError):
+        view.implementations[0]
@@ -0,0 +1,180 @@
+import copy
+import json
+import threading
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+import aid_core_py
+from aid_core_py import ManifestValidator, _SCHEMA, _default_validator, _schema_hash, parse_manifest
+from aid_core_py.memo import ValidationMemo, canonical_json, content_hash
+from conftest import VALID, fuzzed_manifests, same_model
+
+
+def test_canonical_form_ignores_key_order_and_whitespace():
+    doc = VALID[0]
+    shuffled = json.loads(json.dumps(doc, sort_keys=True))
+    reordered = dict(reversed(list(shuffled.items())))
+    assert canonical_json(doc) == canonical_json(reordered)
+    assert canonical_json(json.dumps(doc, indent=4)) == canonical_json(doc)
+    assert canonical_json(json.dumps(doc).encode()) == canonical_json(doc)
+    assert content_hash(doc) == content_hash(json.dumps(doc, indent=2))
+    assert b" " not in canonical_json({"a": [1, 2], "b": {"c": None}})
+    assert canonical_json({"name": "café"}) == b'{"name":"caf\\u00e9"}'
+
+
+def test_content_hash_distinguishes_values():
+    doc = copy.deepcopy(VALID[0])
+    before = content_hash(doc)
+    doc["name"] += "!"
+    assert content_hash(doc) != before
+    assert len(before) == 64
+
+
+def test_results_match_validator():
+    memo = ValidationMemo()
+    validator = _default_validator()
+    docs = fuzzed_manifests(400, seed=16)
+    texts = [json.dumps(doc) for doc in docs]
+    for _ in range(2):
+        for doc, text in zip(docs, texts):
+            expected = validator.error(doc)
+            for actual in (memo.error(doc), memo.error(text)):
+                if expected is None:
+                    assert actual is None
+                else:
+                    assert (actual.message, list(actual.path)) == (expected.message, list(expected.path))
+    # Texts are all memoized; dicts only when invalid.
+    invalid = {content_hash(d) for d in docs if validator.error(d) is not None}
+    stats = memo.stats()
+    assert stats["misses"] == len(set(texts)) + len(invalid)
+    assert stats["hits"] == 2 * len(docs) + 2 * sum(validator.error(d) is not None for d in docs) - stats["misses"]
+
+
+class Counting(ManifestValidator):
+    def __init__(self, *args):
+        super().__init__(*args)
+        self.calls = []
+
+    def error(self, manifest):
+        self.calls.append(manifest)
+        return super().error(manifest)
+
+
+def test_duplicate_text_skips_decoding_and_validation():
+    validator = Counting()
+    memo = ValidationMemo(validator)
+    text = json.dumps(VALID[0], indent=2)
+    memo.validate(text)
+    memo.validate(text)
+    assert memo.is_valid(text.encode())  # the same UTF-8 bytes
+    assert len(validator.calls) == 1
+    assert memo.stats() == {"size": 1, "hits": 2, "misses": 1, "evictions": 0, "hit_rate": 2 / 3}
+    memo.validate(json.dumps(VALID[0]))  # re-serialized: a separate entry
+    assert len(validator.calls) == 2 and len(memo) == 2
+
+
+def test_only_invalid_dicts_are_memoized():
+    validator = Counting()
+    memo = ValidationMemo(validator)
+    for _ in range(3):
+        memo.validate(VALID[0])
+    assert validator.calls == [] and len(memo) == 0
+    bad = copy.deepcopy(VALID[0])
+    del bad["name"]
+    reordered = dict(reversed(list(bad.items())))
+    assert not memo.is_valid(bad) and not memo.is_valid(reordered)
+    assert len(validator.calls) == 1 and memo.hits == 1
+
+
+def test_invalid_raises_cached_error_each_time():
+    memo = ValidationMemo()
+    bad = copy.deepcopy(VALID[0])
+    del bad["name"]
+    errors = []
+    for _ in range(3):
+        with pytest.raises(ValidationError) as exc:
+            memo.validate(bad)
+        errors.append(exc.value)
+    assert errors[0] is errors[2]
+    assert "'name' is a required property" in str(errors[0])
+    with pytest.raises(ValidationError):
+        memo.parse(bad)
+
+
+def test_lru_eviction():
+    memo = ValidationMemo(maxsize=2)
+    a, b, c = ({"name": n} for n in "abc")
+    memo.error(a)
+    memo.error(b)
+    memo.error(a)  # refresh a
+    memo.error(c)  # evicts b
+    assert len(memo) == 2 and memo.evictions == 1
+    memo.error(a)
+    assert memo.hits == 2
+    memo.error(b)
+    assert memo.misses == 4
+
+
+def test_zero_maxsize_disables_storage():
+    memo = ValidationMemo(maxsize=0)
+    memo.error(json.dumps(VALID[0]))
+    memo.error(json.dumps(VALID[0]))
+    assert len(memo) == 0 and memo.misses == 2
+
+
+def test_parse_memo():
+    doc = VALID[0]
+    plain = ValidationMemo()
+    assert plain.parse(doc) is not plain.parse(doc)
+    assert same_model(plain.parse(doc), parse_manifest(doc))
+
+    memo = ValidationMemo(cache_models=True)
+    first = memo.parse(json.dumps(doc))
+    assert memo.parse(json.dumps(doc).encode()) is first
+    assert same_model(first, parse_manifest(doc))
+    assert memo.parse(doc) is memo.parse(copy.deepcopy(doc))
+
+
+def test_clear_and_schema_change(monkeypatch):
+    memo = ValidationMemo()
+    assert memo.schema_hash == _schema_hash()
+    doc = VALID[0]
+    text = json.dumps(doc)
+    assert memo.is_valid(text)
+
+    schema = copy.deepcopy(_SCHEMA)
+    definition = schema["definitions"]["AidManifest"]
+    definition["required"] = [*definition["required"], "owner"]
+    memo.clear(ManifestValidator(schema))
+    assert len(memo) == 0
+    assert memo.schema_hash != _schema_hash()
+    assert not memo.is_valid(doc)
+    assert not memo.is_valid(text)
+
+    # Replacing the validator, or a new bundled schema, drops the stale entries.
+    memo.validator = _default_validator()
+    assert memo.is_valid(text) and len(memo) == 1
+    monkeypatch.setattr(aid_core_py, "_SCHEMA_HASH", "00" * 32)
+    memo.error(json.dumps(VALID[1]))
+    assert len(memo) == 1 and memo.schema_hash == "00" * 32
+
+
+def test_thread_safe():
+    memo = ValidationMemo(maxsize=50)
+    docs = fuzzed_manifests(200, seed=3)
+    expected = [_default_validator().error(d) is None for d in docs]
+    failures = []
+
+    def worker():
+        for doc, ok in zip(docs, expected):
+            if memo.is_valid(doc) is not ok:
+                failures.append(doc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not failures
+    assert len(memo) <= 50
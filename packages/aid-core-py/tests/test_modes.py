@@ -0,0 +1,145 @@
+import copy
+import json
+import random
+import sys
+
+import pytest
+
+from aid_core_py import (
+    ManifestValidator,
+    ValidationIssue,
+    _default_validator,
+    check_manifest,
+)
+from conftest import VALID, mutate
+
+GENERIC_VALIDATOR = ManifestValidator(compiled=False)
+BASE = max(VALID, key=lambda d: len(d["implementations"]))
+
+
+def _invalid(seed, count=40):
+    rng = random.Random(seed)
+    docs = []
+    while len(docs) < count:
+        doc = mutate(copy.deepcopy(rng.choice(VALID)), rng)
+        if not _default_validator().is_valid(doc):
+            docs.append(doc)
+    return docs
+
+
+def _expected(doc):
+    return [ValidationIssue.from_error(e) for e in GENERIC_VALIDATOR._generic_validator().iter_errors(doc)]
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_modes_agree_with_jsonschema(seed):
+    for doc in _invalid(seed):
+        expected = _expected(doc)
+        for validator in (_default_validator(), GENERIC_VALIDATOR):
+            report = validator.check(doc, "all", max_errors=1000)
+            assert not report.valid and report.complete
+            assert report.errors == expected
+            first = validator.check(doc, "first")
+            assert first.errors == expected[:1] and not first.complete
+            best = validator.check(doc, "best")
+            assert best.errors == [ValidationIssue.from_error(validator.error(doc))]
+            assert validator.check(doc, "fast") == (False, [], False)
+
+
+def test_valid_manifest():
+    for mode in ("fast", "first", "best", "all"):
+        assert check_manifest(json.dumps(BASE), mode) == (True, [], True)
+
+
+def test_pointers_and_limits():
+    doc = copy.deepcopy(BASE)
+    doc["implementations"][1]["authentication"] = {"scheme": "bogus"}
+    doc["metadata"] = {"a/b~c": 1}
+    del doc["name"]
+    doc["extra"] = True
+    report = check_manifest(doc)
+    pointers = {issue.pointer: issue for issue in report.errors}
+    assert pointers["/implementations/1"].keyword == "anyOf"
+    assert pointers[""].schema_pointer in ("/required", "/additionalProperties")
+    assert len(report.errors) == 4 and report.errors[0].to_dict()["pointer"] in pointers
+
+    capped = check_manifest(doc, max_errors=2)
+    assert capped.errors == report.errors[:2] and not capped.complete
+    assert not check_manifest(doc, time_budget=0).complete
+    with pytest.raises(ValueError, match="unknown validation mode"):
+        check_manifest(doc, "everything")
+
+
+def test_errors_computed():
+    class Counting(ManifestValidator):
+        def _iter_errors(self, instance):
+            for error in super()._iter_errors(instance):
+                self.pulled += 1
+                yield error
+
+    doc = copy.deepcopy(BASE)
+    doc["implementations"][1]["authentication"] = {"scheme": "bogus"}
+    del doc["name"]
+    doc["extra"] = True
+    validator = Counting()
+    for mode, options, reported, pulled in [
+        ("first", {}, 1, 1),
+        ("all", {"max_errors": 2}, 2, 3),
+        ("all", {"time_budget": 0}, 1, 1),
+        ("all", {}, 3, 3),
+    ]:
+        validator.pulled = 0
+        assert len(validator.check(doc, mode, **options).errors) == reported
+        assert validator.pulled == pulled, (mode, options)
+
+
+def test_pointer_escaping():
+    schema = {"type": "object", "properties": {"a/b~c": {"type": "string"}}}
+    [issue] = ManifestValidator(schema).check({"a/b~c": 1}).errors
+    assert issue.pointer == "/a~1b~0c"
+    assert issue.schema_pointer == "/properties/a~1b~0c/type"
+
+
+def test_pathological_implementation_is_walked_once():
+    many = copy.deepcopy(BASE)
+    many["implementations"] = [copy.deepcopy(impl) for impl in BASE["implementations"] * 50]
+    many["implementations"][3]["authentication"] = {"scheme": "bogus"}
+    report = check_manifest(many, "all")
+    assert [issue.pointer for issue in report.errors] == ["/implementations/3"]
+    assert report.complete
+
+
+def test_cli_modes(monkeypatch, capsys, tmp_path):
+    from aid_core_py import cli
+
+    bad = copy.deepcopy(BASE)
+    del bad["name"]
+    bad["extra"] = 1
+    path = tmp_path / "aid.json"
+    path.write_text(json.dumps(bad))
+    good = tmp_path / "good.json"
+    good.write_text(json.dumps(BASE))
+
+    def run(*args):
+        monkeypatch.setattr(sys, "argv", ["aid-validate", *map(str, args)])
+        with pytest.raises(SystemExit) as exit_info:
+            cli.main()
+        return exit_info.value.code, capsys.readouterr()
+
+    code, out = run(path, "--mode", "all")
+    assert code == 1
+    assert "/: 'name' is a required property" in out.err and "'extra' was unexpected" in out.err
+    code, out = run(path, "--mode", "all", "--max-errors", "1")
+    assert code == 1 and "more errors not listed" in out.err
+    code, out = run(good, "--mode", "fast")
+    assert code == 0
+
+    code, out = run(path, good, tmp_path / "missing.json", "--jsonl", "--mode", "all")
+    results = {r["path"]: r for r in map(json.loads, out.out.splitlines())}
+    assert code == 1
+    assert [e["keyword"] for e in results[str(path)]["errors"]] == ["required", "additionalProperties"]
+    assert results[str(good)]["ok"] and results[str(good)]["errors"] == []
+    assert not results[str(tmp_path / "missing.json")]["ok"]
+
+    code, out = run("--ndjson", "--mode", "fast")
+    assert code == 2 and "--mode is not supported with --ndjson" in out.err
@@ -0,0 +1,229 @@
+"""Resolver tests against a local stub DNS server and a local HTTP server."""
+import asyncio
+import json
+import struct
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from aid_core_py.resolver import Resolver, ResolverError, http_get, query_txt, resolve_many
+from conftest import EXAMPLES
+
+EXAMPLE = next(p for p in EXAMPLES if p.parents[1].name == "multi").read_bytes()
+
+
+class StubDns(asyncio.DatagramProtocol):
+    """Answers TXT queries from ``zone`` (name -> list of rdata strings); NXDOMAIN otherwise."""
+
+    def __init__(self, zone, truncate=()):
+        self.zone = zone
+        self.truncate = truncate
+        self.queries = []
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def datagram_received(self, data, addr):
+        self.transport.sendto(self.answer(data), addr)
+
+    def answer(self, data, tcp=False):
+        qid = struct.unpack_from("!H", data)[0]
+        offset, labels = 12, []
+        while data[offset]:
+            labels.append(data[offset + 1:offset + 1 + data[offset]].decode())
+            offset += 1 + data[offset]
+        question = data[12:offset + 5]
+        name = ".".join(labels)
+        self.queries.append(name)
+        records = self.zone.get(name)
+        if name in self.truncate and not tcp:
+            return struct.pack("!HHHHHH", qid, 0x8380, 1, 0, 0, 0) + question
+        if records is None:
+            return struct.pack("!HHHHHH", qid, 0x8183, 1, 0, 0, 0) + question
+        answers = b""
+        for record in records:
+            chunks = [record[i:i + 255].encode() for i in range(0, len(record), 255)] or [b""]
+            rdata = b"".join(bytes([len(c)]) + c for c in chunks)
+            answers += b"\xc0\x0c" + struct.pack("!HHIH", 16, 1, 300, len(rdata)) + rdata
+        return struct.pack("!HHHHHH", qid, 0x8180, 1, len(records), 0, 0) + question + answers
+
+
+class _Handler(BaseHTTPRequestHandler):
+    routes = {}
+
+    def do_GET(self):
+        status, body, delay = self.routes.get(self.path, (404, b"not found", 0))
+        if delay:
+            threading.Event().wait(delay)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    # The default listen backlog (5) drops connections under resolve_many's
+    # concurrency; the client then waits out the 1s SYN retransmit.
+    request_queue_size = 128
+
+
+@pytest.fixture
+def http_server():
+    server = _Server(("127.0.0.1", 0), _Handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    _Handler.routes = {}
+    yield f"http://127.0.0.1:{server.server_address[1]}", _Handler.routes
+    server.shutdown()
+
+
+async def _with_dns(zone, body, truncate=()):
+    loop = asyncio.get_running_loop()
+    stub = StubDns(zone, truncate)
+    transport, _ = await loop.create_datagram_endpoint(lambda: stub, local_addr=("127.0.0.1", 0))
+    port = transport.get_extra_info("sockname")[1]
+
+    async def handle_tcp(reader, writer):
+        (length,) = struct.unpack("!H", await reader.readexactly(2))
+        response = stub.answer(await reader.readexactly(length), tcp=True)
+        writer.write(struct.pack("!H", len(response)) + response)
+        await writer.drain()
+        writer.close()
+
+    tcp = await asyncio.start_server(handle_tcp, "127.0.0.1", port)
+    try:
+        return await body(Resolver(nameserver="127.0.0.1", port=port, dns_timeout=1, fetch_timeout=1), stub)
+    finally:
+        tcp.close()
+        transport.close()
+
+
+def _types(steps):
+    return [s.type for s in steps]
+
+
+def test_extended_profile(http_server):
+    base, routes = http_server
+    routes["/.well-known/aid.json"] = (200, EXAMPLE, 0)
+    zone = {"_agent.example.com": [f"v=aid1;config={base}/.well-known/aid.json"]}
+
+    steps = asyncio.run(_with_dns(zone, lambda r, _: r.resolve_all("example.com")))
+    assert _types(steps) == [
+        "dns_query", "dns_success", "manifest_fetch", "manifest_success", "validation_start", "validation_success"
+    ]
+    assert steps[0].data == {"recordName": "_agent.example.com"}
+    assert steps[-1].data["manifest"] == json.loads(EXAMPLE)
+
+
+def test_invalid_manifest_and_http_error(http_server):
+    base, routes = http_server
+    routes["/bad.json"] = (200, b'{"schemaVersion": "2"}', 0)
+    zone = {
+        "_agent.bad.example": [f"v=aid1;config={base}/bad.json"],
+        "_agent.missing.example": [f"v=aid1;config={base}/missing.json"],
+    }
+
+    async def body(resolver, _):
+        return await resolver.resolve_all("bad.example"), await resolver.resolve_all("missing.example")
+
+    bad, missing = asyncio.run(_with_dns(zone, body))
+    assert bad[-1].type == "validation_error" and bad[-1].data == {"manifestContent": '{"schemaVersion": "2"}'}
+    assert missing[-1].type == "manifest_error" and "404" in missing[-1].error
+
+
+def test_inline_profile_and_dns_errors():
+    zone = {
+        "_agent.inline.example": ["v=aid1;uri=https://api.inline.example;proto=mcp;auth=pat"],
+        "_agent.nouri.example": ["v=aid1;proto=mcp"],
+        "_agent.garbage.example": ["hello"],
+    }
+
+    async def body(resolver, _):
+        return {d: await resolver.resolve_all(d) for d in
+                ("inline.example", "nouri.example", "garbage.example", "nx.example")}
+
+    steps = asyncio.run(_with_dns(zone, body))
+    inline = steps["inline.example"]
+    assert _types(inline) == ["dns_query", "dns_success", "inline_profile", "actionable_profile"]
+    impl = inline[-1].data["implementations"][0]
+    assert impl["execution"] == {"uri": "https://api.inline.example"}
+    assert impl["auth"]["requiredSecrets"] == ["TOKEN"] and impl["tags"] == ["mcp"]
+    assert steps["nouri.example"][-1].type == "validation_error"
+    assert steps["garbage.example"][-1].error == "Invalid TXT record format."
+    assert steps["nx.example"][-1].type == "dns_error"
+
+
+def test_long_txt_and_tcp_fallback():
+    record = "v=aid1;uri=https://api.example.com/" + "x" * 400 + ";proto=mcp"
+    zone = {"_agent.long.example": [record]}
+
+    async def body(resolver, stub):
+        answer = await query_txt("_agent.long.example", "127.0.0.1", resolver.port)
+        return answer, stub.queries
+
+    answer, queries = asyncio.run(_with_dns(zone, body, truncate={"_agent.long.example"}))
+    assert answer.records == [record] and answer.ttl == 300
+    assert queries == ["_agent.long.example", "_agent.long.example"]
+
+
+def test_close_delimited_body():
+    # No Content-Length or chunked encoding: the body ends when the server closes.
+    body = b"[" + b",".join([EXAMPLE] * (200_000 // len(EXAMPLE) + 1)) + b"]"
+
+    async def handle(reader, writer):
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\nConnection: close\r\n\r\n")
+        for i in range(0, len(body), 10_000):
+            writer.write(body[i:i + 10_000])
+            await writer.drain()
+        writer.close()
+
+    async def run():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        url = f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/aid.json"
+        try:
+            response = await http_get(url, max_bytes=len(body))
+            with pytest.raises(ResolverError, match="larger than"):
+                await http_get(url, max_bytes=len(body) - 1)
+        finally:
+            server.close()
+        return response
+
+    response = asyncio.run(run())
+    assert response.status == 200 and response.body == body
+
+
+def test_fetch_timeout(http_server):
+    base, routes = http_server
+    routes["/slow.json"] = (200, EXAMPLE, 2)
+    zone = {"_agent.slow.example": [f"v=aid1;config={base}/slow.json"]}
+    steps = asyncio.run(_with_dns(zone, lambda r, _: r.resolve_all("slow.example")))
+    assert steps[-1].type == "manifest_error" and "timed out" in steps[-1].error
+
+
+def test_resolve_many_concurrency(http_server):
+    base, routes = http_server
+    routes["/.well-known/aid.json"] = (200, EXAMPLE, 0)
+    domains = [f"d{i}.example" for i in range(300)]
+    zone = {f"_agent.{d}": [f"v=aid1;config={base}/.well-known/aid.json"] for d in domains[::2]}
+
+    async def body(resolver, _):
+        return [item async for item in resolver.resolve_many(iter(domains), concurrency=50)]
+
+    results = dict(asyncio.run(_with_dns(zone, body)))
+    assert sorted(results) == sorted(domains)
+    assert all(results[d][-1].type == "validation_success" for d in domains[::2])
+    assert all(results[d][-1].type == "dns_error" for d in domains[1::2])
+
+
+def test_module_level_resolve_many():
+    async def body(resolver, _):
+        return [item async for item in resolve_many(["a.example"], nameserver="127.0.0.1", port=resolver.port)]
+
+    [(domain, steps)] = asyncio.run(_with_dns({}, body))
+    assert domain == "a.example" and steps[-1].type == "dns_error"
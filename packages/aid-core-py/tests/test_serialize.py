@@ -0,0 +1,61 @@
+"""dump_manifest must be byte-identical to json.dumps(manifest.to_dict())."""
+import io
+import json
+
+import pytest
+
+from aid_core_py import fastmodels, models
+from aid_core_py.lazy import lazy_manifest
+from aid_core_py.serialize import dump_manifest, iter_dump_manifest
+from conftest import CORPUS, VALID, fuzzed_manifests
+
+OPTIONS = [
+    {},
+    {"sort_keys": True},
+    {"ensure_ascii": False},
+    {"separators": (",", ":")},
+    {"sort_keys": True, "ensure_ascii": False, "separators": [",", ":"]},
+]
+
+
+def _decodable(manifests):
+    for manifest in manifests:
+        try:
+            yield models.aid_manifest_from_dict(manifest)
+        except Exception:
+            pass
+
+
+def _models():
+    return list(_decodable(json.loads(p.read_text(encoding="utf-8")) for p in CORPUS)) + list(
+        _decodable(fuzzed_manifests(600, seed=5))
+    )
+
+
+@pytest.mark.parametrize("options", OPTIONS, ids=str)
+def test_identical_to_json_dumps(options):
+    manifests = _models()
+    assert len(manifests) > 100
+    for manifest in manifests:
+        expected = json.dumps(manifest.to_dict(), **options).encode("utf-8")
+        assert dump_manifest(manifest, **options) == expected
+
+
+def test_chunked_writes():
+    manifest = fastmodels.manifest_from_dict(VALID[0])
+    manifest.implementations = manifest.implementations * 40
+    manifest.name = "Ünïcode ✓"
+    expected = json.dumps(manifest.to_dict()).encode("utf-8")
+    chunks = list(iter_dump_manifest(manifest, chunk_size=1024))
+    assert len(chunks) > 5 and b"".join(chunks) == expected
+    fp = io.BytesIO()
+    assert dump_manifest(manifest, fp, chunk_size=1024) is None
+    assert fp.getvalue() == expected
+
+
+def test_empty_implementations_and_lazy_view():
+    manifest = fastmodels.manifest_from_dict(VALID[0])
+    manifest.implementations = []
+    assert dump_manifest(manifest) == json.dumps(manifest.to_dict()).encode("utf-8")
+    view = lazy_manifest(VALID[0])
+    assert dump_manifest(view, sort_keys=True) == json.dumps(VALID[0], sort_keys=True).encode("utf-8")
@@ -0,0 +1,84 @@
+import json
+
+import pytest
+from jsonschema.exceptions import ValidationError
+
+import aid_core_py
+from aid_core_py import bench
+from aid_core_py.fastmodels import manifest_from_dict
+from aid_core_py.snapshot import SnapshotReader, StaleSnapshotError, write_snapshot
+from conftest import VALID
+
+
+def _registry():
+    registry = {f"doc{i}.example": doc for i, doc in enumerate(VALID)}
+    registry.update({f"synthetic-{n}.example": bench.synthetic_manifest(n) for n in (1, 7, 50)})
+    registry["münchen.example"] = VALID[0]
+    return registry
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "registry.snap"
+    registry = _registry()
+    items = list(registry.items())
+    # Models, JSON text and a duplicate key (the last one wins).
+    items[0] = (items[0][0], manifest_from_dict(items[0][1]))
+    items[1] = (items[1][0], json.dumps(items[1][1]).encode())
+    items.append(("doc0.example", VALID[1]))
+    registry["doc0.example"] = VALID[1]
+    assert write_snapshot(path, items) == len(registry)
+
+    with SnapshotReader(path) as reader:
+        assert len(reader) == len(registry)
+        assert list(reader) == sorted(registry, key=lambda k: k.encode())
+        for key, manifest in registry.items():
+            assert key in reader
+            assert reader.get_dict(key) == manifest
+            assert reader[key].to_dict() == manifest_from_dict(manifest).to_dict()
+        assert "missing.example" not in reader and reader.get("missing.example") is None
+        with pytest.raises(KeyError):
+            reader["zzz"]
+        assert dict(reader.items()).keys() == registry.keys()
+        assert reader.schema_hash == aid_core_py._schema_hash()
+
+
+def test_empty_snapshot(tmp_path):
+    path = tmp_path / "empty.snap"
+    assert write_snapshot(path, {}) == 0
+    with SnapshotReader(path) as reader:
+        assert len(reader) == 0 and list(reader) == [] and "a" not in reader
+
+
+def test_invalid_manifest_writes_nothing(tmp_path):
+    path = tmp_path / "registry.snap"
+    with pytest.raises(ValidationError):
+        write_snapshot(path, {"a.example": VALID[0], "b.example": {**VALID[0], "schemaVersion": "2"}})
+    assert list(tmp_path.iterdir()) == []
+    write_snapshot(path, {"b.example": {**VALID[0], "schemaVersion": "2"}}, validate=False)
+    assert path.exists()
+
+
+def test_schema_change_invalidates(tmp_path, monkeypatch):
+    path = tmp_path / "registry.snap"
+    write_snapshot(path, {"a.example": VALID[0]})
+    monkeypatch.setattr(aid_core_py, "_SCHEMA_HASH", "00" * 32)
+    with pytest.raises(StaleSnapshotError, match="different schema"):
+        SnapshotReader(path)
+    with SnapshotReader(path, check_schema=False) as reader:
+        assert reader.get_dict("a.example") == VALID[0]
+
+
+def test_corrupt_files(tmp_path):
+    path = tmp_path / "registry.snap"
+    write_snapshot(path, {"a.example": VALID[0]})
+    data = path.read_bytes()
+    cases = {
+        b"": "not an AID snapshot",
+        b"garbage" * 20: "not an AID snapshot",
+        data[:-3]: "truncated",
+        data[:8] + b"\x09" + data[9:]: "unsupported snapshot version 9",
+    }
+    for content, message in cases.items():
+        path.write_bytes(content)
+        with pytest.raises(ValueError, match=message):
+            SnapshotReader(path)
@@ -0,0 +1,63 @@
+import io
+import json
+import sys
+
+import pytest
+
+from aid_core_py import cli, iter_validate, stream
+from conftest import INVALID, VALID
+
+VALID_TEXT = json.dumps(VALID[0])
+INVALID_TEXT = json.dumps(INVALID)
+
+
+def _ndjson(*records):
+    return "\n".join(records) + "\n"
+
+
+@pytest.mark.parametrize("binary", [False, True])
+def test_iter_validate_results(binary):
+    text = _ndjson(VALID_TEXT, "", INVALID_TEXT, "{broken", VALID_TEXT)
+    source = io.BytesIO(text.encode()) if binary else io.StringIO(text)
+    results = list(iter_validate(source))
+    assert [r.line for r in results] == [1, 3, 4, 5]
+    assert [r.ok for r in results] == [True, False, False, True]
+    assert "'1' was expected" in results[1].error.message
+    assert isinstance(results[2].error, ValueError)
+
+
+def test_reader_is_bounded_and_stops_early():
+    consumed = 0
+
+    def lines():
+        nonlocal consumed
+        for _ in range(1_000_000):
+            consumed += 1
+            yield VALID_TEXT
+
+    results = iter_validate(lines())
+    assert next(results).ok
+    limit = (stream._MAX_BATCHES + 2) * stream._BATCH_LINES
+    assert consumed <= limit
+    results.close()
+
+
+def test_reader_errors_propagate():
+    def lines():
+        yield VALID_TEXT
+        raise OSError("pipe closed")
+
+    results = iter_validate(lines())
+    with pytest.raises(OSError, match="pipe closed"):
+        list(results)
+
+
+def test_cli_ndjson(monkeypatch, capsys, tmp_path):
+    path = tmp_path / "manifests.ndjson"
+    path.write_text(_ndjson(VALID_TEXT, INVALID_TEXT, VALID_TEXT), encoding="utf-8")
+    monkeypatch.setattr(sys, "argv", ["aid-validate", "--ndjson", str(path)])
+    with pytest.raises(SystemExit) as exit_info:
+        cli.main()
+    assert exit_info.value.code == 1
+    results = [json.loads(line) for line in capsys.readouterr().out.splitlines()]
+    assert [(r["line"], r["ok"]) for r in results] == [(1, True), (2, False), (3, True)]
@@ -3,7 +3,17 @@ from pathlib import Path
 
 import pytest
 
-from aid_core_py import validate_manifest, validate_txt, validate_pair, build_txt_record
+from aid_core_py import (
+    AidTxtRecord,
+    ManifestValidator,
+    build_txt_record,
+    parse_manifest,
+    parse_txt,
+    parse_txt_many,
+    validate_manifest,
+    validate_pair,
+    validate_txt,
+)
 
 ROOT = Path(__file__).resolve().parents[3]
 FIXTURES_DIR = ROOT / "packages" / "aid-conformance" / "tests" / "fixtures"
@@ -55,4 +65,91 @@ def test_validate_pair():
             "authentication": {"scheme": "none"}
         }
     ]})
-    validate_pair(manifest, txt) 
\ No newline at end of file
+    validate_pair(manifest, txt) 
+
+def test_manifest_validator_reuse():
+    validator = ManifestValidator()
+    valid = [json.loads(p.read_text(encoding="utf-8")) for p in VALID_DIR.glob("*.json") if p.exists()]
+    invalid = [json.loads(p.read_text(encoding="utf-8")) for p in INVALID_DIR.glob("*.json") if p.exists()]
+    assert all(validator.is_valid(m) for m in valid)
+    assert not any(validator.is_valid(m) for m in invalid)
+    results = list(validator.validate_many(valid + invalid))
+    assert results[: len(valid)] == [None] * len(valid)
+    assert all(r is not None for r in results[len(valid):])
+
+
+def test_manifest_validator_matches_jsonschema_error():
+    import jsonschema
+
+    from aid_core_py import _SCHEMA
+
+    for path in INVALID_DIR.glob("*.json"):
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        with pytest.raises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(instance=manifest, schema=_SCHEMA)
+        with pytest.raises(jsonschema.ValidationError) as actual:
+            ManifestValidator().validate(manifest)
+        assert actual.value.message == expected.value.message
+        assert list(actual.value.absolute_path) == list(expected.value.absolute_path)
+
+
+def test_parse_txt():
+    record = parse_txt('_agent.example.com. 3600 IN TXT "v=aid1;uri=https://api.example.com;proto=mcp;env=prod"')
+    assert record == AidTxtRecord(v="aid1", uri="https://api.example.com", proto="mcp", env="prod")
+    assert record.auth is None and record.config is None
+    with pytest.raises(ValueError, match="missing 'v=aid1'"):
+        parse_txt("uri=https://api.example.com")
+    assert parse_txt_many(["v=aid1;config=https://x/a.json", "nope"]) == [
+        AidTxtRecord(v="aid1", config="https://x/a.json"), None
+    ]
+
+
+def _legacy_fields(txt):
+    # The pre-parse_txt pipeline of validate_txt / _parse_txt.
+    txt = txt.strip()
+    kv = {}
+    for part in [p.strip() for p in txt[txt.index("v=aid1"):].strip('"').split(";") if p.strip()]:
+        if "=" in part:
+            k, v = part.split("=", 1)
+            kv[k] = v
+    return kv
+
+
+def test_parse_txt_matches_legacy_pipeline():
+    import random
+
+    rng = random.Random(7)
+    alphabet = ["v=aid1", "uri", "proto", "auth", "env", "config", "=", ";", " ", "\t", '"', "x", "https://a/?q=1", "\u00a0"]
+    for _ in range(5000):
+        txt = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 16)))
+        if "v=aid1" not in txt:
+            assert parse_txt_many([txt]) == [None]
+            continue
+        kv = _legacy_fields(txt)
+        assert parse_txt(txt) == AidTxtRecord(*(kv.get(k) for k in AidTxtRecord.__slots__)), txt
+
+
+def test_parse_manifest_accepts_str_bytes_and_dict():
+    from aid_core_py import models
+
+    path = next(p for p in VALID_DIR.glob("*.json") if p.exists())
+    raw = path.read_bytes()
+    for data in (raw, raw.decode("utf-8"), json.loads(raw)):
+        manifest = parse_manifest(data)
+        assert isinstance(manifest, models.AidManifest)
+        assert manifest.to_dict() == models.aid_manifest_from_dict(json.loads(raw)).to_dict()
+
+
+def test_parse_manifest_error_has_json_path():
+    import jsonschema
+
+    from aid_core_py import _SCHEMA
+
+    for path in INVALID_DIR.glob("*.json"):
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+        with pytest.raises(jsonschema.ValidationError) as expected:
+            jsonschema.validate(instance=manifest, schema=_SCHEMA)
+        with pytest.raises(jsonschema.ValidationError) as actual:
+            parse_manifest(path.read_bytes())
+        assert actual.value.message == expected.value.message
+        assert actual.value.json_path == expected.value.json_path
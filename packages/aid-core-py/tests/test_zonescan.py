@@ -0,0 +1,108 @@
+from aid_core_py import validate_txt
+from aid_core_py.zonescan import scan_buffer, scan_zone
+
+ZONE = b"""$ORIGIN example.com.
+$TTL 3600
+@        IN SOA ns1 hostmaster ( 1 7200 3600 1209600 300 )
+www      IN A 192.0.2.1
+_agent   300 IN TXT "v=aid1;uri=https://api.example.com/mcp;proto=mcp" ; comment
+alias    IN CNAME _agent.example.com.
+_agent.sub IN TXT ( "v=aid1;uri=https://sub.example.com/;"
+                    "proto=a2a;auth=pat" )
+$ORIGIN other.test.
+_agent   IN TXT "hello"
+_agent.fqdn.example. 60 IN TXT "v=aid1;proto=mcp;desc=semi\\;colon"
+_agent   IN A 192.0.2.2
+"""
+
+
+def test_scan_records():
+    records = list(scan_buffer(ZONE))
+    assert [(r.line, r.owner, r.ttl) for r in records] == [
+        (5, "_agent.example.com.", 300),
+        (7, "_agent.sub.example.com.", None),
+        (10, "_agent.other.test.", None),
+        (11, "_agent.fqdn.example.", 60),
+    ]
+    first, multi, bad, missing = records
+    assert ZONE[first.offset:].startswith(b"_agent   300")
+    assert first.fields == {"v": "aid1", "uri": "https://api.example.com/mcp", "proto": "mcp"} and first.error is None
+    assert multi.txt == "v=aid1;uri=https://sub.example.com/;proto=a2a;auth=pat"
+    assert multi.fields["auth"] == "pat" and multi.error is None
+    assert bad.error == "TXT record missing 'v=aid1'"
+    assert missing.error == "TXT record must contain either 'uri' or 'config' key"
+
+
+def test_errors_match_validate_txt(tmp_path):
+    path = tmp_path / "zone.db"
+    path.write_bytes(ZONE)
+    for record in scan_zone(str(path)):
+        try:
+            validate_txt(record.txt)
+            expected = None
+        except ValueError as e:
+            expected = str(e)
+        assert record.error == expected
+
+
+def test_empty_and_axfr(tmp_path):
+    empty = tmp_path / "empty.db"
+    empty.write_bytes(b"")
+    assert list(scan_zone(str(empty))) == []
+    axfr = b"; <<>> DiG <<>> axfr example.com\n_agent.example.com.\t300\tIN\tTXT\t\"v=aid1;\" \"config=https://x/\"\n"
+    [record] = scan_buffer(axfr)
+    assert record.line == 2 and record.fields["config"] == "https://x/"
+
+
+def test_owner_case_and_inherited_owner():
+    zone = b"""$ORIGIN example.com.
+_AGENT.Upper 60 IN TXT "v=aid1;uri=https://upper.example/;proto=mcp"
+_agent   IN A 192.0.2.3
+         IN TXT "v=aid1;uri=https://inherited.example/;proto=mcp"
+
+; a comment keeps the owner
+         300 TXT ( "v=aid1;config=https://x/" )
+www      IN A 192.0.2.4
+         IN TXT "v=aid1;uri=https://www.example/"
+  _agent IN TXT "v=aid1;uri=https://indented.example/"
+"""
+    assert [(r.line, r.owner, r.ttl, r.txt[:24]) for r in scan_buffer(zone)] == [
+        (2, "_AGENT.Upper.example.com.", 60, "v=aid1;uri=https://upper"),
+        (4, "_agent.example.com.", None, "v=aid1;uri=https://inher"),
+        (7, "_agent.example.com.", 300, "v=aid1;config=https://x/"),
+    ]
+
+
+def test_ttl_units_and_unparseable_lines():
+    zone = b"""$ORIGIN example.com.
+_agent.a 1h IN TXT "v=aid1;uri=https://a.example/"
+_agent.b IN 1h30m TXT "v=aid1;uri=https://b.example/"
+_agent.c 2W TXT "v=aid1;uri=https://c.example/"
+_agent.d 1x IN TXT "v=aid1;uri=https://d.example/"
+_agent.e 300 IN "v=aid1;uri=https://e.example/"
+_agent.f 300 IN
+_agent.g 1h IN AAAA 2001:db8::1
+"""
+    records = list(scan_buffer(zone))
+    assert [(r.line, r.owner, r.ttl, r.error) for r in records] == [
+        (2, "_agent.a.example.com.", 3600, None),
+        (3, "_agent.b.example.com.", 5400, None),
+        (4, "_agent.c.example.com.", 1209600, None),
+        (5, "_agent.d.example.com.", None, "unrecognised TTL, class or type '1x'"),
+        (6, "_agent.e.example.com.", None, "unrecognised TTL, class or type 'v=aid1;uri=https://e.example/'"),
+        (7, "_agent.f.example.com.", None, "record has no type"),
+    ]
+    assert records[3].txt == "" and records[3].fields == {}
+
+
+def test_large_zone(tmp_path):
+    filler = b"".join(b"host%d IN A 192.0.2.1\n" % i for i in range(200))
+    agent = b'_agent.d%d.example. 300 IN TXT "v=aid1;uri=https://d.example/;proto=mcp"\n'
+    path = tmp_path / "big.db"
+    with open(path, "wb") as fh:
+        for i in range(1000):
+            fh.write(filler)
+            fh.write(agent % i)
+    records = list(scan_zone(str(path)))
+    assert len(records) == 1000 and all(r.error is None for r in records)
+    assert records[-1].line == 1000 * 201 and records[-1].owner == "_agent.d999.example."
@@ -43,6 +43,7 @@ async function run() {
       features: "pydantic2",
     },
     outPath: path.join(ROOT, "packages/aid-core-py", "aid_core_py", "models.py"),
+    postProcess: addPythonSlots,
   });
 
   // Copy schema into Python package for runtime validation
@@ -65,6 +66,7 @@ async function run() {
 interface GenerateOpts {
   rendererOptions?: Record<string, string>;
   outPath: string;
+  postProcess?: (source: string) => string;
 }
 
 async function generateForLang(lang: string, opts: GenerateOpts) {
@@ -84,8 +86,45 @@ async function generateForLang(lang: string, opts: GenerateOpts) {
     rendererOptions: opts.rendererOptions ?? {},
   });
 
+  const source = qt.lines.join("\n");
   await fs.mkdir(path.dirname(opts.outPath), { recursive: true });
-  await fs.writeFile(opts.outPath, qt.lines.join("\n"), "utf-8");
+  await fs.writeFile(opts.outPath, opts.postProcess ? opts.postProcess(source) : source, "utf-8");
+}
+
+/**
+ * Give every generated Python model class `__slots__` (one per attribute its
+ * `__init__` assigns), so large corpora of models stay compact. Enum classes
+ * are left alone. aid-core-py's tests fail if a model class lacks them.
+ */
+function addPythonSlots(source: string): string {
+  const lines = source.split("\n");
+  const out: string[] = [
+    "# Generated by scripts/generate-sdk.ts: quicktype output with __slots__ added",
+    "# by addPythonSlots(). Do not edit by hand; run `pnpm sdk:generate`.",
+  ];
+  let i = 0;
+  while (i < lines.length) {
+    const line = lines[i++];
+    out.push(line);
+    if (!/^class \w+:$/.test(line)) continue;
+    if (lines[i]?.trimStart().startsWith('"""')) {
+      const first = lines[i].trim();
+      let end = i;
+      if (first === '"""' || !first.slice(3).endsWith('"""')) {
+        while (end + 1 < lines.length && !lines[end + 1].trim().endsWith('"""')) end++;
+        end++;
+      }
+      out.push(...lines.slice(i, end + 1));
+      i = end + 1;
+    }
+    const names: string[] = [];
+    for (let j = i; j < lines.length && !/^class /.test(lines[j]); j++) {
+      const match = /^ {8}self\.(\w+) = /.exec(lines[j]);
+      if (match) names.push(`"${match[1]}"`);
+    }
+    out.push(`    __slots__ = (${names.join(", ")}${names.length === 1 ? "," : ""})`);
+  }
+  return out.join("\n");
 }
 
 async function copySchema(destination: string) {